@@ -1,13 +1,20 @@
+import logging
 import math
+from typing import Dict, Iterator, Optional
 
 from flask_restx import Resource, Namespace
-from flask import request
+from flask import request, Response, stream_with_context
+from werkzeug.http import quote_etag
 
+from apis import compression, encoder
 from apis.api_values import *
 from manager.item_manager import ItemManager
+from pipeline import item_exporter
 import datetime
 
 api_item = Namespace('Item')
+# 상품 여러개를 다루는 API, /item/<name> 과 겹치지 않도록 따로 둔다
+api_items = Namespace('Items')
 
 
 @api_item.route('/<string:item_name>')
@@ -37,8 +44,14 @@ class APIItem(Resource):
 
     def get(self, item_name):
         # 상품 상세정보 얻기
+
+        # 클라이언트가 갖고 있는 정보가 최신이면 DB 조회 없이 304 응답
+        etag = ItemManager().get_item_etag(item_name)
+        if etag and request.if_none_match.contains_weak(etag):
+            return not_modified(etag)
+
         try:
-            res = ItemManager().get_item(item_name)
+            res, etag = ItemManager().get_item_with_etag(item_name)
         except Exception:
             return {"result": API_RES_FAILED, "data": None}
         if res:
@@ -52,13 +65,13 @@ class APIItem(Resource):
             del res['name']
             res['item_name'] = item_name
 
-            # datetime은 json으로 포맷이 불가능하므로 string으로 바꾼다.
-            res['end_date'] = datetime.datetime.strftime(res['end_date'], "%Y/%m/%d %H:%M:%S")
+            # 종료일은 API 날짜 포맷 문자열로 바꾼다
+            res['end_date'] = encoder.format_date(res['end_date'])
 
             # 소수점을 버린다
             res['funding_gage'] = math.floor(res['funding_gage'])
 
-            return {"result": API_RES_OK, "data": res}
+            return {"result": API_RES_OK, "data": res}, 200, etag_header(etag)
         else:
             # 없음
             return {"result": API_RES_FAILED, "data": None}
@@ -104,6 +117,53 @@ class APIItem(Resource):
             return {"result": API_RES_FAILED}
 
 
+@api_items.route('/bulk')
+class APIItemBulk(Resource):
+    def post(self):
+        # 상품 여러개 생성
+        # {"items": [{"item_name", "user_name", "summary", "end_date", "funding_unit", "target_money"}, ...]}
+
+        data = request.json
+        try:
+            items = [{
+                "title": item['item_name'],
+                "user_name": item['user_name'],
+                "end_date": datetime.datetime.strptime(item['end_date'], "%Y/%m/%d %H:%M:%S"),
+                "summary": item['summary'],
+                "funding_unit": item['funding_unit'],
+                "target_money": item['target_money'],
+            } for item in data['items']]
+            res = ItemManager().add_items(items)
+        except Exception:
+            return {"result": API_RES_ERROR}
+
+        # 상품 별 결과
+        return {"result": API_RES_OK, "data": [{
+            "item_name": item['title'],
+            "result": API_RES_OK if code == 0 else API_RES_FAILED,
+            "code": code
+        } for item, code in zip(items, res)]}
+
+
+@api_items.route('/export')
+class APIItemExport(Resource):
+    def get(self):
+        # 전체 상품 내보내기 (파일 다운로드)
+        # format=ndjson or csv, gzip=true 이면 gzip 압축 파일
+        fmt = request.args.get('format', "ndjson")
+        compress = request.args.get('gzip') == "true"
+        if fmt not in ("ndjson", "csv"):
+            return {"result": API_RES_FAILED}
+
+        file_name = f"items.{fmt}" + (".gz" if compress else "")
+        return Response(
+            stream_with_context(item_exporter.iter_export(fmt, compress)),
+            mimetype="application/gzip" if compress else
+            ("text/csv" if fmt == "csv" else "application/x-ndjson"),
+            headers={"Content-Disposition": f"attachment; filename={file_name}"}
+        )
+
+
 @api_item.route('/<string:item_name>/donate')
 class APIItemDonate(Resource):
 
@@ -128,41 +188,122 @@ class APIItemList(Resource):
     def get(self):
         args = dict(request.args)
         res = []
+        next_cursor = None
+        paging: bool = False
+
+        # 상품이 하나도 바뀌지 않았으면 DB 조회 없이 304 응답
+        # 읽기 전에 ETag를 구해야 읽는 도중 바뀐 경우 다음 요청에서 다시 읽는다
+        etag = ItemManager().get_list_etag()
+        if request.if_none_match.contains_weak(etag):
+            return not_modified(etag)
+
+        # 읽기 복제본의 결과는 오래된 값일 수 있으므로 ETag를 붙이지 않고 압축된 응답도 캐시하지 않는다
+        # 복제본을 쓰지 않는 경우에만 primary에서 읽고 ETag를 붙인다 (방금 쓰기를 한 클라이언트, 복제본이 없는 서버)
+        primary = not ItemManager().uses_replica()
+        if not primary:
+            etag = None
 
         if 'search' in args:
             # 문자열 패턴을 이용한 검색
             try:
-                res = ItemManager().get_list(args['search'])
+                res = ItemManager().get_list(
+                    args['search'], limit=int(args['limit']) if 'limit' in args else None, primary=primary)
             except Exception:
-                return {"result", API_RES_ERROR}
+                return {"result": API_RES_ERROR}
         elif 'order_by' in args:
             # 순서를 이용한 검색
             try:
                 if args['order_by'] == "총펀딩금액":
-                    res = ItemManager().sort(sort_type="funding")
+                    sort_type = "funding"
                 elif args['order_by'] == "생성일":
-                    res = ItemManager().sort(sort_type="create_date")
+                    sort_type = "create_date"
                 else:
                     raise ValueError("order by args not matched")
+
+                paging = 'limit' in args or 'cursor' in args
+                if primary and not paging and args.get('stream') != "true":
+                    # 정렬된 전체 리스트는 모든 클라이언트가 같은 응답을 받으므로
+                    # 리스트 버전(ETag)별로 압축된 응답을 캐시한다
+                    key = (sort_type, etag)
+                    cached = compression.cached_response(key)
+                    if cached:
+                        return cached
+                    compression.cache_key(key)
+                if not paging and args.get('stream') == "true":
+                    # 전체 리스트를 메모리에 올리지 않고 한 항목씩 바로 출력
+                    return Response(
+                        stream_with_context(stream_list(ItemManager().iter_sort(sort_type=sort_type, primary=primary))),
+                        mimetype="application/json",
+                        headers=etag_header(etag)
+                    )
+                if paging:
+                    # 페이지 단위로 갖고오기
+                    res, next_cursor = ItemManager().sort_page(
+                        sort_type=sort_type,
+                        limit=int(args.get('limit', ItemManager.LIST_MAX_PAGE_SIZE)),
+                        cursor=args.get('cursor'),
+                        primary=primary
+                    )
+                else:
+                    res = ItemManager().sort(sort_type=sort_type, primary=primary)
             except Exception:
-                return {"result", API_RES_ERROR}
+                return {"result": API_RES_ERROR}
 
         # result data 가공
         for idx in range(len(res)):
-            # 상품 이름을 나타내는 name을 item_name으로 변경
-            __item_name = res[idx]['name']
-            del res[idx]['name']
-            res[idx]['item_name'] = __item_name
-
-            # 달성률에 소수점 제거
-            res[idx]["percentage"] = int(res[idx]['percentage'])
-            
-            # d-day 작성
-            # 종료일이 지나지 않으면 음수, 종료일이 지나면 +
-            res[idx]["d-day"] = (datetime.datetime.now() - res[idx]['end_date']).days
-
-            # 마감일/시작일은 요구사항에 포함되지 않으므로 전부다 삭제
-            del res[idx]['end_date']
-            del res[idx]['create_date']
-
-        return {"result": API_RES_OK, "data": res}
+            convert_list_element(res[idx])
+
+        if paging:
+            return {"result": API_RES_OK, "data": res, "next_cursor": next_cursor}, 200, etag_header(etag)
+        return {"result": API_RES_OK, "data": res}, 200, etag_header(etag)
+
+
+def convert_list_element(item: Dict[str, object]) -> Dict[str, object]:
+    """ 리스트 항목을 API 출력 형식으로 변경 (in-place) """
+
+    # 상품 이름을 나타내는 name을 item_name으로 변경
+    __item_name = item['name']
+    del item['name']
+    item['item_name'] = __item_name
+
+    # 달성률에 소수점 제거
+    item["percentage"] = int(item['percentage'])
+
+    # d-day 작성
+    # 종료일이 지나지 않으면 음수, 종료일이 지나면 +
+    item["d-day"] = (datetime.datetime.now() - item['end_date']).days
+
+    # 마감일/시작일, 상품 아이디는 요구사항에 포함되지 않으므로 전부다 삭제
+    del item['end_date']
+    del item['create_date']
+    del item['item_id']
+    return item
+
+
+def stream_list(items: Iterator[Dict[str, object]]) -> Iterator[bytes]:
+    """ 리스트를 {"result": ..., "data": [...]} 형식의 JSON으로 조금씩 출력
+
+        이미 응답을 보내기 시작했기 때문에 중간에 에러가 발생하면 JSON을 닫지 않고 끊는다.
+        (클라이언트는 파싱 실패로 에러를 알 수 있다)
+    """
+    yield b'{"result": ' + encoder.dumps(API_RES_OK) + b', "data": ['
+    try:
+        for idx, item in enumerate(items):
+            yield (b"" if idx == 0 else b", ") + encoder.dumps(convert_list_element(item))
+    except Exception:
+        logging.getLogger(__name__).exception("item list streaming failed")
+        return
+    yield b']}'
+
+
+def etag_header(etag: Optional[str]) -> Dict[str, str]:
+    """ ETag 응답 헤더
+
+        압축 등으로 응답 바이트가 달라질 수 있으므로 weak ETag를 사용한다.
+    """
+    return {"ETag": quote_etag(etag, weak=True)} if etag else {}
+
+
+def not_modified(etag: str) -> Response:
+    """ 304 Not Modified 응답 """
+    return Response(status=304, headers=etag_header(etag))
@@ -0,0 +1,22 @@
+from flask import Response
+from flask_restx import Resource, Namespace
+
+from apis import prometheus
+from apis.api_values import *
+from connection.query_metrics import query_metrics
+
+api_metrics = Namespace('Metrics')
+
+
+@api_metrics.route('')
+class APIMetrics(Resource):
+    def get(self):
+        # 요청 수, 응답 시간, 커넥션 풀, 캐시 통계 (Prometheus 텍스트 형식)
+        return Response(prometheus.render(), content_type=prometheus.CONTENT_TYPE)
+
+
+@api_metrics.route('/sql')
+class APIMetricsSQL(Resource):
+    def get(self):
+        # route("<method> <uri 규칙>") 별 SQL 실행 통계
+        return {"data": query_metrics.status(), "result": API_RES_OK}
@@ -0,0 +1,90 @@
+""" API 응답 압축
+
+    Accept-Encoding에 따라 일정 크기(MIN_SIZE) 이상의 JSON 응답을 gzip 또는 deflate로 압축한다.
+
+    같은 데이터를 여러 클라이언트가 요청하는 응답(EX: 정렬된 전체 상품 리스트)은
+    API 함수에서 cache_key()로 캐시 키를 지정하면 압축된 응답을 캐시에 저장해 두고
+    다음 요청에서 cached_response()로 DB 조회, 인코딩, 압축 없이 바로 출력할 수 있다.
+    캐시 키에 ETag를 넣으면 데이터가 바뀌었을 때 자동으로 새로 만들어진다.
+"""
+import gzip
+import zlib
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from flask import Flask, Response, g, request
+
+from cache.lru_cache import LRUCache
+
+# 압축할 최소 응답 크기(바이트), 너무 작은 응답은 압축 이득보다 비용이 크다
+MIN_SIZE: int = 1024
+# 압축 레벨 (1~9)
+LEVEL: int = 6
+
+# 지원하는 압축 방식, 앞에 있을수록 우선
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=LEVEL),
+    "deflate": lambda data: zlib.compress(data, LEVEL),
+}
+
+# 압축된 응답 캐시 {(캐시 키, 압축 방식): (압축된 응답, 헤더)}
+compressed_cache: LRUCache = LRUCache(max_size=64)
+
+
+def init_compression(app: Flask):
+    """ Flask app에 응답 압축 등록 """
+    app.after_request(compress_response)
+
+
+def negotiate() -> Optional[str]:
+    """ Accept-Encoding에 맞는 압축 방식, 압축하지 않으면 None """
+    return request.accept_encodings.best_match(list(ENCODERS))
+
+
+def cache_key(key: Hashable):
+    """ 현재 요청의 압축된 응답을 key로 캐시에 저장하도록 지정 """
+    g.compression_cache_key = key
+
+
+def cached_response(key: Hashable) -> Optional[Response]:
+    """ 캐시에 저장된 압축된 응답, 없으면 None """
+    encoding = negotiate()
+    if not encoding:
+        return None
+    cached: Optional[Tuple[bytes, Dict[str, str]]] = compressed_cache.get((key, encoding))
+    if not cached:
+        return None
+    data, headers = cached
+    res = Response(data, status=200, headers=headers)
+    res.vary.add("Accept-Encoding")
+    return res
+
+
+def compress_response(res: Response) -> Response:
+    """ after_request 함수, 조건에 맞는 응답을 압축한다
+
+        압축할 수 있는 응답은 압축 여부와 상관없이 Accept-Encoding에 따라 내용이 달라지므로 Vary 헤더를 넣는다.
+        304 응답도 캐시가 압축된 응답과 압축되지 않은 응답을 구별할 수 있도록 같이 넣는다.
+    """
+    if res.status_code == 304:
+        res.vary.add("Accept-Encoding")
+        return res
+    if res.status_code != 200 or res.is_streamed or res.direct_passthrough \
+            or 'Content-Encoding' in res.headers or res.mimetype != "application/json":
+        return res
+
+    res.vary.add("Accept-Encoding")
+    encoding = negotiate()
+    if not encoding:
+        return res
+    data: bytes = res.get_data()
+    if len(data) < MIN_SIZE:
+        return res
+
+    res.set_data(ENCODERS[encoding](data))
+    res.headers['Content-Encoding'] = encoding
+
+    key = g.pop('compression_cache_key', None)
+    if key is not None:
+        headers = {k: v for k, v in res.headers.items() if k not in ('Content-Length', 'Vary')}
+        compressed_cache.put((key, encoding), (res.get_data(), headers))
+    return res
@@ -0,0 +1,76 @@
+""" API 응답 JSON 인코더
+
+    orjson이 설치되어 있으면 orjson을, 없으면 표준 라이브러리 json을 사용한다.
+    datetime은 두 인코더 모두 ISO 8601(orjson이 직접 변환하는 형식)로 출력한다.
+    API 날짜 포맷(API_DATE_FORMAT)이 필요한 항목은 API 함수에서 format_date()로 먼저 바꾼다.
+"""
+import datetime
+import json
+from typing import Callable, Dict, Optional
+
+from flask import make_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# API에서 사용하는 날짜 포맷
+API_DATE_FORMAT: str = "%Y/%m/%d %H:%M:%S"
+
+
+def format_date(value: datetime.datetime) -> str:
+    """ API 날짜 포맷 문자열 """
+    return value.strftime(API_DATE_FORMAT)
+
+
+def _default(obj: object) -> object:
+    # json이 직접 변환하지 못하는 타입 처리, datetime은 orjson과 같은 ISO 8601로 출력한다
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_json(data: object) -> bytes:
+    return json.dumps(data, ensure_ascii=False, default=_default).encode('utf-8')
+
+
+def _dumps_orjson(data: object) -> bytes:
+    # datetime은 orjson이 직접 ISO 8601로 변환한다
+    return orjson.dumps(data)
+
+
+ENCODERS: Dict[str, Callable[[object], bytes]] = {"json": _dumps_json}
+if orjson:
+    ENCODERS["orjson"] = _dumps_orjson
+
+# 현재 사용중인 인코더 이름
+encoder_name: str = "orjson" if orjson else "json"
+_dumps: Callable[[object], bytes] = ENCODERS[encoder_name]
+
+
+def use_encoder(name: str):
+    """ 인코더 변경
+
+    :param name: orjson or json
+    """
+    global encoder_name, _dumps
+    if name not in ENCODERS:
+        raise ValueError(f"encoder {name} is not available")
+    encoder_name, _dumps = name, ENCODERS[name]
+
+
+def dumps(data: object) -> bytes:
+    """ JSON 인코딩 (UTF-8) """
+    return _dumps(data)
+
+
+def output_json(data: object, code: int, headers: Optional[Dict[str, str]] = None):
+    """ flask_restx 응답 출력 함수
+
+        Api.representation('application/json')으로 등록해서 사용한다.
+    """
+    res = make_response(dumps(data), code)
+    res.headers['Content-Type'] = "application/json"
+    res.headers.extend(headers or {})
+    return res
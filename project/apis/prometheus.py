@@ -0,0 +1,117 @@
+""" Prometheus 텍스트 형식(0.0.4) 통계 출력
+
+    GET /metrics 에서 사용한다. 모든 값은 조회할 때 모으므로 요청 처리 중에는 추가 비용이 없다.
+
+    * api_requests_total: (리소스, 메소드, 응답 결과) 별 요청 수
+    * api_request_duration_seconds: (리소스, 메소드) 별 응답 시간 히스토그램
+    * api_request_duration_quantile_seconds: 히스토그램으로 추정한 응답 시간 분위수 (p50, p95, p99)
+    * db_pool_*: 커넥션 풀 상태 (primary, 복제본)
+    * cache_*: 캐시(상품, 유저, 압축된 응답) 크기와 적중률
+"""
+from typing import Dict, List, Tuple
+
+from apis import compression
+from apis.request_metrics import BUCKETS, QUANTILES, request_metrics
+from cache.lru_cache import LRUCache
+from connection.connection_generator import DatabaseConnectionGenerator
+from manager.item_manager import ItemManager
+from query.user_query import UserQuery
+
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+# (이름, 타입, 설명, get_pool_status() 키)
+POOL_METRICS: List[Tuple[str, str, str, str]] = [
+    ("db_pool_size", "gauge", "Configured pool size", "pool_size"),
+    ("db_pool_checked_out", "gauge", "Connections currently checked out", "checked_out"),
+    ("db_pool_checked_in", "gauge", "Idle connections in the pool", "checked_in"),
+    ("db_pool_overflow", "gauge", "Connections opened beyond pool_size", "overflow"),
+    ("db_pool_connects_total", "counter", "Connections opened", "connects"),
+    ("db_pool_checkouts_total", "counter", "Connection checkouts", "checkouts"),
+    ("db_pool_invalidations_total", "counter", "Connections invalidated", "invalidations"),
+    ("db_pool_timeouts_total", "counter", "Checkouts that timed out", "timeouts"),
+    ("db_pool_wait_avg_seconds", "gauge", "Average checkout wait", "wait_avg"),
+    ("db_pool_wait_max_seconds", "gauge", "Longest checkout wait", "wait_max"),
+]
+
+
+def _labels(**labels: object) -> str:
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+def _header(lines: List[str], name: str, metric_type: str, description: str):
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+
+def _request_lines(lines: List[str]):
+    snapshot = request_metrics.snapshot()
+
+    _header(lines, "api_requests_total", "counter", "API requests by resource, method and API result")
+    for (resource, method), (results, _) in snapshot.items():
+        for result, count in results.items():
+            lines.append(f"api_requests_total{_labels(resource=resource, method=method, result=result)} {count}")
+
+    _header(lines, "api_request_duration_seconds", "histogram", "API response time")
+    for (resource, method), (_, histogram) in snapshot.items():
+        cumulative: int = 0
+        for bound, count in zip([*BUCKETS, "+Inf"], histogram.counts):
+            cumulative += count
+            lines.append(f"api_request_duration_seconds_bucket"
+                         f"{_labels(resource=resource, method=method, le=bound)} {cumulative}")
+        lines.append(f"api_request_duration_seconds_sum{_labels(resource=resource, method=method)} {histogram.sum}")
+        lines.append(f"api_request_duration_seconds_count{_labels(resource=resource, method=method)} "
+                     f"{histogram.count}")
+
+    _header(lines, "api_request_duration_quantile_seconds", "gauge", "API response time quantile (from histogram)")
+    for (resource, method), (_, histogram) in snapshot.items():
+        for q in QUANTILES:
+            lines.append(f"api_request_duration_quantile_seconds"
+                         f"{_labels(resource=resource, method=method, quantile=q)} {histogram.quantile(q)}")
+
+
+def _pool_lines(lines: List[str]):
+    status: Dict[str, object] = DatabaseConnectionGenerator.get_pool_status()
+    pools: List[Tuple[str, Dict[str, object]]] = [("primary", status)] + \
+        [(f"replica{idx}", replica) for idx, replica in enumerate(status.get('replicas', []))]
+    for name, metric_type, description, key in POOL_METRICS:
+        # pool_size 등은 QueuePool에만 있다
+        values = [(pool, res[key]) for pool, res in pools if key in res]
+        if not values:
+            continue
+        _header(lines, name, metric_type, description)
+        for pool, value in values:
+            lines.append(f"{name}{_labels(pool=pool)} {value}")
+
+
+def _cache_lines(lines: List[str]):
+    caches: Dict[str, LRUCache] = {
+        "item": ItemManager.item_cache,
+        "user": UserQuery.user_cache,
+        "compressed_response": compression.compressed_cache,
+    }
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    for name, metric_type, description, key in [
+        ("cache_size", "gauge", "Cached entries", "size"),
+        ("cache_max_size", "gauge", "Cache capacity", "max_size"),
+        ("cache_hits_total", "counter", "Cache hits", "hits"),
+        ("cache_misses_total", "counter", "Cache misses", "misses"),
+        ("cache_evictions_total", "counter", "Entries evicted by size limit", "evictions"),
+    ]:
+        _header(lines, name, metric_type, description)
+        for cache, res in stats.items():
+            lines.append(f"{name}{_labels(cache=cache)} {res[key]}")
+
+    _header(lines, "cache_hit_ratio", "gauge", "hits / (hits + misses)")
+    for cache, res in stats.items():
+        total: int = res['hits'] + res['misses']
+        lines.append(f"cache_hit_ratio{_labels(cache=cache)} {res['hits'] / total if total else 0.0}")
+
+
+def render() -> str:
+    """ 현재 통계 전체 (Prometheus 텍스트 형식) """
+    lines: List[str] = []
+    _request_lines(lines)
+    _pool_lines(lines)
+    _cache_lines(lines)
+    return "\n".join(lines) + "\n"
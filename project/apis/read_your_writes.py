@@ -0,0 +1,54 @@
+""" 요청(클라이언트) 별 read-your-writes
+
+    primary에 쓰기(commit)가 있었던 요청은 쓰기 시간을 쿠키로 내려주고, 같은 클라이언트의 다음 요청은
+    쿠키의 시간부터 read_your_writes초 동안 읽기를 primary로 보낸다. (다음 요청을 다른 워커 스레드가 처리해도 유지된다)
+    쓰기 기록은 요청이 끝나면 지우므로 같은 워커 스레드가 처리하는 다른 요청으로 넘어가지 않는다.
+
+    쿠키를 보내지 않는 클라이언트나 서버 간 시계 차이가 있는 경우에는 보장되지 않는다. (best-effort)
+"""
+import math
+import time
+from typing import Optional
+
+from flask import Flask, Response, g, request
+
+from connection import database_connection
+from connection.connection_generator import DatabaseConnectionGenerator
+
+COOKIE_NAME: str = "last_write"
+
+
+def init_read_your_writes(app: Flask):
+    """ Flask app에 요청 별 read-your-writes 등록 """
+    app.before_request(begin_request)
+    app.after_request(set_last_write_cookie)
+    app.teardown_request(end_request)
+
+
+def begin_request():
+    # 이전 요청의 쓰기 기록을 지우고 쿠키로 받은 쓰기 시간을 이어받는다
+    database_connection.clear_write()
+    try:
+        last_write = float(request.cookies[COOKIE_NAME])
+    except (KeyError, ValueError):
+        return
+    if not math.isfinite(last_write):
+        return
+    # 미래 시간은 현재 시간으로 본다 (primary 고정 방지)
+    g.last_write_cookie = min(last_write, time.time())
+    database_connection.mark_write(g.last_write_cookie)
+
+
+def set_last_write_cookie(res: Response) -> Response:
+    """ after_request 함수, 이번 요청에서 쓰기가 있었으면 쓰기 시간을 쿠키로 내려준다 (복제본이 있을 때만) """
+    connection = DatabaseConnectionGenerator.get()
+    last_write: Optional[float] = database_connection.last_write()
+    if connection.read_engines and last_write is not None and last_write != g.get('last_write_cookie'):
+        res.set_cookie(COOKIE_NAME, repr(last_write),
+                       max_age=math.ceil(connection.read_your_writes), httponly=True, samesite="Lax")
+    return res
+
+
+def end_request(exception=None):
+    # 요청이 끝나면 (스트리밍 응답은 출력이 끝나면) 쓰기 기록을 지운다
+    database_connection.clear_write()
@@ -0,0 +1,142 @@
+""" API 요청 통계
+
+    flask_restx 리소스와 메소드(EX: APIItem.get, APIItemDonate.put) 별로 응답 결과(API_RES_*) 별 요청 수와
+    응답 시간 히스토그램을 기록한다. 기록은 카운터 몇 개를 올리는 것이 전부이며
+    분위수(p50, p95, p99)는 GET /metrics 로 조회할 때 히스토그램에서 계산한다.
+
+    응답 결과는 API 함수가 돌려준 dict의 result 값이다.
+    result가 없는 응답(304, 캐시된 압축 응답, 스트리밍 응답 등)은 NONE, 처리되지 않은 예외는 EXCEPTION으로 기록한다.
+"""
+import bisect
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, current_app, g, request
+from flask_restx import Api
+
+# 응답 시간 히스토그램 구간(초), 마지막 구간은 +Inf
+BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 조회 시 계산하는 분위수
+QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+RESULT_NONE: str = "NONE"
+RESULT_EXCEPTION: str = "EXCEPTION"
+
+
+class LatencyHistogram:
+    """ 응답 시간 히스토그램 (구간 별 개수, 총합) """
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """ 분위수 추정, 해당 구간 안에서는 고르게 분포한다고 보고 선형 보간한다
+            (마지막 +Inf 구간에 걸리면 가장 큰 구간 경계값)
+        """
+        if not self.count:
+            return 0.0
+        rank: float = q * self.count
+        cumulative: int = 0
+        for idx, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if idx == len(BUCKETS):
+                    return BUCKETS[-1]
+                lower: float = BUCKETS[idx - 1] if idx else 0.0
+                return lower + (BUCKETS[idx] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return BUCKETS[-1]
+
+
+class RequestMetrics:
+    """ (리소스, 메소드) 별 요청 수와 응답 시간 """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        # {(리소스, 메소드): {결과: 요청 수}}
+        self.__results: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self.__latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def observe(self, resource: str, method: str, result: str, seconds: float):
+        """ 요청 하나 기록 """
+        key = (resource, method)
+        with self.__lock:
+            results = self.__results.get(key)
+            if results is None:
+                results = self.__results[key] = {}
+                self.__latency[key] = LatencyHistogram()
+            results[result] = results.get(result, 0) + 1
+            self.__latency[key].observe(seconds)
+
+    def snapshot(self) -> Dict[Tuple[str, str], Tuple[Dict[str, int], LatencyHistogram]]:
+        """ {(리소스, 메소드): ({결과: 요청 수}, 응답 시간 히스토그램)}, 조회 시점의 복사본 """
+        with self.__lock:
+            res = {}
+            for key, results in self.__results.items():
+                histogram = LatencyHistogram()
+                latency = self.__latency[key]
+                histogram.counts, histogram.sum, histogram.count = list(latency.counts), latency.sum, latency.count
+                res[key] = (dict(results), histogram)
+            return res
+
+    def reset(self):
+        with self.__lock:
+            self.__results.clear()
+            self.__latency.clear()
+
+
+# Flask app 전체가 같이 사용하는 통계
+request_metrics: RequestMetrics = RequestMetrics()
+
+# {endpoint: 리소스 이름}, 요청마다 view 함수를 찾지 않도록 저장한다
+_resource_names: Dict[str, str] = {}
+
+
+def init_request_metrics(app: Flask, api: Api):
+    """ Flask app에 요청 통계 기록 등록
+
+        응답 결과를 얻기 위해 api의 JSON 출력 함수를 감싸므로 출력 함수를 등록한 다음에 호출해야 한다.
+    """
+    output = api.representations['application/json']
+
+    def output_with_result(data, code, headers=None):
+        if isinstance(data, dict):
+            g.api_result = data.get('result')
+        return output(data, code, headers)
+
+    api.representation('application/json')(output_with_result)
+    app.before_request(begin_request)
+    app.teardown_request(end_request)
+
+
+def resource_name() -> Optional[str]:
+    """ 현재 요청을 처리하는 flask_restx 리소스 이름 (리소스가 아니면 endpoint), 매칭되는 uri가 없으면 None """
+    if request.url_rule is None:
+        return None
+    endpoint: str = request.url_rule.endpoint
+    name = _resource_names.get(endpoint)
+    if name is None:
+        view = current_app.view_functions.get(endpoint)
+        name = _resource_names[endpoint] = getattr(getattr(view, "view_class", None), "__name__", endpoint)
+    return name
+
+
+def begin_request():
+    g.request_metrics_begin = time.perf_counter()
+
+
+def end_request(exception=None):
+    # 요청이 끝나면 (스트리밍 응답은 출력이 끝나면) 기록한다
+    begin: Optional[float] = g.pop('request_metrics_begin', None)
+    resource = resource_name()
+    if begin is None or resource is None:
+        return
+    result: str = g.pop('api_result', None) or (RESULT_EXCEPTION if exception else RESULT_NONE)
+    request_metrics.observe(resource, request.method.lower(), result, time.perf_counter() - begin)
@@ -0,0 +1,49 @@
+""" 요청별 SQL 실행 통계
+
+    요청마다 실행된 SQL 문장 수, 총 DB 시간, 가장 느린 문장을 기록하고 (connection.query_metrics)
+    요청이 끝나면 route("<method> <uri 규칙>") 별로 모은다. 모은 통계는 GET /metrics/sql 로 확인한다.
+
+    debug 모드에서는 응답 헤더에도 넣는다.
+    * X-SQL-Queries: SQL 문장 수
+    * Server-Timing: db;dur=<총 DB 시간(ms)>, db-slowest;dur=<가장 느린 문장 시간(ms)>
+"""
+from typing import Dict, Optional
+
+from flask import Flask, Response, current_app, request
+
+from connection.query_metrics import query_metrics
+
+
+def init_sql_metrics(app: Flask):
+    """ Flask app에 SQL 실행 통계 기록 등록 """
+    app.before_request(begin_request)
+    app.after_request(add_debug_headers)
+    app.teardown_request(end_request)
+
+
+def route_name() -> Optional[str]:
+    """ 현재 요청의 route, 매칭되는 uri가 없으면 None """
+    if request.url_rule is None:
+        return None
+    return f"{request.method} {request.url_rule.rule}"
+
+
+def begin_request():
+    query_metrics.begin()
+
+
+def add_debug_headers(res: Response) -> Response:
+    """ after_request 함수, debug 모드에서 지금까지의 SQL 실행 통계를 헤더에 넣는다
+        (스트리밍 응답은 출력하면서 실행하는 SQL이 빠진다)
+    """
+    stats: Optional[Dict[str, object]] = query_metrics.current()
+    if current_app.debug and stats is not None:
+        res.headers['X-SQL-Queries'] = str(stats['count'])
+        res.headers['Server-Timing'] = \
+            f"db;dur={stats['time'] * 1000:.2f}, db-slowest;dur={stats['slowest_time'] * 1000:.2f}"
+    return res
+
+
+def end_request(exception=None):
+    # 요청이 끝나면 (스트리밍 응답은 출력이 끝나면) route 별 통계에 더한다
+    query_metrics.end(route_name())
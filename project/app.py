@@ -1,7 +1,13 @@
 from flask import Flask
 from flask_restx import Api
 
-from apis.api_item import api_item
+from apis.api_item import api_item, api_items
+from apis.api_metrics import api_metrics
+from apis.compression import init_compression
+from apis.encoder import output_json
+from apis.read_your_writes import init_read_your_writes
+from apis.request_metrics import init_request_metrics
+from apis.sql_metrics import init_sql_metrics
 from apis.api_user import api_user
 from connection.connection_generator import DatabaseConnectionGenerator
 from manager.item_manager import ItemManager
@@ -11,9 +17,36 @@ from model.model import rdb_create_all
 app = Flask(__name__)
 api = Api(app)
 
+# orjson(설치된 경우)을 이용한 JSON 출력
+# datetime은 orjson이 직접 ISO 8601로 변환하며, API 날짜 포맷이 필요한 항목은 API 함수에서 미리 문자열로 바꾼다.
+api.representation('application/json')(output_json)
+
+# Accept-Encoding에 따른 응답 압축 (gzip, deflate)
+init_compression(app)
+
+# 요청별 SQL 문장 수, DB 시간 기록 (debug 모드에서는 응답 헤더에도 출력)
+init_sql_metrics(app)
+
+# 리소스, 메소드 별 요청 수와 응답 시간 기록 (GET /metrics)
+init_request_metrics(app, api)
+
+# 쓰기가 있었던 클라이언트의 다음 요청은 잠시 읽기 복제본이 아닌 primary에서 읽는다 (쿠키 사용, best-effort)
+init_read_your_writes(app)
+
+
+@app.teardown_appcontext
+def remove_session(exception=None):
+    # 요청이 끝나면 (스트리밍 응답은 출력이 끝나면) 현재 스레드의 DB 세션을 정리한다
+    # 세션을 계속 들고 있으면 워커 스레드마다 커넥션과 열린 트랜잭션, identity map이 남는다
+    # 세션을 닫으면 객체는 detach 되므로 ORM 객체를 요청 밖으로 들고 나가지 않는다 (Manager는 dict로 출력)
+    DatabaseConnectionGenerator.remove_session()
+
+
 # res api 등록
 api.add_namespace(api_user, '/user')
 api.add_namespace(api_item, '/item')
+api.add_namespace(api_items, '/items')
+api.add_namespace(api_metrics, '/metrics')
 
 # databsae 생성
 # 테스트인지 배포용인지 해당 객체 내에서 알아서 구별해서 DB를 실행 및 생성한다.
@@ -27,6 +60,9 @@ rdb_create_all()
 user_manager = UserManager()
 item_manager = ItemManager()
 
+# 상위 상품 순위표를 DB에서 불러오고 주기적으로 DB와 맞춘다
+item_manager.start_leaderboards()
+
 
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0', port=8000)
@@ -0,0 +1,154 @@
+""" 비동기(ASGI) API 서버
+
+    Flask(app.py)와 같은 응답 형식으로 조회/펀딩 API를 비동기 쿼리(AsyncItemQuery, AsyncUserQuery)로 처리한다.
+    DB 응답을 기다리는 동안 스레드를 붙잡지 않으므로 적은 수의 워커로 많은 동시 요청을 처리할 수 있다.
+
+    실행: uvicorn asgi:app --port 8001  (aiomysql 필요, 테스트용 DB는 aiosqlite 필요)
+
+    주의: 펀딩 등 쓰기는 ItemManager를 거치지 않으므로 Flask 서버(app.py)의 메모리 캐시를 비우지 않는다.
+    같은 DB를 쓰는 Flask 서버는 캐시 유효 시간(ItemManager.ITEM_CACHE_TTL, ETAG_TTL)과 순위표 재조정 주기 동안
+    오래된 정보를 출력하므로, 이를 허용할 수 없으면 Flask 서버와 같은 DB에 함께 배포하지 않는다.
+
+    |uri|method|
+    |/user/{username}|GET, POST|
+    |/item/{item_name}|GET|
+    |/item/{item_name}/donate|PUT|
+    |/item/list?search=...&order_by=...&limit=...|GET|
+"""
+import math
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+
+from apis import encoder
+from apis.api_item import convert_list_element
+from apis.api_values import API_RES_OK, API_RES_FAILED, API_RES_ERROR
+from connection.async_connection import AsyncDatabaseConnection
+from connection.connection_generator import DatabaseConnectionGenerator
+from manager.item_manager import ItemManager
+from model.model import rdb_create_all, is_chosung
+from query.async_item_query import AsyncItemQuery
+from query.async_user_query import AsyncUserQuery
+from query.err_codes import ItemQueryErrorCode, UserQueryErrorCode
+
+Handler = Callable[..., Awaitable[Tuple[int, Dict[str, object]]]]
+
+
+async def get_user(username: str, query: Dict[str, str]) -> Tuple[int, Dict[str, object]]:
+    res = await AsyncUserQuery.read("name", username)
+    if not res:
+        return 200, {"data": None, "result": API_RES_FAILED}
+    return 200, {"data": res, "result": API_RES_OK}
+
+
+async def post_user(username: str, query: Dict[str, str]) -> Tuple[int, Dict[str, object]]:
+    res = await AsyncUserQuery.create(username)
+    return 200, {"result": API_RES_OK if res == UserQueryErrorCode.SUCCEED else API_RES_FAILED}
+
+
+async def get_item(item_name: str, query: Dict[str, str]) -> Tuple[int, Dict[str, object]]:
+    res = await AsyncItemQuery.read("name", item_name)
+    if not res:
+        return 200, {"result": API_RES_FAILED, "data": None}
+
+    # 출력 형식은 Flask API(APIItem.get)와 같다
+    del res['item_id']
+    res['item_name'] = res.pop('name')
+    res['end_date'] = encoder.format_date(res['end_date'])
+    res['funding_gage'] = math.floor(res['funding_gage'])
+    return 200, {"result": API_RES_OK, "data": res}
+
+
+async def donate_item(item_name: str, query: Dict[str, str]) -> Tuple[int, Dict[str, object]]:
+    res = await AsyncItemQuery.donate("name", item_name)
+    return 200, {"result": API_RES_OK if res == ItemQueryErrorCode.SUCCEED else API_RES_FAILED}
+
+
+async def get_item_list(query: Dict[str, str]) -> Tuple[int, Dict[str, object]]:
+    limit: int = min(int(query.get('limit', ItemManager.LIST_MAX_PAGE_SIZE)), ItemManager.LIST_MAX_PAGE_SIZE)
+    if limit <= 0:
+        raise ValueError("limit must be positive")
+
+    if 'search' in query:
+        # 검색 방식과 limit이 없을 때의 출력 개수는 ItemManager.get_list와 같다
+        keyword = query['search']
+        search_limit: Optional[int] = limit if 'limit' in query else None
+        if is_chosung(keyword):
+            res = await AsyncItemQuery.read_item_list_by_search_key(keyword, search_limit)
+        elif AsyncItemQuery.full_text_searchable(keyword):
+            res = await AsyncItemQuery.search_item_list(keyword, limit)
+        else:
+            res = await AsyncItemQuery.read_item_list_by_name_regex(keyword, search_limit)
+    elif query.get('order_by') == "총펀딩금액":
+        res = await AsyncItemQuery.sort_by_fundingmoney(limit)
+    elif query.get('order_by') == "생성일":
+        res = await AsyncItemQuery.sort_by_createdate(limit)
+    else:
+        return 200, {"result": API_RES_OK, "data": []}
+
+    return 200, {"result": API_RES_OK, "data": [convert_list_element(item) for item in res]}
+
+
+# (method, uri 패턴, handler), 위에서부터 먼저 매칭된다
+ROUTES: List[Tuple[str, re.Pattern, Handler]] = [
+    ("GET", re.compile(r"^/item/list$"), get_item_list),
+    ("PUT", re.compile(r"^/item/([^/]+)/donate$"), donate_item),
+    ("GET", re.compile(r"^/item/([^/]+)$"), get_item),
+    ("GET", re.compile(r"^/user/([^/]+)$"), get_user),
+    ("POST", re.compile(r"^/user/([^/]+)$"), post_user),
+]
+
+
+def route(method: str, path: str) -> Tuple[Optional[Handler], Tuple[str, ...]]:
+    """ (handler, uri 인자), 매칭되는 handler가 없으면 (None, ()) """
+    for route_method, pattern, handler in ROUTES:
+        matched = pattern.match(path)
+        if matched and route_method == method:
+            return handler, tuple(unquote(arg) for arg in matched.groups())
+    return None, ()
+
+
+async def startup():
+    # 테이블 생성, 전문 검색 엔진 확인은 동기 커넥션으로 한다
+    DatabaseConnectionGenerator.get().connect()
+    rdb_create_all()
+    AsyncDatabaseConnection().connect()
+
+
+async def shutdown():
+    await AsyncDatabaseConnection().disconnect()
+
+
+async def app(scope, receive, send):
+    """ ASGI 어플리케이션 """
+    if scope['type'] == "lifespan":
+        while True:
+            message = await receive()
+            if message['type'] == "lifespan.startup":
+                await startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message['type'] == "lifespan.shutdown":
+                await shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope['type'] != "http":
+        return
+
+    handler, args = route(scope['method'], scope['path'])
+    if not handler:
+        status, body = 404, {"result": API_RES_FAILED}
+    else:
+        query = {k: v[0] for k, v in parse_qs(scope.get('query_string', b"").decode('utf-8')).items()}
+        try:
+            status, body = await handler(*args, query)
+        except Exception:
+            status, body = 200, {"result": API_RES_ERROR}
+
+    data: bytes = encoder.dumps(body)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(data)).encode())],
+    })
+    await send({"type": "http.response.body", "body": data})
@@ -0,0 +1,9 @@
+""" 벤치마크 스크립트 모음
+
+    project 폴더에서 python -m benchmark.<스크립트 이름> 으로 실행한다.
+    운영 DB를 건드리지 않도록 테스트용(SQLite) 커넥션을 사용한다.
+"""
+from connection.connection_generator import DatabaseConnectionGenerator
+
+# 벤치마크 모듈이 app 등을 import 하면서 DB에 연결하기 전에 테스트용 커넥션을 지정한다
+DatabaseConnectionGenerator.use_testing()
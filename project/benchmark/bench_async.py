@@ -0,0 +1,110 @@
+""" 비동기(ASGI) 경로와 스레드(Flask) 경로의 동시 요청 처리 벤치마크
+
+    같은 리스트/검색 요청을 동시에 concurrency개씩 보내면서 처리량과 지연 시간(p50, p99)을 비교한다.
+    Flask는 concurrency개의 스레드가 각자 test client로, ASGI는 하나의 이벤트 루프에서
+    concurrency개의 task가 ASGI 어플리케이션을 직접 호출한다. (HTTP 서버 비용은 제외)
+
+    SQLite(aiosqlite)는 커넥션마다 스레드를 하나씩 쓰고 쓰기를 직렬화하므로
+    DB 대기 시간이 긴 MySQL(aiomysql)보다 비동기 경로의 이점이 작게 나온다.
+
+    실행: python -m benchmark.bench_async --items 10000 --requests 2000 --concurrency 1 8 32 128
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from benchmark.fixtures import populate
+from connection.async_connection import AsyncDatabaseConnection
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import remove_test_db
+
+URIS: List[Tuple[str, str]] = [
+    ("/item/list", "order_by=생성일&limit=20"),
+    ("/item/list", "search=상품 1&limit=20"),
+    ("/item/list", "order_by=생성일&limit=100"),
+]
+
+
+def report(name: str, concurrency: int, elapsed: float, latencies: List[float]):
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<6} {concurrency:>5} {len(latencies) / elapsed:>9.0f} "
+          f"{statistics.median(latencies) * 1000:>9.2f} {p99 * 1000:>9.2f}")
+
+
+def run_flask(app, requests: int, concurrency: int):
+    def worker(count: int) -> List[float]:
+        client = app.test_client()
+        res = []
+        for n in range(count):
+            path, query = URIS[n % len(URIS)]
+            begin = time.perf_counter()
+            client.get(f"{path}?{query}")
+            res.append(time.perf_counter() - begin)
+        return res
+
+    begin = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(worker, [requests // concurrency] * concurrency))
+    report("flask", concurrency, time.perf_counter() - begin, [t for r in results for t in r])
+
+
+async def run_asgi(app, requests: int, concurrency: int):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def worker(count: int) -> List[float]:
+        res = []
+        for n in range(count):
+            path, query = URIS[n % len(URIS)]
+            begin = time.perf_counter()
+            await app({"type": "http", "method": "GET", "path": path, "query_string": query.encode()},
+                      receive, send)
+            res.append(time.perf_counter() - begin)
+        return res
+
+    begin = time.perf_counter()
+    results = await asyncio.gather(*[worker(requests // concurrency) for _ in range(concurrency)])
+    report("asgi", concurrency, time.perf_counter() - begin, [t for r in results for t in r])
+
+
+async def main_async(args):
+    from asgi import app as asgi_app
+    AsyncDatabaseConnection().connect()
+    try:
+        for concurrency in args.concurrency:
+            await run_asgi(asgi_app, args.requests, concurrency)
+    finally:
+        await AsyncDatabaseConnection().disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    args = parser.parse_args()
+
+    remove_test_db()
+    # app은 import 시 DB에 연결한다
+    from app import app as flask_app
+    populate(args.items)
+    DatabaseConnectionGenerator.get_session().remove()
+
+    print(f"{'path':<6} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in args.concurrency:
+        run_flask(flask_app, args.requests, concurrency)
+    asyncio.run(main_async(args))
+
+    DatabaseConnectionGenerator.get().disconnect()
+    remove_test_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+""" 상품 대량 생성 벤치마크
+
+    상품을 하나씩 생성하는 기존 방식(ItemQuery.create)과
+    여러개를 한번에 생성하는 방식(ItemQuery.create_many)의 초당 생성 수를 비교한다.
+
+    실행: python -m benchmark.bench_bulk_create --size 5000
+"""
+import argparse
+import datetime
+import time
+from typing import Dict, List
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import rdb_create_all, remove_test_db
+from query.item_query import ItemQuery
+from query.user_query import UserQuery
+
+
+def make_items(prefix: str, size: int) -> List[Dict[str, object]]:
+    end_date = datetime.datetime.now() + datetime.timedelta(days=30)
+    return [{
+        "user": ["name", "user0"],
+        "name": f"{prefix} 상품 {idx}",
+        "summary": f"{prefix} 상품 {idx} 설명",
+        "end_date": end_date,
+        "funding_unit": 1000,
+        "target_money": 1000000
+    } for idx in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=5000)
+    args = parser.parse_args()
+
+    remove_test_db()
+    DatabaseConnectionGenerator.get().connect()
+    rdb_create_all()
+    UserQuery.create("user0")
+
+    begin = time.perf_counter()
+    for item in make_items("single", args.size):
+        ItemQuery.create(**item)
+    single = args.size / (time.perf_counter() - begin)
+
+    begin = time.perf_counter()
+    ItemQuery.create_many(make_items("bulk", args.size))
+    bulk = args.size / (time.perf_counter() - begin)
+
+    print(f"== {args.size} items (items/sec)")
+    print(f"{'create':<12} {single:>10.0f}")
+    print(f"{'create_many':<12} {bulk:>10.0f}")
+
+    DatabaseConnectionGenerator.get().disconnect()
+    remove_test_db()
+
+
+if __name__ == "__main__":
+    main()
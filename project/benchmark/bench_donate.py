@@ -0,0 +1,108 @@
+""" 펀딩 버튼(PUT /item/<name>/donate) 동시성 벤치마크
+
+    여러 스레드가 동시에 같은 상품에 펀딩을 했을 때
+    1. 누락된 펀딩이 없는 지 (current_money, participant_size 검증)
+    2. 초당 몇 건의 펀딩을 처리하는 지
+    를 측정한다.
+
+    실행: python -m benchmark.bench_donate --threads 8 --donations 500
+    --legacy 옵션을 주면 기존의 읽기 -> 수정 -> 저장 방식으로 측정한다.
+    --aggregate 옵션을 주면 펀딩 write-behind 집계기를 켜고 측정한다.
+"""
+import argparse
+import datetime
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from apis.api_values import API_RES_OK
+from app import app
+from connection.connection_generator import DatabaseConnectionGenerator
+from manager.item_manager import ItemManager
+from model.model import remove_test_db
+from query.err_codes import ItemQueryErrorCode
+from query.item_query import ItemQuery
+
+ITEM_NAME: str = "벤치마크상품"
+USER_NAME: str = "벤치마크유저"
+FUNDING_UNIT: int = 1000
+
+
+def legacy_donate_funding(item_name: str) -> bool:
+    """ 기존 펀딩 방식 (읽기 -> 파이썬에서 증가 -> 저장) """
+    item_info = ItemQuery.read("name", item_name)
+    if not item_info:
+        return False
+    res_code = ItemQuery.update(
+        ["name", item_name],
+        participant_size=item_info['participant_size'] + 1,
+        current_money=item_info['current_money'] + item_info['funding_unit'])
+    return res_code == ItemQueryErrorCode.SUCCEED
+
+
+def donate_worker(count: int) -> int:
+    """ count번 펀딩 요청을 보내고 성공 횟수를 리턴 """
+    client = app.test_client()
+    succeed: int = 0
+    for _ in range(count):
+        res = client.put(f"/item/{ITEM_NAME}/donate")
+        if json.loads(res.data.decode('utf-8'))['result'] == API_RES_OK:
+            succeed += 1
+    return succeed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--donations", type=int, default=500, help="스레드 당 펀딩 횟수")
+    parser.add_argument("--legacy", action="store_true", help="기존 방식으로 측정")
+    parser.add_argument("--aggregate", action="store_true", help="펀딩 집계기를 켜고 측정")
+    args = parser.parse_args()
+
+    mode: str = "atomic update"
+    if args.legacy:
+        mode = "legacy"
+        ItemManager.donate_funding = lambda self, item_name=None, item_id=None: legacy_donate_funding(item_name)
+    elif args.aggregate:
+        mode = "write-behind aggregator"
+        ItemManager().enable_donation_aggregator()
+
+    client = app.test_client()
+    client.post(f"/user/{USER_NAME}")
+    client.post(f"/item/{ITEM_NAME}", json={
+        "user_name": USER_NAME,
+        "summary": "벤치마크",
+        "funding_unit": FUNDING_UNIT,
+        "target_money": 10 ** 9,
+        "end_date": (datetime.datetime.now() + datetime.timedelta(days=1)).strftime("%Y/%m/%d %H:%M:%S")
+    })
+
+    begin = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        succeed = sum(executor.map(donate_worker, [args.donations] * args.threads))
+    elapsed = time.perf_counter() - begin
+
+    # 집계기에 남아있는 펀딩 반영
+    ItemManager().disable_donation_aggregator()
+
+    item = ItemManager().get_item(item_name=ITEM_NAME)
+    lost = succeed - item['participant_size']
+
+    print(f"mode            : {mode}")
+    print(f"threads         : {args.threads}")
+    print(f"requests        : {args.threads * args.donations} (succeed {succeed})")
+    print(f"elapsed         : {elapsed:.3f}s")
+    print(f"donations/sec   : {succeed / elapsed:.1f}")
+    print(f"participant_size: {item['participant_size']}")
+    print(f"current_money   : {item['current_money']} (expected {succeed * FUNDING_UNIT})")
+    print(f"lost donations  : {lost}")
+
+    DatabaseConnectionGenerator.get().disconnect()
+    remove_test_db()
+
+    if lost != 0 or item['current_money'] != succeed * FUNDING_UNIT:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
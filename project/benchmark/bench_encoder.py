@@ -0,0 +1,63 @@
+""" API 응답 JSON 인코더 벤치마크
+
+    /item/list 응답 데이터를 인코더 별로 인코딩하는 시간과
+    인코더를 바꿔가면서 /item/list 요청 전체를 처리하는 시간을 비교한다.
+
+    실행: python -m benchmark.bench_encoder --sizes 1000 10000 100000
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from benchmark.fixtures import populate
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import rdb_create_all, remove_test_db
+
+
+def measure(func: Callable, repeat: int) -> float:
+    """ 중간값 지연시간(ms) """
+    elapsed: List[float] = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        func()
+        elapsed.append((time.perf_counter() - begin) * 1000)
+    return statistics.median(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    remove_test_db()
+    # app은 import 시 DB에 연결한다
+    from app import app
+    from apis import encoder
+    from apis.api_item import convert_list_element
+    from manager.item_manager import ItemManager
+    client = app.test_client()
+
+    for size in args.sizes:
+        DatabaseConnectionGenerator.get().disconnect()
+        remove_test_db()
+        DatabaseConnectionGenerator.get().connect()
+        rdb_create_all()
+        populate(size)
+
+        payload = {"result": "OK", "data": [convert_list_element(d) for d in ItemManager().sort("create_date")]}
+
+        print(f"== {size} rows (median ms)")
+        for name in encoder.ENCODERS:
+            encoder.use_encoder(name)
+            encode = measure(lambda: encoder.dumps(payload), args.repeat)
+            request = measure(lambda: client.get("/item/list?order_by=생성일").data, args.repeat)
+            print(f"{name:<8} encode {encode:>10.2f}  /item/list {request:>10.2f}")
+
+    DatabaseConnectionGenerator.get().disconnect()
+    remove_test_db()
+
+
+if __name__ == "__main__":
+    main()
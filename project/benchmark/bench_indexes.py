@@ -0,0 +1,91 @@
+""" Item 보조 인덱스 벤치마크 (SQLite)
+
+    상품 수를 늘려가면서 인덱스가 없을 때와 있을 때의 ItemQuery 주요 쿼리 지연시간을 비교한다.
+
+    실행: python -m benchmark.bench_indexes --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import select
+
+from benchmark.fixtures import populate
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import rdb_create_all, remove_test_db, Item
+from query.item_query import ItemQuery
+
+# model.model에서 새로 추가된 보조 인덱스
+SECONDARY_INDEXES: List[str] = [
+    "ix_item_createDate_itemId",
+    "ix_item_currentMoney_itemId",
+    "ix_item_userId",
+]
+PAGE_SIZE: int = 20
+
+
+def measure(func: Callable, repeat: int) -> float:
+    """ 중간값 지연시간(ms) """
+    elapsed: List[float] = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        func()
+        elapsed.append((time.perf_counter() - begin) * 1000)
+    return statistics.median(elapsed)
+
+
+def run_queries(user_ids: List[str], repeat: int) -> Dict[str, float]:
+    db_session = DatabaseConnectionGenerator.get_session()
+
+    # 뒤쪽 페이지 커서를 위한 중간 지점 항목
+    middle = ItemQuery.sort_by_fundingmoney(limit=PAGE_SIZE * 500)[-1]
+
+    res = {
+        "sort by create date (first page)": measure(lambda: ItemQuery.sort_by_createdate(limit=PAGE_SIZE), repeat),
+        "sort by funding (first page)": measure(lambda: ItemQuery.sort_by_fundingmoney(limit=PAGE_SIZE), repeat),
+        "sort by funding (deep page)": measure(lambda: ItemQuery.sort_by_fundingmoney(
+            limit=PAGE_SIZE, after=(middle['current_money'], middle['item_id'])), repeat),
+        "items of a user": measure(lambda: db_session.execute(
+            select(Item.item_id).where(Item.user_id == random.choice(user_ids))).all(), repeat),
+    }
+    db_session.rollback()
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        remove_test_db()
+        DatabaseConnectionGenerator.get().connect()
+        rdb_create_all()
+        user_ids = populate(size)
+
+        engine = DatabaseConnectionGenerator.get_engine()
+        indexes = [index for index in Item.__table__.indexes if index.name in SECONDARY_INDEXES]
+
+        # 인덱스 제거 후 측정
+        for index in indexes:
+            index.drop(bind=engine)
+        before = run_queries(user_ids, args.repeat)
+
+        # 인덱스 생성 후 측정
+        for index in indexes:
+            index.create(bind=engine)
+        after = run_queries(user_ids, args.repeat)
+
+        print(f"== {size} items (median ms)")
+        for name in before:
+            print(f"{name:<35} before {before[name]:>10.2f}  after {after[name]:>8.2f}")
+
+        DatabaseConnectionGenerator.get().disconnect()
+        remove_test_db()
+
+
+if __name__ == "__main__":
+    main()
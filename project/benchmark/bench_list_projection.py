@@ -0,0 +1,83 @@
+""" 리스트 쿼리 마이크로 벤치마크
+
+    기존 방식(User, Item ORM 객체를 전부 만든 다음 dict로 변환)과
+    현재 방식(필요한 컬럼만 SELECT 해서 row를 바로 dict로 변환)의
+    초당 처리 row 수와 최대 메모리 사용량을 비교한다.
+
+    실행: python -m benchmark.bench_list_projection --size 100000
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import desc
+
+from benchmark.fixtures import populate
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import rdb_create_all, remove_test_db, User, Item
+from query.item_query import ItemQuery
+
+
+def legacy_sort_by_fundingmoney() -> List[Dict[str, object]]:
+    """ 기존 방식의 펀딩 금액 순 정렬 """
+    db_session = DatabaseConnectionGenerator.get_session()
+    res: List[Dict[str, object]] = []
+
+    for user, item in db_session.query(User, Item). \
+            filter(User.id == Item.user_id). \
+            order_by(desc(Item.current_money)).all():
+        res.append({
+            "item_id": item.item_id,
+            "name": item.name,
+            "user_name": user.name,
+            "current_money": item.current_money,
+            "percentage": (item.current_money / item.target_money) * 100,
+            "end_date": item.end_date,
+            "create_date": item.create_date
+        })
+    return res
+
+
+def measure(func: Callable[[], List], repeat: int) -> Tuple[float, float]:
+    """ (초당 row 수, 최대 메모리 MB) """
+    db_session = DatabaseConnectionGenerator.get_session()
+    rows, elapsed, peak = 0, 0.0, 0
+
+    for _ in range(repeat):
+        # 이전 실행의 identity map이 남지 않도록 세션을 비운다
+        db_session.remove()
+
+        tracemalloc.start()
+        begin = time.perf_counter()
+        rows += len(func())
+        elapsed += time.perf_counter() - begin
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return rows / elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    remove_test_db()
+    DatabaseConnectionGenerator.get().connect()
+    rdb_create_all()
+    populate(args.size)
+
+    print(f"== {args.size} items, sort by funding (full list)")
+    for name, func in [("ORM entities", legacy_sort_by_fundingmoney),
+                       ("column projection", ItemQuery.sort_by_fundingmoney)]:
+        rows_per_sec, peak = measure(func, args.repeat)
+        print(f"{name:<20} {rows_per_sec:>12.0f} rows/sec  peak {peak:>8.1f} MB")
+
+    DatabaseConnectionGenerator.get().disconnect()
+    remove_test_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+""" /item/list 스트리밍 응답 벤치마크
+
+    전체 리스트를 만든 다음 한번에 출력하는 기존 응답과
+    stream=true 로 한 항목씩 출력하는 응답의 최대 메모리 사용량과 처리 시간을 비교한다.
+    클라이언트는 응답을 저장하지 않고 읽기만 한다.
+
+    실행: python -m benchmark.bench_list_stream --sizes 10000 100000
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Tuple
+
+from benchmark.fixtures import populate
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import rdb_create_all, remove_test_db
+
+
+def measure(client, uri: str) -> Tuple[int, float, float]:
+    """ (응답 크기, 처리 시간(초), 최대 메모리 MB) """
+    DatabaseConnectionGenerator.get_session().remove()
+
+    tracemalloc.start()
+    begin = time.perf_counter()
+    res = client.get(uri, buffered=False)
+    size = sum(len(chunk) for chunk in res.response)
+    res.close()
+    elapsed = time.perf_counter() - begin
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return size, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    remove_test_db()
+    # app은 import 시 DB에 연결한다
+    from app import app
+    client = app.test_client()
+
+    for size in args.sizes:
+        DatabaseConnectionGenerator.get().disconnect()
+        remove_test_db()
+        DatabaseConnectionGenerator.get().connect()
+        rdb_create_all()
+        populate(size)
+
+        print(f"== {size} items, order_by=총펀딩금액")
+        for name, uri in [("buffered", "/item/list?order_by=총펀딩금액"),
+                          ("stream", "/item/list?order_by=총펀딩금액&stream=true")]:
+            body, elapsed, peak = measure(client, uri)
+            print(f"{name:<10} {body / 1024 / 1024:>8.1f} MB body  {elapsed:>7.2f} sec  peak {peak:>8.1f} MB")
+
+    DatabaseConnectionGenerator.get().disconnect()
+    remove_test_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+""" 장시간 요청 처리 시 메모리(RSS) 벤치마크 (soak test)
+
+    상세 조회, 리스트, 유저 조회, 펀딩을 섞은 요청을 계속 보내면서
+    일정 요청마다 프로세스의 RSS와 커넥션 풀 상태를 출력한다.
+    요청이 끝날 때마다 DB 세션을 정리하므로 warmup 이후 RSS가 거의 늘어나지 않아야 한다.
+    --no-teardown 으로 세션 정리를 끈 경우와 비교할 수 있다.
+
+    실행: python -m benchmark.bench_soak --requests 1000000
+"""
+import argparse
+import resource
+import time
+from typing import List
+
+from benchmark.fixtures import populate
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import remove_test_db
+
+
+def rss_mb() -> float:
+    """ 현재 RSS (MB), /proc이 없으면 최대 RSS """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000000)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--sample", type=int, default=50000, help="RSS 출력 간격(요청 수)")
+    parser.add_argument("--warmup", type=int, default=20000, help="캐시가 찰 때까지 측정에서 제외하는 요청 수")
+    parser.add_argument("--no-teardown", action="store_true", help="요청 후 세션 정리를 끄고 실행")
+    args = parser.parse_args()
+
+    remove_test_db()
+    # app은 import 시 DB에 연결한다
+    import app as app_module
+    from manager.item_manager import ItemManager
+    if args.no_teardown:
+        app_module.app.teardown_appcontext_funcs.remove(app_module.remove_session)
+
+    populate(args.items)
+    ItemManager().reset()
+    client = app_module.app.test_client()
+
+    uris: List[str] = []
+    for idx in range(args.items):
+        uris.append(f"/item/상품 {idx}")
+        uris.append(f"/user/user{idx % 100}")
+    uris.append("/item/list?order_by=생성일&limit=20")
+    uris.append("/item/list?order_by=총펀딩금액&limit=20")
+    donate_every: int = 10
+
+    base: float = 0.0
+    begin = time.perf_counter()
+    print(f"{'requests':>10} {'rss MB':>8} {'growth':>8} {'req/s':>8} {'checked_out':>12}")
+    for n in range(1, args.requests + 1):
+        if n % donate_every == 0:
+            client.put(f"/item/상품 {n % args.items}/donate")
+        else:
+            client.get(uris[n % len(uris)])
+
+        if n == args.warmup:
+            base = rss_mb()
+        if n % args.sample == 0:
+            rss = rss_mb()
+            status = DatabaseConnectionGenerator.get_pool_status()
+            print(f"{n:>10} {rss:>8.1f} {rss - base if base else 0.0:>+8.1f} "
+                  f"{n / (time.perf_counter() - begin):>8.0f} {status.get('checked_out', '-'):>12}")
+
+    DatabaseConnectionGenerator.get().disconnect()
+    remove_test_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+""" 벤치마크용 데이터 생성 """
+import datetime
+import random
+from typing import List
+
+from sqlalchemy import insert
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import generate_id, normalize_name, to_chosung, User, Item, ItemContents
+
+USER_SIZE: int = 1000
+INSERT_CHUNK: int = 10000
+
+
+def populate(size: int) -> List[str]:
+    """ 테스트용 DB에 유저와 상품 size개 생성, 유저 아이디 리스트 리턴
+
+        ORM을 거치지 않고 bulk insert로 넣는다.
+    """
+    engine = DatabaseConnectionGenerator.get_engine()
+    user_ids: List[str] = [generate_id() for _ in range(USER_SIZE)]
+    now = datetime.datetime.now()
+
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": user_id, "name": f"user{idx}",
+             "nameNormalized": f"user{idx}", "nameChosung": f"user{idx}"}
+            for idx, user_id in enumerate(user_ids)
+        ])
+
+    for begin in range(0, size, INSERT_CHUNK):
+        items, contents = [], []
+        for idx in range(begin, min(begin + INSERT_CHUNK, size)):
+            item_id = generate_id()
+            name = f"상품 {idx}"
+            items.append({
+                "itemId": item_id,
+                "userId": user_ids[idx % USER_SIZE],
+                "name": name,
+                "nameNormalized": normalize_name(name),
+                "nameChosung": to_chosung(name),
+                "createDate": now - datetime.timedelta(seconds=random.randint(0, 10 ** 7)),
+                "endDate": now + datetime.timedelta(days=30),
+                "participantSize": 0,
+                "targetMoney": 1000000,
+                "currentMoney": random.randint(0, 1000) * 1000,
+                "fundingUnit": 1000,
+            })
+            contents.append({"itemId": item_id, "summary": f"상품 {idx}번 설명"})
+        with engine.begin() as conn:
+            conn.execute(insert(Item.__table__), items)
+            conn.execute(insert(ItemContents.__table__), contents)
+
+    return user_ids
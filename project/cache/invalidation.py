@@ -0,0 +1,38 @@
+""" 캐시 무효화 이벤트
+
+    한 매니저의 쓰기가 다른 매니저의 메모리 캐시에 영향을 줄 때 매니저끼리 직접 import 하지 않고
+    이벤트 이름으로 구독(subscribe)하고 발행(publish)한다.
+    EX) UserManager의 유저 이름 변경(USER_RENAMED) -> ItemManager의 상품 캐시, ETag, 순위표 게시자 이름 반영
+"""
+import threading
+from typing import Callable, Dict, List
+
+# 유저 이름 변경, listener(old_name, new_name)
+USER_RENAMED: str = "user_renamed"
+
+# {이벤트 이름: [listener]}
+_listeners: Dict[str, List[Callable[..., None]]] = {}
+_lock = threading.Lock()
+
+
+def subscribe(event: str, listener: Callable[..., None]):
+    """ 이벤트 구독, 같은 listener는 한번만 등록된다 """
+    with _lock:
+        listeners = _listeners.setdefault(event, [])
+        if listener not in listeners:
+            listeners.append(listener)
+
+
+def unsubscribe(event: str, listener: Callable[..., None]):
+    """ 이벤트 구독 해제 """
+    with _lock:
+        if listener in _listeners.get(event, []):
+            _listeners[event].remove(listener)
+
+
+def publish(event: str, *args):
+    """ 이벤트 발행, 구독한 listener를 등록한 순서대로 호출한다 """
+    with _lock:
+        listeners = list(_listeners.get(event, []))
+    for listener in listeners:
+        listener(*args)
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+
+class LRUCache:
+    """ 크기 제한이 있는 LRU 캐시
+
+        max_size를 넘으면 가장 오래 사용하지 않은 항목부터 제거하고(eviction)
+        ttl이 있으면 저장 후 ttl초가 지난 항목은 없는 것으로 취급한다.
+
+        하나의 항목을 여러 키로 찾을 수 있도록 별칭(alias)을 지원한다.
+        EX) 상품을 아이디로 저장하고 이름을 별칭으로 등록하면
+            이름으로 조회/삭제해도 같은 항목을 다룬다.
+
+        항목이 삭제될 때마다 version이 올라가므로 DB 조회 전 version을 기억해 두었다가
+        저장할 때 넘겨주면, 조회하는 사이에 삭제(무효화)된 오래된 값이 다시 저장되는 것을 막을 수 있다.
+    """
+
+    class _Entry:
+        __slots__ = ("value", "aliases", "expire_at")
+
+        def __init__(self, value: object, aliases: tuple, expire_at: Optional[float]):
+            self.value = value
+            self.aliases = aliases
+            self.expire_at = expire_at
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        :param max_size: 최대 항목 수
+        :param ttl: 항목 유효 시간(초), None이면 만료되지 않는다
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+
+        self.__entries: "OrderedDict[Hashable, LRUCache._Entry]" = OrderedDict()
+        # {별칭: 키}
+        self.__aliases: Dict[Hashable, Hashable] = {}
+        self.__lock = threading.Lock()
+        self.__version: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def version(self) -> int:
+        """ 삭제(무효화) 횟수 """
+        return self.__version
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """ 항목 조회, 없거나 만료되었으면 None
+
+        :param key: 키 또는 별칭
+        """
+        with self.__lock:
+            key = self.__aliases.get(key, key)
+            entry = self.__entries.get(key)
+            if entry and entry.expire_at is not None and entry.expire_at <= time.monotonic():
+                self.__remove(key)
+                entry = None
+            if not entry:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(
+            self,
+            key: Hashable,
+            value: object,
+            aliases: Iterable[Hashable] = (),
+            version: Optional[int] = None
+    ) -> bool:
+        """ 항목 저장
+
+        :param key: 키
+        :param value: 값
+        :param aliases: 별칭
+        :param version: 조회 전에 구한 version, 그 사이에 삭제가 있었으면 저장하지 않는다
+        :return: 저장 여부
+        """
+        with self.__lock:
+            if version is not None and version != self.__version:
+                return False
+            if key in self.__entries:
+                self.__remove(key)
+            expire_at = time.monotonic() + self.ttl if self.ttl is not None else None
+            self.__entries[key] = LRUCache._Entry(value, tuple(aliases), expire_at)
+            for alias in aliases:
+                self.__aliases[alias] = key
+
+            while len(self.__entries) > self.max_size:
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+            return True
+
+    def pop(self, key: Hashable) -> Optional[object]:
+        """ 항목 삭제(무효화)
+
+        :param key: 키 또는 별칭
+        :return: 삭제된 값
+        """
+        with self.__lock:
+            self.__version += 1
+            key = self.__aliases.get(key, key)
+            entry = self.__entries.get(key)
+            if not entry:
+                return None
+            self.__remove(key)
+            return entry.value
+
+    def pop_if(self, predicate: Callable[[object], bool]) -> int:
+        """ 조건에 맞는 항목 전부 삭제(무효화)
+
+        :return: 삭제된 항목 수
+        """
+        with self.__lock:
+            self.__version += 1
+            keys = [key for key, entry in self.__entries.items() if predicate(entry.value)]
+            for key in keys:
+                self.__remove(key)
+            return len(keys)
+
+    def clear(self):
+        """ 전부 삭제 """
+        with self.__lock:
+            self.__version += 1
+            self.__entries.clear()
+            self.__aliases.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """ 튜닝용 통계 """
+        with self.__lock:
+            return {
+                "size": len(self.__entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __remove(self, key: Hashable):
+        entry = self.__entries.pop(key)
+        for alias in entry.aliases:
+            if self.__aliases.get(alias) == key:
+                del self.__aliases[alias]
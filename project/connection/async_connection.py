@@ -0,0 +1,58 @@
+import json
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from connection.database_connection import DEFAULT_POOL_CONFIG, testing_database_url
+
+
+class AsyncDatabaseConnection:
+    """ 비동기 데이터베이스 커넥션 (asyncio)
+
+        DB 응답을 기다리는 동안 스레드를 붙잡지 않도록 create_async_engine을 사용한다.
+        테스트용은 aiosqlite(동기 커넥션과 같은 테스트용 DB), 배포용은 aiomysql(configs/rdb.json)을 사용하며
+        드라이버는 connect() 할 때 필요하므로 비동기 경로를 쓰지 않으면 설치하지 않아도 된다.
+
+        동기 커넥션(DatabaseConnection)처럼 여러개 생성해도 같은 엔진을 공유한다.
+        테이블 생성, 전문 검색 엔진 확인은 동기 커넥션으로 먼저 해야 한다.
+    """
+
+    __state = {"engine": None, "sessionmaker": None}
+
+    def __init__(self, *args):
+        self.__dict__ = self.__state
+
+    def connect(self):
+        if self.engine:
+            return
+        if DatabaseConnectionGenerator.is_testing():
+            # 테스트용
+            self.engine = create_async_engine(testing_database_url("sqlite+aiosqlite"))
+        else:
+            # 배포용, 커넥션 풀 설정은 동기 커넥션과 같다
+            with open("configs/rdb.json", "rt") as f:
+                data = json.load(f)
+            pool_config: Dict[str, object] = {**DEFAULT_POOL_CONFIG, **data.get("pool", {})}
+            self.engine = create_async_engine(
+                f"mysql+aiomysql://{data['user']}:{data['password']}@{data['host']}:{data['port']}/{data['database']}",
+                **pool_config
+            )
+        # 세션은 요청마다 만들고 닫으므로 commit 후에 값을 다시 읽지 않는다
+        self.sessionmaker = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+    async def disconnect(self):
+        # 연결 해제
+        if self.engine:
+            await self.engine.dispose()
+        self.engine, self.sessionmaker = None, None
+
+    def get_engine(self) -> Optional[AsyncEngine]:
+        return self.engine
+
+    def get_session(self) -> AsyncSession:
+        """ 새 세션, async with 문으로 사용한다 """
+        if not self.sessionmaker:
+            raise RuntimeError("async database is not connected")
+        return self.sessionmaker()
@@ -1,4 +1,5 @@
 import sys
+from typing import Dict
 
 import sqlalchemy
 
@@ -11,12 +12,27 @@ class DatabaseConnectionGenerator:
     """ 데이터베이스 커넥션 생성기
         직접 DBConnection을 생성하는 것이 아닌
         해당 클래스의 메소드를 통해 Connection을 관리한다.
+
+        unittest 모듈이 로드되어 있거나 use_testing()을 호출했으면 테스트용 커넥션을 사용한다.
     """
 
+    # unittest 밖에서도 테스트용 커넥션을 사용 (벤치마크 등)
+    __use_testing: bool = False
+
+    @staticmethod
+    def use_testing():
+        """ 테스트용(SQLite) 커넥션을 사용하도록 지정, DB를 사용하기 전에 호출해야 한다 """
+        DatabaseConnectionGenerator.__use_testing = True
+
+    @staticmethod
+    def is_testing() -> bool:
+        """ 테스트용 커넥션을 사용하는 지 여부 """
+        return DatabaseConnectionGenerator.__use_testing or 'unittest' in sys.modules
+
     @staticmethod
     def get() -> DatabaseConnection:
         """ 객체 자체를 리턴 """
-        if 'unittest' in sys.modules:
+        if DatabaseConnectionGenerator.is_testing():
             # 테스트용
             return TestingDatabaseConnection()
         else:
@@ -26,7 +42,7 @@ class DatabaseConnectionGenerator:
     @staticmethod
     def get_engine() -> sqlalchemy.engine.base.Engine:
         """ 엔진 호출 """
-        if 'unittest' in sys.modules:
+        if DatabaseConnectionGenerator.is_testing():
             return TestingDatabaseConnection().get_engine()
         else:
             return ProductionDatabaseConnection().get_engine()
@@ -35,7 +51,46 @@ class DatabaseConnectionGenerator:
     def get_session() -> scoped_session:
         """ 세션 호출 """
         # 주로 쿼리를 실행할 때 사용
-        if 'unittest' in sys.modules:
+        if DatabaseConnectionGenerator.is_testing():
             return TestingDatabaseConnection().get_session()
         else:
             return ProductionDatabaseConnection().get_session()
+
+    @staticmethod
+    def remove_session():
+        """ 현재 스레드의 세션 정리 (요청이 끝날 때 호출) """
+        if DatabaseConnectionGenerator.is_testing():
+            TestingDatabaseConnection().remove_session()
+        else:
+            ProductionDatabaseConnection().remove_session()
+
+    @staticmethod
+    def read_session():
+        """ 읽기 전용 세션 (with 문으로 사용)
+            복제본이 있으면 복제본에서, 없거나 현재 스레드에서 방금 쓰기가 있었으면 primary에서 읽는다.
+        """
+        if DatabaseConnectionGenerator.is_testing():
+            return TestingDatabaseConnection().read_session()
+        else:
+            return ProductionDatabaseConnection().read_session()
+
+    @staticmethod
+    def uses_replica() -> bool:
+        """ 현재 스레드(요청)의 읽기가 복제본으로 가는 지
+            복제본의 결과는 복제 지연으로 오래된 값일 수 있으므로 캐시에 넣거나 ETag를 발급하면 안 된다.
+        """
+        if DatabaseConnectionGenerator.is_testing():
+            return TestingDatabaseConnection().uses_replica()
+        else:
+            return ProductionDatabaseConnection().uses_replica()
+
+    @staticmethod
+    def get_pool_status() -> Dict[str, object]:
+        """ 커넥션 풀 상태와 사용 통계
+            (checked_out: 사용중인 커넥션 수, overflow: pool_size를 넘어서 만든 커넥션 수,
+             wait_avg/wait_max: 커넥션 대여 대기 시간(초), invalidations: 끊어진 커넥션 수 등)
+        """
+        if DatabaseConnectionGenerator.is_testing():
+            return TestingDatabaseConnection().get_pool_status()
+        else:
+            return ProductionDatabaseConnection().get_pool_status()
@@ -1,11 +1,139 @@
 import json
+import os
+import sqlite3
+import threading
+import time
 from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
 
 import sqlalchemy.engine
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, SingletonThreadPool
 from sqlalchemy.orm.scoping import scoped_session
 
+from connection.pool_metrics import PoolMetrics, InstrumentedQueuePool
+from connection.query_metrics import query_metrics
+
+# configs/rdb.json의 pool 항목이 없을 때 사용하는 커넥션 풀 설정
+DEFAULT_POOL_CONFIG: Dict[str, object] = {
+    "pool_size": 10,            # 유지하는 커넥션 수
+    "max_overflow": 20,         # pool_size를 넘어서 추가로 만들 수 있는 커넥션 수
+    "pool_timeout": 30,         # 커넥션을 빌릴 때 최대 대기 시간(초)
+    "pool_recycle": 3600,       # 커넥션 재사용 최대 시간(초), MySQL wait_timeout 보다 짧아야 한다
+    "pool_pre_ping": True,      # 커넥션을 빌릴 때 살아있는 지 확인
+}
+
+# 읽기 복제본(replica) 선택 방식
+REPLICA_SELECTIONS = ("round_robin", "least_busy")
+
+# 쓰기 후 같은 요청(클라이언트)의 읽기를 primary로 보내는 시간(초), 복제 지연 때문에 방금 쓴 데이터가 안 보이는 것을 막는다
+DEFAULT_READ_YOUR_WRITES: float = 1.0
+
+# 스레드(요청) 별 마지막 쓰기(commit) 시간
+# 요청이 끝나면 clear_write()로 지워야 같은 워커 스레드가 처리하는 다음 요청으로 넘어가지 않는다 (apis.read_your_writes)
+_thread_state = threading.local()
+
+
+def mark_write(at: Optional[float] = None):
+    """ 현재 스레드에서 쓰기가 있었음을 기록 (read-your-writes)
+        ORM 세션의 commit은 자동으로 기록되므로 엔진으로 직접 쓰는 경우에만 호출한다.
+
+    :param at: 쓰기 시간(time.time()), 없으면 현재 시간. 이전 요청의 쓰기 시간을 이어받을 때 사용한다
+    """
+    _thread_state.last_write = time.time() if at is None else at
+
+
+def last_write() -> Optional[float]:
+    """ 현재 스레드의 마지막 쓰기 시간(time.time()), 없으면 None """
+    return getattr(_thread_state, "last_write", None)
+
+
+def clear_write():
+    """ 현재 스레드의 쓰기 기록 삭제 """
+    _thread_state.last_write = None
+
+
+def _on_commit(session):
+    mark_write()
+
+
+# 테스트용 DB 모드 (TEST_DB 환경변수)
+# memory: 공유 캐시(shared-cache) 메모리 DB (기본값), file: DB 파일 (테스트 후 DB를 직접 열어볼 때 사용)
+TESTING_DB_MODES = ("memory", "file")
+
+
+def testing_database_mode() -> str:
+    mode: str = os.environ.get("TEST_DB", "memory")
+    if mode not in TESTING_DB_MODES:
+        raise ValueError(f"TEST_DB must be one of {TESTING_DB_MODES}")
+    return mode
+
+
+def testing_database_name() -> str:
+    """ 테스트용 DB 이름, 병렬 테스트(pytest-xdist) 시 워커마다 다른 DB를 사용한다 """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return f"test_{worker}" if worker else "test"
+
+
+def testing_database_url(driver: str = "sqlite") -> str:
+    """ 테스트용 DB 주소
+
+        memory 모드는 이름이 있는 공유 캐시 메모리 DB이므로
+        같은 프로세스 안에서는 다른 엔진(복제본, 비동기 엔진)도 같은 DB를 볼 수 있다.
+
+    :param driver: sqlite or sqlite+aiosqlite
+    """
+    if testing_database_mode() == "file":
+        return f"{driver}:///{testing_database_name()}.db"
+    return f"{driver}:///file:{testing_database_name()}?mode=memory&cache=shared&uri=true"
+
+
+# 공유 캐시 DB의 테이블 잠금을 기다리는 최대 시간 (초)
+SHARED_CACHE_LOCK_TIMEOUT = 5.0
+
+
+class _SharedCacheCursor(sqlite3.Cursor):
+    """ 공유 캐시 메모리 DB용 커서
+
+        공유 캐시에서는 다른 커넥션이 테이블을 잠그고 있으면 busy_timeout을 기다리지 않고 바로
+        "database table is locked" 에러가 나므로 잠금이 풀릴 때까지 같은 문장을 다시 실행한다.
+        (실패한 문장은 실행되지 않은 것이므로 다시 실행해도 된다)
+    """
+
+    def execute(self, *args):
+        return self.__retry(super().execute, *args)
+
+    def executemany(self, *args):
+        return self.__retry(super().executemany, *args)
+
+    @staticmethod
+    def __retry(func, *args):
+        deadline = time.monotonic() + SHARED_CACHE_LOCK_TIMEOUT
+        while True:
+            try:
+                return func(*args)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or time.monotonic() > deadline:
+                    raise
+                time.sleep(0.001)
+
+
+class _SharedCacheConnection(sqlite3.Connection):
+    def cursor(self, factory=_SharedCacheCursor):
+        return super().cursor(factory)
+
+
+def _read_uncommitted(dbapi_connection, connection_record):
+    # 읽기는 테이블 잠금을 잡지 않으므로 쓰기끼리만 기다린다 (서로 잠금을 기다리는 교착 방지)
+    dbapi_connection.execute("PRAGMA read_uncommitted = 1")
+
+
+def _sqlite_begin(conn):
+    # pysqlite의 트랜잭션 관리를 끈 커넥션에서 BEGIN을 직접 보낸다 (SAVEPOINT 사용을 위해)
+    conn.exec_driver_sql("BEGIN")
+
 
 class DatabaseConnection(metaclass=ABCMeta):
     """ RDB 커넥션
@@ -18,6 +146,14 @@ class DatabaseConnection(metaclass=ABCMeta):
 
     engine: sqlalchemy.engine.base.Engine
     session: scoped_session
+    pool_metrics: PoolMetrics
+
+    # 읽기 복제본
+    read_engines: List[sqlalchemy.engine.base.Engine]
+    read_pool_metrics: List[PoolMetrics]
+    read_sessionmaker: Optional[sessionmaker]
+    read_selection: str
+    read_your_writes: float
 
     @abstractmethod
     def __init__(self, *args):
@@ -31,6 +167,93 @@ class DatabaseConnection(metaclass=ABCMeta):
         # 데이터베이스 내부 세션 얻기
         return self.session
 
+    def remove_session(self):
+        """ 현재 스레드의 세션 정리
+
+            트랜잭션을 롤백하고 커넥션을 풀에 반납한 뒤 identity map을 비운다.
+            다음 get_session() 때 새 세션이 만들어진다.
+            요청이 끝날 때마다 (또는 백그라운드 스레드의 작업이 끝날 때마다) 호출한다.
+        """
+        if self.session:
+            self.session.remove()
+
+    def get_pool_status(self) -> Dict[str, object]:
+        # 커넥션 풀 상태와 사용 통계 얻기, 복제본이 있으면 replicas에 복제본 별 상태가 들어간다
+        res = self.pool_metrics.status(self.engine.pool)
+        if self.read_engines:
+            res['replicas'] = [
+                metrics.status(engine.pool) for engine, metrics in zip(self.read_engines, self.read_pool_metrics)
+            ]
+        return res
+
+    def set_replicas(
+            self,
+            engines: List[sqlalchemy.engine.base.Engine],
+            selection: str = "round_robin",
+            read_your_writes: float = DEFAULT_READ_YOUR_WRITES
+    ):
+        """ 읽기 복제본 엔진 등록
+
+        :param engines: 복제본 엔진, 비어있으면 모든 읽기를 primary에서 한다
+        :param selection: 복제본 선택 방식 round_robin or least_busy(사용중인 커넥션이 가장 적은 복제본)
+        :param read_your_writes: 쓰기 후 같은 요청(클라이언트)의 읽기를 primary로 보내는 시간(초)
+        """
+        if selection not in REPLICA_SELECTIONS:
+            raise ValueError(f"selection must be one of {REPLICA_SELECTIONS}")
+        self.read_engines = list(engines)
+        self.read_pool_metrics = []
+        for engine in self.read_engines:
+            metrics = PoolMetrics()
+            metrics.attach(engine)
+            query_metrics.attach(engine)
+            if isinstance(engine.pool, InstrumentedQueuePool):
+                engine.pool.metrics = metrics
+            self.read_pool_metrics.append(metrics)
+        self.read_sessionmaker = sessionmaker(autocommit=False, autoflush=False) if engines else None
+        self.read_selection = selection
+        self.read_your_writes = read_your_writes
+        self.read_counter = 0
+
+    def uses_replica(self) -> bool:
+        """ 현재 스레드(요청)의 읽기가 복제본으로 가는 지
+
+            복제본이 없거나 read_your_writes초 안에 쓰기가 있었으면 False (primary에서 읽는다)
+            시간이 지나면 False에서 True로만 바뀌므로 False를 확인한 뒤의 읽기는 복제본으로 갈 수도 있다.
+        """
+        written: Optional[float] = last_write()
+        return bool(self.read_engines) and (written is None or time.time() - written >= self.read_your_writes)
+
+    @contextmanager
+    def read_session(self) -> Iterator[Session]:
+        """ 읽기 전용 세션
+
+            복제본에서 읽어야 하면(uses_replica) 복제본 중 하나에 연결된 세션을 만들고 끝나면 닫는다.
+            아니면 primary 세션을 그대로 사용한다.
+        """
+        if not self.uses_replica():
+            yield self.session
+            return
+
+        session: Session = self.read_sessionmaker(bind=self.__choose_read_engine())
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def __choose_read_engine(self) -> sqlalchemy.engine.base.Engine:
+        if self.read_selection == "least_busy":
+            return min(self.read_engines,
+                       key=lambda e: e.pool.checkedout() if isinstance(e.pool, QueuePool) else 0)
+        # round robin, 정확한 순서보다 고르게 나뉘는 것이 중요하므로 lock은 걸지 않는다
+        self.read_counter += 1
+        return self.read_engines[self.read_counter % len(self.read_engines)]
+
+    def _create_session(self, engine: sqlalchemy.engine.base.Engine) -> scoped_session:
+        # primary 세션 생성, commit 시 read-your-writes를 위해 쓰기 시간을 기록한다
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        event.listen(factory, "after_commit", _on_commit)
+        return scoped_session(factory)
+
     @abstractmethod
     def connect(self):
         # 외부 연결
@@ -48,7 +271,10 @@ class TestingDatabaseConnection(DatabaseConnection):
         오로지 unittest에서만 사용해야 하며 배포용으로는 사용 금지
     """
 
-    __state = {"engine": None, "session": None}
+    __state = {"engine": None, "session": None, "pool_metrics": None,
+               "read_engines": [], "read_pool_metrics": [], "read_sessionmaker": None,
+               "read_selection": "round_robin", "read_your_writes": DEFAULT_READ_YOUR_WRITES, "read_counter": 0,
+               "keeper": None, "isolation": None}
 
     def __init__(self, *args):
         # __state에서 기존의 엔진 가져오기
@@ -58,22 +284,91 @@ class TestingDatabaseConnection(DatabaseConnection):
     def connect(self):
         if not self.engine:
             # engine이 없는 경우 -> connection을 활성화하지 않음
-            # test.db 파일을 이용한 테스팅
-            self.engine = create_engine("sqlite:///test.db")
-            self.session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=self.engine))
+            if testing_database_mode() == "memory":
+                # 스레드마다 커넥션 하나를 계속 사용한다
+                self.engine = create_engine(testing_database_url(), poolclass=SingletonThreadPool,
+                                            connect_args={"check_same_thread": False,
+                                                          "factory": _SharedCacheConnection})
+                event.listen(self.engine, "connect", _read_uncommitted)
+            else:
+                # DB 파일을 이용한 테스팅
+                self.engine = create_engine(testing_database_url())
+            self.pool_metrics = PoolMetrics()
+            self.pool_metrics.attach(self.engine)
+            query_metrics.attach(self.engine)
+            self.session = self._create_session(self.engine)
+            if testing_database_mode() == "memory":
+                # 메모리 DB는 마지막 커넥션이 닫히면 사라지므로 연결을 끊을 때까지 하나를 열어둔다
+                self.keeper = self.engine.raw_connection()
 
     def disconnect(self):
         # 연결 해제
+        self.end_isolation()
         if self.engine and self.session:
             self.session.remove()
+        if self.keeper:
+            # 메모리 DB 제거
+            self.keeper.close()
+            self.keeper = None
+        if self.engine:
+            self.engine.dispose()
         self.session, self.engine = None, None
+        self.set_replicas([])
+
+    def begin_isolation(self):
+        """ 테스트 격리 시작
+
+            커넥션 하나에서 바깥 트랜잭션을 열고 세션을 그 커넥션에 묶는다.
+            세션의 commit/rollback은 바깥 트랜잭션 안의 SAVEPOINT에서만 일어나므로
+            end_isolation에서 바깥 트랜잭션을 롤백하면 테스트 중에 쓴 데이터가 전부 사라진다.
+            테스트마다 테이블을 지우지 않아도 되지만 세션을 거치지 않고 엔진으로 직접 쓴 데이터는 남는다.
+        """
+        if self.isolation:
+            return
+        self.session.remove()
+
+        connection = self.engine.connect()
+        # pysqlite는 BEGIN을 알아서 보내고 SAVEPOINT 전에 commit 해버리므로 트랜잭션 관리를 끄고 직접 보낸다
+        connection.connection.dbapi_connection.isolation_level = None
+        event.listen(connection, "begin", _sqlite_begin)
+        self.isolation = {
+            "connection": connection,
+            "transaction": connection.begin(),
+            "savepoint": connection.begin_nested(),
+            # Borg 객체는 생성할 때마다 다르므로 제거할 때 같은 리스너를 쓰도록 저장한다
+            "listener": self.__restart_savepoint,
+        }
+        event.listen(self.session.session_factory, "after_transaction_end", self.isolation['listener'])
+        self.session.configure(bind=connection)
+
+    def end_isolation(self):
+        """ 테스트 격리 종료, 테스트 중에 쓴 데이터를 전부 롤백한다 """
+        if not self.isolation:
+            return
+        self.session.remove()
+        event.remove(self.session.session_factory, "after_transaction_end", self.isolation['listener'])
+
+        connection = self.isolation['connection']
+        self.isolation['transaction'].rollback()
+        event.remove(connection, "begin", _sqlite_begin)
+        connection.connection.dbapi_connection.isolation_level = ""
+        connection.close()
+        self.isolation = None
+        self.session.configure(bind=self.engine)
+
+    def __restart_savepoint(self, session, transaction):
+        # 세션에서 rollback하면 SAVEPOINT가 끝나므로 다시 연다
+        if self.isolation and not self.isolation['savepoint'].is_active:
+            self.isolation['savepoint'] = self.isolation['connection'].begin_nested()
 
 
 class ProductionDatabaseConnection(DatabaseConnection):
     """ 배포용 데이터베이스 커넥션
     """
 
-    __state = {"engine": None, "session": None}
+    __state = {"engine": None, "session": None, "pool_metrics": None,
+               "read_engines": [], "read_pool_metrics": [], "read_sessionmaker": None,
+               "read_selection": "round_robin", "read_your_writes": DEFAULT_READ_YOUR_WRITES, "read_counter": 0}
 
     def __init__(self, *args):
         self.__dict__ = self.__state
@@ -83,11 +378,36 @@ class ProductionDatabaseConnection(DatabaseConnection):
         with open("configs/rdb.json", "rt") as f:
             data = json.load(f)
 
-            self.engine = create_engine(
-                f"mysql+pymysql://{data['user']}:{data['password']}@{data['host']}:{data['port']}/{data['database']}")
-            self.session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=self.engine))
+            # 커넥션 풀 설정, 없는 항목은 기본값 사용
+            pool_config = {**DEFAULT_POOL_CONFIG, **data.get("pool", {})}
+
+            self.engine = self.__create_engine(data, pool_config)
+            self.pool_metrics = PoolMetrics()
+            self.pool_metrics.attach(self.engine)
+            self.engine.pool.metrics = self.pool_metrics
+            query_metrics.attach(self.engine)
+            self.session = self._create_session(self.engine)
+
+            # 읽기 복제본, 접속 정보 중 없는 항목은 primary와 같다
+            # 복제본은 읽기만 하므로 오래된 스냅샷을 보지 않도록 트랜잭션 없이(AUTOCOMMIT) 사용한다
+            self.set_replicas(
+                [self.__create_engine({**data, **replica}, pool_config, isolation_level="AUTOCOMMIT")
+                 for replica in data.get("replicas", [])],
+                selection=data.get("replica_selection", "round_robin"),
+                read_your_writes=data.get("read_your_writes", DEFAULT_READ_YOUR_WRITES)
+            )
+
+    @staticmethod
+    def __create_engine(data: Dict[str, object], pool_config: Dict[str, object], **kwargs):
+        return create_engine(
+            f"mysql+pymysql://{data['user']}:{data['password']}@{data['host']}:{data['port']}/{data['database']}",
+            poolclass=InstrumentedQueuePool,
+            **pool_config,
+            **kwargs
+        )
 
     def disconnect(self):
         if self.engine and self.session:
             self.session.remove()
         self.session, self.engine = None, None
+        self.set_replicas([])
@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+
+class PoolMetrics:
+    """ 커넥션 풀 사용 통계
+
+        풀 크기를 실제 사용량에 맞게 정하기 위해
+        커넥션 생성/대여/반납/무효화 횟수와 대여 대기 시간을 기록한다.
+        대기 시간은 InstrumentedQueuePool을 사용하는 경우에만 기록된다.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.connects: int = 0
+        self.checkouts: int = 0
+        self.checkins: int = 0
+        self.invalidations: int = 0
+        self.timeouts: int = 0
+        self.wait_count: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+
+    def attach(self, engine: Engine):
+        """ 엔진의 풀 이벤트에 등록 """
+        event.listen(engine, "connect", self.__on_connect)
+        event.listen(engine, "checkout", self.__on_checkout)
+        event.listen(engine, "checkin", self.__on_checkin)
+        event.listen(engine, "invalidate", self.__on_invalidate)
+        event.listen(engine, "soft_invalidate", self.__on_invalidate)
+
+    def on_wait(self, seconds: float, timed_out: bool = False):
+        """ 커넥션 대여 대기 시간 기록 """
+        with self.__lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def status(self, pool: Pool) -> Dict[str, object]:
+        """ 현재 풀 상태와 누적 통계 """
+        with self.__lock:
+            res: Dict[str, object] = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_count": self.wait_count,
+                "wait_avg": self.wait_total / self.wait_count if self.wait_count else 0.0,
+                "wait_max": self.wait_max,
+            }
+        if isinstance(pool, QueuePool):
+            res.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        return res
+
+    def __on_connect(self, dbapi_connection, connection_record):
+        with self.__lock:
+            self.connects += 1
+
+    def __on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self.__lock:
+            self.checkouts += 1
+
+    def __on_checkin(self, dbapi_connection, connection_record):
+        with self.__lock:
+            self.checkins += 1
+
+    def __on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self.__lock:
+            self.invalidations += 1
+
+
+class InstrumentedQueuePool(QueuePool):
+    """ 커넥션 대여 대기 시간을 PoolMetrics에 기록하는 QueuePool
+
+        create_engine(..., poolclass=InstrumentedQueuePool) 로 생성한 다음 metrics를 지정한다.
+    """
+
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        begin = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.on_wait(time.perf_counter() - begin, timed_out=True)
+            raise
+        if self.metrics:
+            self.metrics.on_wait(time.perf_counter() - begin)
+        return conn
+
+    def recreate(self):
+        # dispose 등으로 풀이 다시 만들어져도 같은 통계를 사용한다
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryMetrics:
+    """ 요청별 SQL 실행 통계
+
+        엔진의 cursor 실행 이벤트로 요청 하나에서 실행된 SQL 문장 수, 총 DB 시간, 가장 느린 문장을 기록하고
+        요청이 끝나면 route 별로 모은다. (어떤 API가 쿼리를 몇 번 보내는지 확인하기 위해)
+
+        요청 구간은 begin()/end()로 지정하며 스레드 별로 따로 기록한다.
+        요청 밖(백그라운드 스레드 등)에서 실행된 SQL은 기록하지 않는다.
+    """
+
+    # 기록할 SQL 문장의 최대 길이
+    MAX_STATEMENT_LENGTH: int = 200
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__routes: Dict[str, Dict[str, object]] = {}
+
+    def attach(self, engine: Engine):
+        """ 엔진의 SQL 실행 이벤트에 등록 """
+        event.listen(engine, "before_cursor_execute", self.__before_execute)
+        event.listen(engine, "after_cursor_execute", self.__after_execute)
+        event.listen(engine, "handle_error", self.__on_error)
+
+    def begin(self):
+        """ 현재 스레드에서 요청 기록 시작 """
+        self.__local.current = {"count": 0, "time": 0.0, "slowest_time": 0.0, "slowest": None}
+
+    def current(self) -> Optional[Dict[str, object]]:
+        """ 현재 스레드에서 기록중인 요청의 통계, 기록중이 아니면 None
+
+            count: SQL 문장 수, time: 총 DB 시간(초), slowest_time/slowest: 가장 느린 문장의 시간(초)과 SQL
+        """
+        return getattr(self.__local, "current", None)
+
+    def end(self, route: Optional[str] = None) -> Optional[Dict[str, object]]:
+        """ 현재 스레드의 요청 기록 종료, route가 있으면 route 별 통계에 더한다 """
+        stats = self.current()
+        self.__local.current = None
+        if stats is None or route is None:
+            return stats
+
+        with self.__lock:
+            res = self.__routes.setdefault(route, {
+                "requests": 0, "statements": 0, "statements_max": 0,
+                "time": 0.0, "slowest_time": 0.0, "slowest": None
+            })
+            res['requests'] += 1
+            res['statements'] += stats['count']
+            res['statements_max'] = max(res['statements_max'], stats['count'])
+            res['time'] += stats['time']
+            if stats['slowest_time'] > res['slowest_time']:
+                res['slowest_time'], res['slowest'] = stats['slowest_time'], stats['slowest']
+        return stats
+
+    def status(self) -> Dict[str, Dict[str, object]]:
+        """ route 별 누적 통계
+
+            requests: 요청 수, statements: SQL 문장 수, statements_avg/statements_max: 요청 당 평균/최대 문장 수,
+            time/time_avg: 총/요청 당 평균 DB 시간(초), slowest_time/slowest: 가장 느린 문장의 시간(초)과 SQL
+        """
+        with self.__lock:
+            return {
+                route: {
+                    **res,
+                    "statements_avg": res['statements'] / res['requests'],
+                    "time_avg": res['time'] / res['requests'],
+                }
+                for route, res in self.__routes.items()
+            }
+
+    def reset(self):
+        """ route 별 통계 초기화 """
+        with self.__lock:
+            self.__routes.clear()
+
+    def __before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.current() is not None:
+            conn.info.setdefault("query_metrics_begin", []).append(time.perf_counter())
+
+    def __after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stats = self.current()
+        begin_stack = conn.info.get("query_metrics_begin")
+        if stats is None or not begin_stack:
+            return
+        elapsed: float = time.perf_counter() - begin_stack.pop()
+        stats['count'] += 1
+        stats['time'] += elapsed
+        if elapsed > stats['slowest_time']:
+            stats['slowest_time'], stats['slowest'] = elapsed, statement[:self.MAX_STATEMENT_LENGTH]
+
+    @staticmethod
+    def __on_error(context):
+        # 실패한 문장은 after_cursor_execute가 호출되지 않으므로 시작 시간을 버린다
+        begin_stack = context.connection.info.get("query_metrics_begin") if context.connection else None
+        if begin_stack:
+            begin_stack.pop()
+
+
+# 모든 엔진(primary, 복제본)이 같이 사용하는 통계
+query_metrics: QueryMetrics = QueryMetrics()
@@ -0,0 +1,142 @@
+import atexit
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from query.err_codes import ItemQueryErrorCode
+from query.item_query import ItemQuery
+
+
+class DonationAggregator:
+    """ 펀딩 write-behind 집계기
+
+        펀딩 요청이 들어올 때마다 DB에 반영하지 않고 상품별로 펀딩 횟수를 메모리에 모아둔 다음
+        일정 시간(flush_interval)마다 또는 모인 펀딩 횟수가 flush_threshold를 넘으면
+        상품당 UPDATE 한번씩, 하나의 트랜잭션으로 DB에 반영한다.
+
+        최대 flush_interval 만큼 DB 상의 값이 늦게 반영되는 대신
+        같은 상품에 몰리는 펀딩의 쓰기 부하를 크게 줄일 수 있다.
+    """
+
+    def __init__(
+            self,
+            flush_interval: float = 1.0,
+            flush_threshold: int = 1000,
+            on_flush: Optional[Callable[[Dict[Tuple[str, str], int]], None]] = None
+    ):
+        """
+        :param flush_interval: DB 반영 주기(초)
+        :param flush_threshold: 반영되지 않은 펀딩 횟수가 이 값 이상이면 바로 반영
+        :param on_flush: DB 반영 후 호출, 반영에 성공한 {(검색 항목, 검색 값): 펀딩 횟수}가 들어간다.
+        """
+        self.flush_interval: float = flush_interval
+        self.flush_threshold: int = flush_threshold
+        self.on_flush = on_flush
+
+        # {(검색 항목, 검색 값): 펀딩 횟수}
+        self.__pending: Dict[Tuple[str, str], int] = {}
+        self.__pending_donations: int = 0
+        self.__lock = threading.Lock()
+
+        # flush는 한번에 하나만 수행
+        self.__flush_lock = threading.Lock()
+
+        self.__wakeup = threading.Event()
+        self.__closed: bool = False
+        self.__thread = threading.Thread(target=self.__run, name="donation-aggregator", daemon=True)
+        self.__thread.start()
+
+        # 서버 종료 시 남은 펀딩 반영
+        atexit.register(self.close)
+
+    @property
+    def pending_items(self) -> int:
+        """ 아직 DB에 반영되지 않은 상품 수 """
+        return len(self.__pending)
+
+    @property
+    def pending_donations(self) -> int:
+        """ 아직 DB에 반영되지 않은 펀딩 횟수 """
+        return self.__pending_donations
+
+    def add(self, key: str, value: str, count: int = 1):
+        """ 펀딩 추가
+            close() 이후에는 모은 펀딩을 반영할 flush 스레드가 없으므로 모으지 않고 바로 DB에 반영한다.
+        """
+        with self.__lock:
+            closed: bool = self.__closed
+            if not closed:
+                self.__pending[(key, value)] = self.__pending.get((key, value), 0) + count
+                self.__pending_donations += count
+            full: bool = self.__pending_donations >= self.flush_threshold
+
+        if closed:
+            self.__donate_now(key, value, count)
+        elif full:
+            # 요청 스레드에서 직접 반영하지 않고 flush 스레드를 깨운다
+            self.__wakeup.set()
+
+    def flush(self) -> Dict[Tuple[str, str], int]:
+        """ 모인 펀딩을 DB에 반영
+
+        :return: 반영을 시도한 펀딩 {(검색 항목, 검색 값): 펀딩 횟수}, 상품이 없어서 버려진 펀딩은 경고 로그를 남긴다
+        """
+        with self.__flush_lock:
+            with self.__lock:
+                batch, self.__pending = self.__pending, {}
+                self.__pending_donations = 0
+
+            if not batch:
+                return batch
+
+            try:
+                res = ItemQuery.donate_many(batch)
+            except Exception as e:
+                # 반영 실패 시 다음 flush 때 다시 반영할 수 있도록 되돌려 놓는다
+                with self.__lock:
+                    for k, count in batch.items():
+                        self.__pending[k] = self.__pending.get(k, 0) + count
+                        self.__pending_donations += count
+                raise e
+
+            dropped = {k: count for k, count in batch.items() if res[k] != ItemQueryErrorCode.SUCCEED}
+            if dropped:
+                # 모으는 사이에 삭제된 상품의 펀딩은 반영할 수 없다
+                logging.getLogger(__name__).warning("donations dropped (item not exists): %s", dropped)
+            if self.on_flush:
+                self.on_flush({k: count for k, count in batch.items() if k not in dropped})
+            return batch
+
+    def close(self):
+        """ flush 스레드 종료 후 남은 펀딩을 전부 반영 (drain) """
+        with self.__lock:
+            if self.__closed:
+                return
+            # 이후의 add()는 바로 DB에 반영된다
+            self.__closed = True
+        self.__wakeup.set()
+        self.__thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def __donate_now(self, key: str, value: str, count: int):
+        # 모으지 않고 바로 반영, 결과 처리는 flush와 같다
+        if ItemQuery.donate(key, value, count) != ItemQueryErrorCode.SUCCEED:
+            logging.getLogger(__name__).warning("donations dropped (item not exists): %s", {(key, value): count})
+        elif self.on_flush:
+            self.on_flush({(key, value): count})
+
+    def __run(self):
+        while not self.__closed:
+            self.__wakeup.wait(self.flush_interval)
+            self.__wakeup.clear()
+            if self.__closed:
+                break
+            try:
+                self.flush()
+            except Exception:
+                logging.getLogger(__name__).exception("donation flush failed")
+            finally:
+                # 요청 스레드가 아니므로 teardown이 없다, 커넥션을 들고 기다리지 않도록 직접 정리한다
+                DatabaseConnectionGenerator.remove_session()
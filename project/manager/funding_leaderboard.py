@@ -0,0 +1,225 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from query.item_query import ItemQuery
+
+
+class FundingLeaderboard:
+    """ 상위 K개 상품 순위표
+
+        총펀딩금액(또는 참가자 수) 순 상위 상품을 메모리에 들고 있다가
+        페이지 단위 리스트(ItemManager.sort_page)의 첫 페이지를 DB 조회 없이 바로 출력한다.
+        (페이지를 나누지 않는 전체 리스트는 순위표로 만들 수 없으므로 DB에서 조회한다)
+
+        시작 시 DB에서 상위 상품을 불러오고(seed), 이후에는 ItemManager가
+        상품 생성/수정/삭제/펀딩 시 순위표를 같이 갱신한다.
+        순위표 밖 상품의 펀딩은 펀딩 요청에서 DB를 읽지 않도록 기록만 해두고 다음 조회 때 DB에서 다시 읽는다.
+        갱신이 누락되거나 다른 서버에서 DB를 수정해서 생기는 차이는
+        주기적으로 DB와 다시 맞춘다(reconcile).
+
+        순위표는 size개 보다 여유있게 capacity개를 들고 있으며
+        항상 "DB 상의 상위 N개"만 들고 있도록 유지한다.
+        상품이 삭제되거나 금액이 내려가서 N이 size보다 작아지면 다음 조회 때 DB에서 다시 불러온다.
+    """
+
+    def __init__(self, order_by: str = "current_money", size: int = 100, reconcile_interval: float = 60.0):
+        """
+        :param order_by: 정렬 기준 current_money or participant_size
+        :param size: 순위표로 출력할 수 있는 최대 개수
+        :param reconcile_interval: DB와 다시 맞추는 주기(초)
+        """
+        self.order_by: str = order_by
+        self.size: int = size
+        self.capacity: int = size * 2
+        self.reconcile_interval: float = reconcile_interval
+
+        # 정렬된 순위표 항목, 리스트 항목 + funding_unit, target_money, participant_size
+        self.__entries: List[Dict[str, object]] = []
+        # DB의 전체 상품 수가 capacity보다 적어서 순위표가 모든 상품을 들고 있는 지
+        self.__complete: bool = False
+        # DB에서 다시 불러와야 하는 지
+        self.__dirty: bool = True
+        # 펀딩이 들어온 순위표 밖의 상품 {(검색 항목, 검색 값)}, 다음 조회 때 DB에서 다시 읽는다
+        self.__pending: Set[Tuple[str, str]] = set()
+        # 메모리에서 반영한 펀딩 순번
+        self.__donation_seq: int = 0
+        self.__lock = threading.RLock()
+
+        self.__reconciler: Optional[threading.Thread] = None
+        self.__stop = threading.Event()
+
+    def reconcile(self):
+        """ DB에서 상위 상품을 다시 불러온다
+
+            읽는 도중에 반영된 펀딩은 중복되거나 빠질 수 있으며 다음 reconcile 때 맞춰진다.
+        """
+        entries = ItemQuery.read_ranking(self.order_by, self.capacity)
+        with self.__lock:
+            self.__entries = entries
+            self.__complete = len(entries) < self.capacity
+            self.__dirty = False
+            self.__pending.clear()
+
+    def reset(self):
+        """ 순위표를 비우고 다음 조회 때 DB에서 다시 불러온다 """
+        with self.__lock:
+            self.__entries = []
+            self.__complete = False
+            self.__dirty = True
+            self.__pending.clear()
+
+    def top(self, limit: int) -> Optional[List[Dict[str, object]]]:
+        """ 상위 limit개 리스트 항목
+
+        :return: size보다 많이 요청하면 None
+        """
+        if limit > self.size:
+            return None
+        self.__refresh_pending()
+        with self.__lock:
+            if self.__dirty or (len(self.__entries) < limit and not self.__complete):
+                self.reconcile()
+            return [self.__to_list_element(entry) for entry in self.__entries[:limit]]
+
+    def on_donate(self, key: str, value: str, count: int = 1):
+        """ 펀딩 반영, DB를 읽지 않는다 """
+        with self.__lock:
+            if self.__dirty:
+                # 다음 조회 때 어차피 DB에서 다시 불러온다
+                return
+            entry = self.__find(key, value)
+            if not entry:
+                # 순위표 밖의 상품은 다음 조회 때 DB에서 다시 읽어서 순위권에 들었는 지 확인한다
+                # 너무 많으면 하나씩 읽지 않고 전부 다시 불러온다
+                self.__pending.add((key, value))
+                if len(self.__pending) > self.size:
+                    self.reset()
+                return
+            # refresh가 DB에서 읽는 사이에 반영된 펀딩인 지 확인하기 위해 순번을 남긴다
+            self.__donation_seq += 1
+            entry['donation_seq'] = self.__donation_seq
+            entry['participant_size'] += count
+            entry['current_money'] += entry['funding_unit'] * count
+            entry['percentage'] = entry['current_money'] * 100.0 / entry['target_money']
+            self.__sort()
+
+    def refresh(self, key: str, value: str):
+        """ 상품 하나를 DB에서 다시 읽어서 반영 (생성, 수정 시 사용)
+
+            DB는 lock 밖에서 읽는다. 읽는 사이에 메모리에서 펀딩이 반영되었으면
+            읽은 값에 그 펀딩이 들어있는 지 알 수 없으므로(중복 반영) 버리고 다음 조회 때 다시 읽는다.
+        """
+        with self.__lock:
+            if self.__dirty:
+                return
+            seq: int = self.__donation_seq
+
+        row = ItemQuery.read_ranking_item(key, value)
+        with self.__lock:
+            if self.__dirty:
+                return
+            current = self.__find("id", row['item_id']) if row else self.__find(key, value)
+            if current and current.get('donation_seq', 0) > seq:
+                self.__pending.add((key, value))
+                return
+            if row:
+                self.__remove(row['item_id'])
+                self.__offer(row)
+            else:
+                entry = self.__find(key, value)
+                if entry:
+                    self.__remove(entry['item_id'])
+
+    def remove(self, key: str, value: str):
+        """ 상품 삭제 반영 """
+        with self.__lock:
+            entry = self.__find(key, value)
+            if entry:
+                self.__remove(entry['item_id'])
+
+    def rename_user(self, old_name: str, new_name: str):
+        """ 게시자 이름 변경 반영 """
+        with self.__lock:
+            for entry in self.__entries:
+                if entry['user_name'] == old_name:
+                    entry['user_name'] = new_name
+
+    def start(self):
+        """ 주기적으로 DB와 다시 맞추는 스레드 시작 """
+        if self.__reconciler:
+            return
+        self.__stop.clear()
+        self.__reconciler = threading.Thread(
+            target=self.__run, name=f"leaderboard-{self.order_by}", daemon=True)
+        self.__reconciler.start()
+
+    def stop(self):
+        if self.__reconciler:
+            self.__stop.set()
+            self.__reconciler.join()
+            self.__reconciler = None
+
+    def __run(self):
+        while not self.__stop.wait(self.reconcile_interval):
+            try:
+                self.reconcile()
+            except Exception:
+                logging.getLogger(__name__).exception("leaderboard reconcile failed")
+            finally:
+                # 요청 스레드가 아니므로 teardown이 없다, 커넥션을 들고 기다리지 않도록 직접 정리한다
+                DatabaseConnectionGenerator.remove_session()
+
+    def __refresh_pending(self):
+        # 펀딩이 들어온 순위표 밖의 상품을 DB에서 다시 읽는다
+        with self.__lock:
+            pending, self.__pending = self.__pending, set()
+        for key, value in pending:
+            self.refresh(key, value)
+
+    def __sort_key(self, entry: Dict[str, object]) -> Tuple[int, str]:
+        # DB와 같은 순서 (정렬 기준 내림차순, 상품 아이디 내림차순)
+        return entry[self.order_by], entry['item_id']
+
+    def __sort(self):
+        self.__entries.sort(key=self.__sort_key, reverse=True)
+
+    def __find(self, key: str, value: str) -> Optional[Dict[str, object]]:
+        field = "item_id" if key == "id" else "name"
+        for entry in self.__entries:
+            if entry[field] == value:
+                return entry
+        return None
+
+    def __offer(self, row: Dict[str, object]):
+        # 순위권이면 추가
+        # 순위표가 모든 상품을 들고 있지 않다면 마지막 항목보다 높아야 순위권이다
+        if not self.__complete and \
+                (not self.__entries or self.__sort_key(row) < self.__sort_key(self.__entries[-1])):
+            return
+        self.__entries.append(row)
+        self.__sort()
+        if len(self.__entries) > self.capacity:
+            self.__entries.pop()
+            self.__complete = False
+
+    def __remove(self, item_id: str):
+        before: int = len(self.__entries)
+        self.__entries = [entry for entry in self.__entries if entry['item_id'] != item_id]
+        if len(self.__entries) != before and len(self.__entries) < self.size and not self.__complete:
+            # 순위표 밖의 상품이 순위권에 들어올 수 있으므로 다시 불러온다
+            self.__dirty = True
+
+    @staticmethod
+    def __to_list_element(entry: Dict[str, object]) -> Dict[str, object]:
+        # 순위표 항목에서 리스트 항목만 복사
+        return {
+            "item_id": entry['item_id'],
+            "name": entry['name'],
+            "user_name": entry['user_name'],
+            "current_money": entry['current_money'],
+            "percentage": entry['percentage'],
+            "end_date": entry['end_date'],
+            "create_date": entry['create_date']
+        }
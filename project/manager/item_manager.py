@@ -1,8 +1,20 @@
-from typing import Optional, List, Dict
+import base64
+import hashlib
+import json
+import threading
+import time
+import uuid
+from typing import Optional, List, Dict, Tuple, Iterator
 
+from cache import invalidation
+from cache.lru_cache import LRUCache
+from connection.connection_generator import DatabaseConnectionGenerator
+from manager.donation_aggregator import DonationAggregator
+from manager.funding_leaderboard import FundingLeaderboard
 from manager.manager import Manager
 import datetime
 
+from model.model import is_chosung
 from query.err_codes import ItemQueryErrorCode
 from query.item_query import ItemQuery
 
@@ -11,10 +23,59 @@ class ItemManager(Manager):
     """ 상품을 관리하는 매니저
     """
 
+    # 정렬 리스트 한 페이지의 최대 크기
+    LIST_MAX_PAGE_SIZE: int = 100
+
+    # 한번에 추가할 수 있는 최대 상품 수
+    BULK_MAX_SIZE: int = 10000
+
+    # 펀딩 write-behind 집계기, 사용하지 않으면 None
+    donation_aggregator: Optional[DonationAggregator] = None
+
+    # 상위 상품 순위표 {정렬 기준: 순위표}
+    # 다음 페이지 여부 확인을 위해 한 페이지 보다 하나 더 들고 있는다
+    leaderboards: Dict[str, FundingLeaderboard] = {
+        "current_money": FundingLeaderboard("current_money", size=LIST_MAX_PAGE_SIZE + 1),
+    }
+
+    # 상품 상세 정보 캐시 유효 시간(초)
+    # 캐시는 이 프로세스의 쓰기만 알 수 있으므로 (여러 워커 프로세스, ASGI 서버, 가져오기 명령어 등)
+    # 다른 프로세스에서 수정한 상품은 최대 ITEM_CACHE_TTL초 동안 오래된 정보가 출력된다
+    ITEM_CACHE_TTL: float = 5.0
+
+    # 상품 상세 정보 캐시, ("id", 상품 아이디)로 저장하고 ("name", 상품 이름)을 별칭으로 등록한다
+    item_cache: LRUCache = LRUCache(max_size=1024, ttl=ITEM_CACHE_TTL)
+
+    # 상품 상세 정보와 리스트는 읽기 복제본에서 읽을 수 있지만 (uses_replica)
+    # 복제본의 결과는 복제 지연으로 오래된 값일 수 있으므로 캐시에 넣거나 ETag를 발급하지 않는다
+
+    # ETag 유효 시간(초)
+    # 다른 서버(프로세스)에서 수정한 내용은 이 서버의 버전에 반영되지 않으므로
+    # 시간 구간을 ETag에 넣어서 최대 ETAG_TTL초 뒤에는 새로 응답하도록 한다
+    ETAG_TTL: int = 60
+    # 버전을 관리하는 최대 상품 수, 넘으면 전부 비우고 epoch를 올린다
+    ETAG_MAX_ITEMS: int = 100000
+
+    # ETag용 버전 정보
+    # 서버가 재시작되면 버전이 처음부터 다시 시작하므로 서버마다 다른 값을 ETag에 넣는다
+    __boot_id: str = uuid.uuid4().hex
+    # 올라가면 모든 ETag가 바뀐다 (유저 이름 변경, reset 등)
+    __epoch: int = 0
+    # 상품 쓰기(생성/수정/삭제/펀딩)마다 올라가는 리스트 버전
+    __list_version: int = 0
+    # {상품 아이디: 버전}
+    __item_versions: Dict[str, int] = {}
+    # 이름으로 요청해도 버전을 찾을 수 있도록 읽은 상품의 이름과 아이디를 기억한다
+    __item_ids: Dict[str, str] = {}
+    __item_names: Dict[str, str] = {}
+    __version_lock = threading.Lock()
+
     def __new__(cls, *args, **kwargs):
         # 하나의 서버에 하나의 객체만 있어야 하기 때문에 Singletone Pattern 도입
         if not hasattr(cls, 'item_manager_instance'):
             cls.item_manager_instance = super(ItemManager, cls).__new__(cls)
+            # 게시자 이름 변경은 UserManager에서 이벤트로 받는다
+            invalidation.subscribe(invalidation.USER_RENAMED, cls.item_manager_instance.rename_user)
         return cls.item_manager_instance
 
     def add_item(
@@ -45,17 +106,53 @@ class ItemManager(Manager):
                 user_info = ["id", user_id]
             elif user_name:
                 user_info = ["name", user_name]
-            return ItemQuery.create(
+            res_code = ItemQuery.create(
                 user=user_info,
                 name=title,
                 summary=summary,
                 target_money=target_money,
                 end_date=end_date,
                 funding_unit=funding_unit
-            ).value
+            )
         except Exception as e:
             raise e
 
+        if res_code == ItemQueryErrorCode.SUCCEED:
+            self.__touch_item("name", title)
+            for leaderboard in self.leaderboards.values():
+                leaderboard.refresh("name", title)
+        return res_code.value
+
+    def add_items(self, items: List[Dict[str, object]]) -> List[int]:
+        """ 상품 여러개 추가
+
+        :param items: 상품 정보 리스트, 각 항목은 add_item의 파라미터와 같다
+                      {title, summary, target_money, end_date, funding_unit, user_id or user_name}
+                      기존 데이터를 옮기는 경우 current_money도 넣을 수 있다 (Optional)
+        :return: 상품 별 에러 코드 (items와 같은 순서)
+        """
+        if len(items) > self.BULK_MAX_SIZE:
+            raise ValueError("too many items")
+
+        res_codes = ItemQuery.create_many([{
+            "user": ["id", item['user_id']] if item.get('user_id') else ["name", item.get('user_name')],
+            "name": item['title'],
+            "summary": item['summary'],
+            "end_date": item['end_date'],
+            "funding_unit": item['funding_unit'],
+            "target_money": item['target_money'],
+            "current_money": item.get('current_money'),
+        } for item in items])
+
+        succeed = [item for item, res_code in zip(items, res_codes) if res_code == ItemQueryErrorCode.SUCCEED]
+        for item in succeed:
+            self.__touch_item("name", item['title'])
+        if succeed:
+            # 상품마다 순위표를 갱신하지 않고 다음 조회 때 DB에서 한번에 다시 불러온다
+            for leaderboard in self.leaderboards.values():
+                leaderboard.reset()
+        return [res_code.value for res_code in res_codes]
+
     def update_item(
             self,
             title: Optional[str] = None,
@@ -83,7 +180,7 @@ class ItemManager(Manager):
             d = ['id', item_id]
         elif item_name:
             d = ['name', item_name]
-        return ItemQuery.update(
+        res_code = ItemQuery.update(
             item_code=d,
             name=title,
             summary=summary,
@@ -91,10 +188,32 @@ class ItemManager(Manager):
             funding_unit=funding_unit,
             participant_size=participant_size,
             current_money=current_money
-        ).value
+        )
+
+        if res_code == ItemQueryErrorCode.SUCCEED:
+            self.item_cache.pop(tuple(d))
+            self.__touch_item(*d, new_name=title)
+            # 이름이 바뀐 경우 새 이름으로 찾아야 한다
+            updated = ['name', title] if d[0] == 'name' and title else d
+            for leaderboard in self.leaderboards.values():
+                leaderboard.refresh(*updated)
+        return res_code.value
 
     def get_item(self, item_name: Optional[str] = None, item_id: Optional[str] = None) -> Dict[str, object]:
-        """ 상품 상세 정보 획득 """
+        """ 상품 상세 정보 획득
+
+            캐시에 있으면 DB 조회 없이 출력한다.
+            호출한 쪽에서 결과를 수정할 수 있으므로 항상 복사본을 출력한다.
+            캐시에 없으면 읽기 복제본이 있으면 복제본에서 읽는다. 복제본에서 읽은 결과는 캐시에 넣지 않는다.
+        """
+        return self.__read_item(item_name, item_id)[0]
+
+    def __read_item(
+            self,
+            item_name: Optional[str] = None,
+            item_id: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, object]], bool]:
+        # (상품 상세 정보, 캐시 또는 primary에서 읽었는 지), 복제본에서 읽은 결과는 캐시에 넣지 않는다
         d = None
 
         if item_id:
@@ -102,30 +221,215 @@ class ItemManager(Manager):
         elif item_name:
             d = ['name', item_name]
 
-        return ItemQuery.read(*d)
+        cached = self.item_cache.get(tuple(d))
+        if cached:
+            self.__learn_item(cached['item_id'], cached['name'])
+            return dict(cached), True
+
+        primary = not self.uses_replica()
+        # 조회하는 사이에 수정된 경우 오래된 값을 캐시에 넣지 않기 위해 조회 전 version을 기억한다
+        version = self.item_cache.version
+        res = ItemQuery.read(*d, primary=primary)
+        if res and primary:
+            self.item_cache.put(
+                ("id", res['item_id']), dict(res), aliases=[("name", res['name'])], version=version)
+            self.__learn_item(res['item_id'], res['name'])
+        return res, primary
+
+    def get_item_with_etag(
+            self,
+            item_name: Optional[str] = None,
+            item_id: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
+        """ 상품 상세 정보와 ETag 획득
+
+        :return: (상품 상세 정보, ETag), 읽는 도중 상품이 수정되었거나 복제본에서 읽었으면 ETag는 None
+        """
+        with self.__version_lock:
+            etag = self.__item_etag(item_name, item_id)
+            list_version = ItemManager.__list_version
+        res, fresh = self.__read_item(item_name=item_name, item_id=item_id)
+
+        if not fresh:
+            # 복제본의 결과는 ETag의 버전보다 오래된 값일 수 있다
+            return res, None
+        if res and not etag:
+            # 처음 읽은 상품은 읽은 다음 ETag를 구한다
+            # 읽는 사이에 쓰기가 있었으면 읽은 정보가 최신인지 알 수 없으므로 ETag를 만들지 않는다
+            with self.__version_lock:
+                if list_version == ItemManager.__list_version:
+                    etag = self.__item_etag(item_id=res['item_id'])
+        return res, etag if res else None
+
+    def get_item_etag(self, item_name: Optional[str] = None, item_id: Optional[str] = None) -> Optional[str]:
+        """ DB 조회 없이 상품 상세 정보의 ETag 획득
+
+        :return: ETag, 아직 읽은 적이 없는 상품이면 None
+        """
+        with self.__version_lock:
+            return self.__item_etag(item_name, item_id)
+
+    def get_list_etag(self) -> str:
+        """ DB 조회 없이 상품 리스트의 ETag 획득, 상품이 하나라도 바뀌면 바뀐다
+            primary에서 읽은 리스트에만 사용한다 (uses_replica)
+        """
+        with self.__version_lock:
+            return self.__make_etag("list", ItemManager.__list_version)
+
+    @staticmethod
+    def uses_replica() -> bool:
+        """ 현재 요청의 조회가 읽기 복제본으로 가는 지
+
+            복제본이 없거나 같은 클라이언트가 방금 쓰기를 했으면 (read-your-writes) False
+            복제본에서 읽은 결과는 캐시에 넣거나 ETag를 발급하면 안 되므로
+            리스트에 ETag를 붙이려면 이 값이 False일 때 primary=True로 읽어야 한다.
+        """
+        return DatabaseConnectionGenerator.uses_replica()
 
     def remove_item(self, item_name: Optional[str] = None, item_id: Optional[str] = None) -> int:
         """ 상품 삭제 """
         if item_id:
-            return ItemQuery.delete("id", item_id).value
+            d = ['id', item_id]
         elif item_name:
-            return ItemQuery.delete("name", item_name).value
+            d = ['name', item_name]
+        else:
+            return None
 
-    def get_list(self, regex: str) -> List[Dict[str, object]]:
-        """ 문자열 패턴을 이용한 상품 리스트 출력 """
-        return ItemQuery.read_item_list_by_name_regex(regex)
+        res_code = ItemQuery.delete(*d)
+        if res_code == ItemQueryErrorCode.SUCCEED:
+            self.item_cache.pop(tuple(d))
+            self.__touch_item(*d, removed=True)
+            for leaderboard in self.leaderboards.values():
+                leaderboard.remove(*d)
+        return res_code.value
 
-    def sort(self, sort_type: str) -> List[Dict[str, object]]:
-        """ 리스트 정렬 """
+    def get_list(self, regex: str, limit: Optional[int] = None, primary: bool = False) -> List[Dict[str, object]]:
+        """ 문자열 패턴을 이용한 상품 리스트 출력
+
+            초성으로만 이루어진 검색어는 상품 이름의 초성으로 검색하고
+            전문 검색 엔진을 사용할 수 있으면 상품 이름과 설명에서 관련도 순으로 검색하고
+            그렇지 않으면 상품 이름에 대한 LIKE 검색을 한다.
+
+        :param regex: 검색어
+        :param limit: 최대 개수, LIST_MAX_PAGE_SIZE를 넘을 수 없다
+                      없으면 전부 출력한다 (관련도 순으로 찾는 전문 검색만 LIST_MAX_PAGE_SIZE개까지)
+        :param primary: True이면 primary에서 읽는다 (결과에 ETag를 붙일 때), 아니면 복제본에서 읽을 수 있다
+        """
+        if limit is not None:
+            if limit <= 0:
+                raise ValueError("limit must be positive")
+            limit = min(limit, self.LIST_MAX_PAGE_SIZE)
+
+        if is_chosung(regex):
+            return ItemQuery.read_item_list_by_search_key(regex, limit, primary=primary)
+        if ItemQuery.full_text_searchable(regex):
+            return ItemQuery.search_item_list(regex, limit or self.LIST_MAX_PAGE_SIZE, primary=primary)
+        return ItemQuery.read_item_list_by_name_regex(regex, limit, primary=primary)
+
+    def sort(self, sort_type: str, primary: bool = False) -> List[Dict[str, object]]:
+        """ 리스트 정렬
+
+        :param sort_type: 정렬 기준 funding or create_date
+        :param primary: True이면 primary에서 읽는다 (결과에 ETag를 붙일 때), 아니면 복제본에서 읽을 수 있다
+        """
         if sort_type == "funding":
             # 현재 펀딩 금액 기준 정렬
-            return ItemQuery.sort_by_fundingmoney()
+            return ItemQuery.sort_by_fundingmoney(primary=primary)
         elif sort_type == "create_date":
             # 생성일 기준 정렬
-            return ItemQuery.sort_by_createdate()
+            return ItemQuery.sort_by_createdate(primary=primary)
         else:
             raise TypeError("Type not matched")
 
+    def iter_sort(
+            self,
+            sort_type: str,
+            batch_size: int = 1000,
+            primary: bool = False
+    ) -> Iterator[Dict[str, object]]:
+        """ 정렬된 전체 리스트를 한 항목씩 출력 (스트리밍)
+
+            sort와 같은 결과를 전체 리스트를 메모리에 올리지 않고 출력한다.
+
+        :param sort_type: 정렬 기준 funding or create_date
+        :param batch_size: DB에서 한번에 갖고올 행 수
+        :param primary: True이면 primary에서 읽는다 (결과에 ETag를 붙일 때), 아니면 복제본에서 읽을 수 있다
+        """
+        if sort_type == "funding":
+            return ItemQuery.iter_sort_by_fundingmoney(batch_size, primary=primary)
+        elif sort_type == "create_date":
+            return ItemQuery.iter_sort_by_createdate(batch_size, primary=primary)
+        else:
+            raise TypeError("Type not matched")
+
+    def iter_export(self, batch_size: int = 1000) -> Iterator[Dict[str, object]]:
+        """ 설명, 게시자 이름을 포함한 전체 상품 정보를 한 항목씩 출력 (내보내기용)
+
+        :param batch_size: DB에서 한번에 갖고올 행 수
+        """
+        return ItemQuery.iter_export(batch_size)
+
+    def sort_page(
+            self,
+            sort_type: str,
+            limit: int = LIST_MAX_PAGE_SIZE,
+            cursor: Optional[str] = None,
+            primary: bool = False
+    ) -> Tuple[List[Dict[str, object]], Optional[str]]:
+        """ 리스트 정렬 (페이지 단위)
+
+            이전 페이지의 마지막 항목을 기준으로 다음 페이지를 구하기 때문에(keyset pagination)
+            뒤쪽 페이지도 첫 페이지와 같은 비용으로 구할 수 있다.
+
+        :param sort_type: 정렬 기준 funding or create_date
+        :param limit: 페이지 크기, LIST_MAX_PAGE_SIZE를 넘을 수 없다
+        :param cursor: 이전 페이지에서 받은 다음 페이지 커서, 없으면 첫 페이지
+        :param primary: True이면 primary에서 읽는다 (결과에 ETag를 붙일 때), 아니면 복제본에서 읽을 수 있다
+        :return: (상품 리스트, 다음 페이지 커서 (마지막 페이지면 None))
+        """
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        limit = min(limit, self.LIST_MAX_PAGE_SIZE)
+        after = self.__decode_cursor(sort_type, cursor) if cursor else None
+
+        # 다음 페이지가 있는 지 확인하기 위해 하나 더 갖고온다
+        if sort_type == "funding":
+            # 첫 페이지는 DB 조회 없이 순위표에서 바로 갖고온다
+            res = None if after else self.leaderboards["current_money"].top(limit + 1)
+            if res is None:
+                res = ItemQuery.sort_by_fundingmoney(limit=limit + 1, after=after, primary=primary)
+        elif sort_type == "create_date":
+            res = ItemQuery.sort_by_createdate(limit=limit + 1, after=after, primary=primary)
+        else:
+            raise TypeError("Type not matched")
+
+        if len(res) <= limit:
+            return res, None
+        res = res[:limit]
+        return res, self.__encode_cursor(sort_type, res[-1])
+
+    @staticmethod
+    def __encode_cursor(sort_type: str, last: Dict[str, object]) -> str:
+        # 정렬 기준 값과 상품 아이디를 클라이언트가 해석하지 않는 문자열로 만든다
+        if sort_type == "funding":
+            key = last['current_money']
+        else:
+            key = last['create_date'].isoformat()
+        data = json.dumps([sort_type, key, last['item_id']]).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii')
+
+    @staticmethod
+    def __decode_cursor(sort_type: str, cursor: str) -> Tuple[object, str]:
+        try:
+            cursor_type, key, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            if cursor_type != sort_type:
+                raise ValueError("cursor type not matched")
+            if sort_type == "create_date":
+                key = datetime.datetime.fromisoformat(key)
+            return key, item_id
+        except Exception:
+            raise ValueError("cursor not matched")
+
     def donate_funding(
             self,
             item_name: Optional[str] = None,
@@ -137,6 +441,7 @@ class ItemManager(Manager):
         :param item_name: 아이템 이름
         :param item_id: 아이템 아이디
         :return: 성공 시 True, 실패 시 False(보통 상품이 없는 경우)
+                 집계기를 사용하는 경우 상품이 있으면 True (DB 반영은 나중에 한다)
         """
 
         if item_id:
@@ -144,24 +449,157 @@ class ItemManager(Manager):
         else:
             d = ['name', item_name]
 
-        # 상품 가져오기
-        item_info = ItemQuery.read(*d)
-
-        if not item_info:
-            # 상품 없음
-            return False
-
-        # 펀딩 하나 올리기
-        item_info["participant_size"] += 1
-        item_info['current_money'] += item_info['funding_unit']
+        if self.donation_aggregator:
+            # 집계기에 모아뒀다가 나중에 한번에 반영
+            # 상품이 있는 지 확인하고 (캐시에 있으면 DB 조회 없음)
+            # 반영 전에 상품 이름이 바뀌어도 빠지지 않도록 상품 아이디로 모은다
+            item = self.get_item(item_name=item_name, item_id=item_id)
+            if not item:
+                return False
+            self.donation_aggregator.add("id", item['item_id'])
+            return True
 
-        # 상품 업데이트
-        res_code = ItemQuery.update(
-            d,
-            participant_size=item_info['participant_size'],
-            current_money=item_info['current_money'])
+        # 읽기 없이 UPDATE 한번으로 펀딩 하나 올리기
+        res_code = ItemQuery.donate(*d)
 
         if res_code == ItemQueryErrorCode.SUCCEED:
+            self.item_cache.pop(tuple(d))
+            self.__touch_item(*d)
+            for leaderboard in self.leaderboards.values():
+                leaderboard.on_donate(*d)
             return True
         else:
             return False
+
+    def enable_donation_aggregator(self, flush_interval: float = 1.0, flush_threshold: int = 1000):
+        """ 펀딩 write-behind 집계기 사용
+
+        :param flush_interval: DB 반영 주기(초)
+        :param flush_threshold: 반영되지 않은 펀딩 횟수가 이 값 이상이면 바로 반영
+        """
+        if self.donation_aggregator:
+            self.disable_donation_aggregator()
+        self.donation_aggregator = DonationAggregator(
+            flush_interval, flush_threshold, on_flush=self.__on_donation_flush)
+
+    def disable_donation_aggregator(self):
+        """ 집계기 사용 해제, 남은 펀딩은 전부 DB에 반영한다 """
+        if self.donation_aggregator:
+            self.donation_aggregator.close()
+            self.donation_aggregator = None
+
+    def __on_donation_flush(self, donations: Dict[Tuple[str, str], int]):
+        # 집계기에서 DB에 반영한 펀딩을 순위표에도 반영
+        for (key, value), count in donations.items():
+            self.item_cache.pop((key, value))
+            self.__touch_item(key, value)
+            for leaderboard in self.leaderboards.values():
+                leaderboard.on_donate(key, value, count)
+
+    def enable_leaderboard(self, order_by: str, size: int = LIST_MAX_PAGE_SIZE + 1):
+        """ 순위표 추가 (EX: 참가자 수 순위표 participant_size) """
+        if order_by not in self.leaderboards:
+            self.leaderboards[order_by] = FundingLeaderboard(order_by, size=size)
+
+    def get_leaderboard(self, order_by: str = "current_money", limit: int = 10) -> List[Dict[str, object]]:
+        """ 순위표 상위 limit개 출력 """
+        res = self.leaderboards[order_by].top(limit)
+        if res is None:
+            raise ValueError("limit is too large")
+        return res
+
+    def start_leaderboards(self, reconcile_interval: Optional[float] = None):
+        """ 순위표를 DB에서 불러오고(seed) 주기적으로 DB와 다시 맞추는 스레드 시작 """
+        for leaderboard in self.leaderboards.values():
+            if reconcile_interval:
+                leaderboard.reconcile_interval = reconcile_interval
+            leaderboard.reconcile()
+            leaderboard.start()
+
+    def rename_user(self, old_name: str, new_name: str):
+        """ 게시자 이름 변경을 메모리에 들고 있는 상품 정보에 반영 """
+        self.item_cache.pop_if(lambda item: item['user_name'] == old_name)
+        self.__touch_all()
+        for leaderboard in self.leaderboards.values():
+            leaderboard.rename_user(old_name, new_name)
+
+    def configure_item_cache(self, max_size: int = 1024, ttl: Optional[float] = ITEM_CACHE_TTL):
+        """ 상품 상세 정보 캐시 설정, 기존 캐시는 비워진다
+
+        :param max_size: 최대 상품 수
+        :param ttl: 유효 시간(초), None이면 수정되기 전까지 유지 (프로세스가 하나뿐인 경우에만 사용)
+        """
+        ItemManager.item_cache = LRUCache(max_size=max_size, ttl=ttl)
+
+    def get_item_cache_stats(self) -> Dict[str, int]:
+        """ 상품 상세 정보 캐시 통계 (크기, hit, miss, eviction) """
+        return self.item_cache.stats()
+
+    def reset(self):
+        """ 메모리에 들고 있는 상품 정보(캐시, 순위표 등)를 비운다
+            DB를 직접 수정한 경우 사용
+        """
+        self.item_cache.clear()
+        self.__touch_all()
+        for leaderboard in self.leaderboards.values():
+            leaderboard.reset()
+
+    def __learn_item(self, item_id: str, name: str):
+        # 상품 이름과 아이디를 기억한다
+        with self.__version_lock:
+            if ItemManager.__item_names.get(item_id) == name:
+                return
+            if len(ItemManager.__item_names) >= self.ETAG_MAX_ITEMS:
+                self.__clear_versions()
+            old_name = ItemManager.__item_names.get(item_id)
+            if old_name is not None and ItemManager.__item_ids.get(old_name) == item_id:
+                del ItemManager.__item_ids[old_name]
+            ItemManager.__item_ids[name] = item_id
+            ItemManager.__item_names[item_id] = name
+
+    def __touch_item(self, key: str, value: str, new_name: Optional[str] = None, removed: bool = False):
+        # 상품 쓰기 시 리스트 버전과 상품 버전을 올린다
+        with self.__version_lock:
+            ItemManager.__list_version += 1
+            item_id = value if key == "id" else ItemManager.__item_ids.get(value)
+            if item_id is None:
+                # 읽은 적이 없는 상품이면 발급한 ETag도 없다
+                return
+            ItemManager.__item_versions[item_id] = ItemManager.__item_versions.get(item_id, 0) + 1
+
+            name = ItemManager.__item_names.pop(item_id, None)
+            if name is not None and ItemManager.__item_ids.get(name) == item_id:
+                del ItemManager.__item_ids[name]
+            if removed:
+                del ItemManager.__item_versions[item_id]
+            elif name is not None:
+                # 이름이 바뀌었으면 새 이름으로 기억한다
+                name = new_name or name
+                ItemManager.__item_ids[name] = item_id
+                ItemManager.__item_names[item_id] = name
+
+    def __touch_all(self):
+        # 모든 ETag를 바꾼다
+        with self.__version_lock:
+            self.__clear_versions()
+
+    @staticmethod
+    def __clear_versions():
+        ItemManager.__epoch += 1
+        ItemManager.__list_version += 1
+        ItemManager.__item_versions.clear()
+        ItemManager.__item_ids.clear()
+        ItemManager.__item_names.clear()
+
+    def __item_etag(self, item_name: Optional[str] = None, item_id: Optional[str] = None) -> Optional[str]:
+        # 아직 읽은 적이 없는 상품이면 None
+        if item_id is None:
+            item_id = ItemManager.__item_ids.get(item_name)
+        if item_id is None or item_id not in ItemManager.__item_names:
+            return None
+        return self.__make_etag("item", item_id, ItemManager.__item_versions.get(item_id, 0))
+
+    def __make_etag(self, *args) -> str:
+        value = "-".join(str(arg) for arg in (
+            ItemManager.__boot_id, ItemManager.__epoch, int(time.time() // self.ETAG_TTL), *args))
+        return hashlib.md5(value.encode('utf-8')).hexdigest()
@@ -1,5 +1,6 @@
 from typing import Dict, Optional
 
+from cache import invalidation
 from manager.manager import Manager
 from query.err_codes import UserQueryErrorCode
 from query.user_query import UserQuery
@@ -47,14 +48,20 @@ class UserManager(Manager):
         :return: 성공시 True, 실패시(이름이 중복되는 경우) False, 에러시 Raise Error
         """
         if user_id:
-            if UserQuery.update(key="id", target_value=user_id, new_name=new_name) == \
-                    UserQueryErrorCode.SUCCEED:
-                return True
-            else:
-                return False
+            key, value = "id", user_id
+            # 상품 정보에 들어있는 게시자 이름을 바꾸기 위해 기존 이름을 구한다
+            user = UserQuery.read("id", user_id)
+            old_name = user['name'] if user else None
         elif user_name:
-            if UserQuery.update(key="name", target_value=user_name, new_name=new_name) == \
-                    UserQueryErrorCode.SUCCEED:
-                return True
-            else:
-                return False
+            key, value = "name", user_name
+            old_name = user_name
+        else:
+            return False
+
+        if UserQuery.update(key=key, target_value=value, new_name=new_name) == \
+                UserQueryErrorCode.SUCCEED:
+            # 상품 정보에 들어있는 게시자 이름 반영 (ItemManager가 구독)
+            invalidation.publish(invalidation.USER_RENAMED, old_name, new_name)
+            return True
+        else:
+            return False
@@ -0,0 +1,19 @@
+""" DB 마이그레이션
+
+    기존 DB에 새로 추가된 컬럼을 만들고 비어있는 값을 채운다. (model.model.rdb_migrate)
+    서버(app.py)는 시작할 때 스키마를 바꾸지 않으므로 배포 전에 한번 실행한다.
+
+    실행: python -m model.migrate
+"""
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import rdb_migrate
+
+
+def main():
+    DatabaseConnectionGenerator.get().connect()
+    rdb_migrate()
+    DatabaseConnectionGenerator.get().disconnect()
+
+
+if __name__ == "__main__":
+    main()
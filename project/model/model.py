@@ -2,8 +2,13 @@ import re
 import datetime
 import random
 import string
+import unicodedata
+from typing import List, Optional, Tuple
+
+import sqlalchemy
 from sqlalchemy.orm import declarative_base, validates
-from sqlalchemy import Column, String, ForeignKey, DateTime, func, Integer
+from sqlalchemy import Column, String, ForeignKey, DateTime, func, Integer, Index, text, select
+from sqlalchemy.schema import CreateColumn
 from connection.connection_generator import DatabaseConnectionGenerator
 from query.err_codes import ItemQueryErrorCode, UserQueryErrorCode
 
@@ -16,6 +21,11 @@ USER_ID_REGEX: re.Pattern = re.compile(r"^([0-9A-Za-z]{60})$")
 USER_NAME_REGEX: re.Pattern = re.compile(r"^([a-zA-Zㄱ-힣0-9]{1,64})$")
 ITEM_ITEMID_REGEX: re.Pattern = re.compile(r"^([0-9A-Za-z]{60})$")
 
+""" Search Key """
+# 한글 초성 (유니코드 완성형 한글 순서)
+CHOSUNG_LIST: str = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+CHOSUNG_REGEX: re.Pattern = re.compile(r"^([ㄱ-ㅎ]+)$")
+
 
 class DatabaseRegexNotMatched(Exception):
     # validate 매칭이 안되는 경우에 대한 에러
@@ -27,6 +37,31 @@ class DatabaseRegexNotMatched(Exception):
         self.code = __code
 
 
+def normalize_name(name: str) -> str:
+    """ 검색용 정규화 이름 (NFC 정규화 + 소문자) """
+    return unicodedata.normalize("NFC", name).lower()
+
+
+def to_chosung(name: str) -> str:
+    """ 검색용 초성 문자열
+         한글 음절은 초성으로 바꾸고 나머지 문자는 정규화된 상태로 둔다. 공백은 제거한다.
+         EX) 크라우드 펀딩 -> ㅋㄹㅇㄷㅍㄷ
+    """
+    res: str = ""
+    for c in normalize_name(name):
+        if "가" <= c <= "힣":
+            # 한 초성당 21(중성) * 28(종성)개의 음절이 있다
+            res += CHOSUNG_LIST[(ord(c) - ord("가")) // 588]
+        elif not c.isspace():
+            res += c
+    return res
+
+
+def is_chosung(keyword: str) -> bool:
+    """ 검색어가 초성으로만 이루어져 있는 지 """
+    return bool(CHOSUNG_REGEX.match(keyword))
+
+
 def generate_id() -> str:
     """ 임의 랜덤 아이디 생성기
          Format: [날짜(microsecond까지)][랜덤]
@@ -50,6 +85,10 @@ class User(__base):
     id = Column("id", String(60), primary_key=True, index=True)
     name = Column("name", String(64), unique=True)
 
+    # 검색용 이름 (name이 바뀔 때 같이 계산된다)
+    name_normalized = Column("nameNormalized", String(64), index=True)
+    name_chosung = Column("nameChosung", String(64), index=True)
+
     @validates("id")
     def validate_id(self, __key, __id: str):
         if not USER_ID_REGEX.match(__id):
@@ -60,6 +99,8 @@ class User(__base):
     def validate_name(self, __key, __name: str):
         if not USER_NAME_REGEX.match(__name):
             raise DatabaseRegexNotMatched(UserQueryErrorCode.NAME_NOT_MATCHED, "user name not matched")
+        self.name_normalized = normalize_name(__name)
+        self.name_chosung = to_chosung(__name)
         return __name
 
 
@@ -76,14 +117,27 @@ class Item(__base):
         funding_unit: 1회당 펀딩 금액
     """
     __tablename__ = "item"
+    __table_args__ = (
+        # 생성일 순 정렬 및 페이지 커서 (ItemQuery.sort_by_createdate)
+        Index("ix_item_createDate_itemId", "createDate", "itemId"),
+        # 펀딩 금액 순 정렬 및 페이지 커서 (ItemQuery.sort_by_fundingmoney)
+        Index("ix_item_currentMoney_itemId", "currentMoney", "itemId"),
+    )
 
     item_id = Column("itemId", String(60), primary_key=True, index=True)
+    # 게시자 JOIN 및 게시자의 상품 찾기
     user_id = Column(
         "userId", ForeignKey("user.id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False, index=True
     )
     name = Column("name", String(128), nullable=False, unique=True)
-    create_date = Column("createDate", DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # 검색용 이름 (name이 바뀔 때 같이 계산된다)
+    name_normalized = Column("nameNormalized", String(128), index=True)
+    name_chosung = Column("nameChosung", String(128), index=True)
+    # SQLite의 CURRENT_TIMESTAMP는 SQLAlchemy의 datetime 저장 포맷과 달라서(마이크로초 생략)
+    # 생성일 비교(keyset pagination)가 어긋나므로 insert 시 값을 직접 넣는다.
+    create_date = Column("createDate", DateTime(timezone=True),
+                         default=datetime.datetime.now, server_default=func.now(), nullable=False)
     end_date = Column("endDate", DateTime(timezone=True), nullable=False)
 
     participant_size = Column("participantSize", Integer, default=0, nullable=False)
@@ -113,6 +167,8 @@ class Item(__base):
         if not __name or len(__name) > 128:
             raise DatabaseRegexNotMatched(
                 ItemQueryErrorCode.NAME_NOT_MATCHED, "name not matched")
+        self.name_normalized = normalize_name(__name)
+        self.name_chosung = to_chosung(__name)
         return __name
 
     @validates("end_date")
@@ -193,12 +249,150 @@ class ItemContents(__base):
 
 def rdb_create_all():
     # RDB 스키마 생성
+    engine = DatabaseConnectionGenerator.get_engine()
     __base.query = DatabaseConnectionGenerator.get_session().query_property()
-    __base.metadata.create_all(bind=DatabaseConnectionGenerator.get_engine())
+    __base.metadata.create_all(bind=engine)
+
+    # create_all은 이미 있는 테이블에 새로 추가된 컬럼을 만들지 않는다
+    # 서버 시작 시에는 스키마를 바꾸지 않고, 마이그레이션(python -m model.migrate)을 따로 실행해야 한다
+    with engine.connect() as conn:
+        missing = rdb_missing_columns(conn)
+    if missing:
+        raise RuntimeError(
+            f"database schema is outdated (missing {', '.join(f'{t.name}.{c.name}' for t, c in missing)}), "
+            f"run `python -m model.migrate` first")
+
+    for table in __base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    rdb_create_search_index()
+
+
+def rdb_missing_columns(conn) -> List[Tuple[sqlalchemy.Table, Column]]:
+    # 모델에는 있으나 DB 테이블에는 없는 컬럼 [(테이블, 컬럼)]
+    inspector = sqlalchemy.inspect(conn)
+    res = []
+    for table in __base.metadata.sorted_tables:
+        columns = [column['name'] for column in inspector.get_columns(table.name)]
+        res += [(table, column) for column in table.columns if column.name not in columns]
+    return res
+
+
+def rdb_migrate():
+    """ 기존 DB를 현재 모델에 맞게 변경
+
+        새로 추가된 컬럼을 만들고 (ALTER TABLE) 검색용 이름 등 비어있는 값을 채운 다음 rdb_create_all을 실행한다.
+        여러번 실행해도 없는 컬럼만 추가한다.
+    """
+    engine = DatabaseConnectionGenerator.get_engine()
+    __base.metadata.create_all(bind=engine)
+
+    # 컬럼 확인과 추가를 하나의 트랜잭션에서 한다 (MySQL은 DDL마다 commit 된다)
+    with engine.begin() as conn:
+        for table, column in rdb_missing_columns(conn):
+            conn.execute(text(
+                f"ALTER TABLE {engine.dialect.identifier_preparer.format_table(table)} "
+                f"ADD COLUMN {CreateColumn(column).compile(dialect=engine.dialect)}"))
+        rdb_fill_search_keys(conn)
+
+    rdb_create_all()
+
+
+def rdb_fill_search_keys(conn):
+    # 검색용 이름이 비어있는 기존 데이터 채우기
+    for model in (User, Item):
+        table = model.__table__
+        rows = conn.execute(
+            select(table.c.name).where(table.c.nameChosung.is_(None), table.c.name.isnot(None))).all()
+        if rows:
+            conn.execute(
+                table.update().where(table.c.name == sqlalchemy.bindparam("key")),
+                [{"key": row.name, "nameNormalized": normalize_name(row.name), "nameChosung": to_chosung(row.name)}
+                 for row in rows])
+
+
+""" Full-Text Search """
+
+# 전문 검색용 FTS5 가상 테이블 (SQLite)
+ITEM_SEARCH_TABLE: str = "itemSearch"
+
+# 상품 이름과 설명을 검색 테이블에 복사해두고 트리거로 생성/수정/삭제 시 같이 반영한다.
+# trigram 토크나이저를 사용해야 한국어 부분 문자열 검색이 가능하다.
+__SQLITE_SEARCH_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS {ITEM_SEARCH_TABLE}_contents_insert AFTER INSERT ON itemContents BEGIN
+        INSERT INTO {ITEM_SEARCH_TABLE}(itemId, name, summary)
+        SELECT item.itemId, item.name, new.summary FROM item WHERE item.itemId = new.itemId;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {ITEM_SEARCH_TABLE}_contents_update AFTER UPDATE OF summary ON itemContents BEGIN
+        UPDATE {ITEM_SEARCH_TABLE} SET summary = new.summary WHERE itemId = new.itemId;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {ITEM_SEARCH_TABLE}_item_update AFTER UPDATE OF name ON item BEGIN
+        UPDATE {ITEM_SEARCH_TABLE} SET name = new.name WHERE itemId = new.itemId;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {ITEM_SEARCH_TABLE}_item_delete AFTER DELETE ON item BEGIN
+        DELETE FROM {ITEM_SEARCH_TABLE} WHERE itemId = old.itemId;
+    END""",
+]
+
+# MySQL FULLTEXT 인덱스 {인덱스 이름: (테이블, 컬럼)}
+# 한국어는 띄어쓰기 단위로 검색이 되지 않으므로 ngram 파서를 사용한다.
+__MYSQL_FULLTEXT_INDEXES = {
+    "ft_item_name": ("item", "name"),
+    "ft_itemContents_summary": ("itemContents", "summary"),
+}
+
+# 사용 가능한 전문 검색 엔진 (sqlite or mysql), 없으면 None
+__full_text_search: Optional[str] = None
+
+
+def get_full_text_search() -> Optional[str]:
+    """ 사용 가능한 전문 검색 엔진 이름 (sqlite or mysql)
+        전문 검색을 사용할 수 없으면 None
+    """
+    return __full_text_search
+
+
+def rdb_create_search_index():
+    # 전문 검색용 테이블/인덱스 생성
+    global __full_text_search
+
+    engine = DatabaseConnectionGenerator.get_engine()
+    __full_text_search = None
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            if not engine.dialect.has_table(conn, ITEM_SEARCH_TABLE):
+                try:
+                    conn.execute(text(
+                        f"CREATE VIRTUAL TABLE {ITEM_SEARCH_TABLE} "
+                        f"USING fts5(itemId UNINDEXED, name, summary, tokenize='trigram')"))
+                except sqlalchemy.exc.OperationalError:
+                    # FTS5 또는 trigram 토크나이저를 지원하지 않는 SQLite
+                    return
+
+                # 기존 데이터 채우기
+                conn.execute(text(
+                    f"INSERT INTO {ITEM_SEARCH_TABLE}(itemId, name, summary) "
+                    f"SELECT item.itemId, item.name, itemContents.summary "
+                    f"FROM item JOIN itemContents ON item.itemId = itemContents.itemId"))
+
+            for trigger in __SQLITE_SEARCH_TRIGGERS:
+                conn.execute(text(trigger))
+            __full_text_search = "sqlite"
+
+        elif engine.dialect.name == "mysql":
+            inspector = sqlalchemy.inspect(conn)
+            for index_name, (table, column) in __MYSQL_FULLTEXT_INDEXES.items():
+                if index_name not in [index['name'] for index in inspector.get_indexes(table)]:
+                    conn.execute(text(
+                        f"CREATE FULLTEXT INDEX {index_name} ON {table}({column}) WITH PARSER ngram"))
+            __full_text_search = "mysql"
 
 
 def remove_test_db():
-    # 테스트 데이터베이스 파일 제거
+    # 테스트 데이터베이스 파일 제거 (메모리 DB는 연결을 끊을 때 사라진다)
     import os
-    if os.path.isfile("test.db"):
-        os.remove("test.db")
+    from connection.database_connection import testing_database_name
+    if os.path.isfile(f"{testing_database_name()}.db"):
+        os.remove(f"{testing_database_name()}.db")
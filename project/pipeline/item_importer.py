@@ -0,0 +1,200 @@
+""" 상품 가져오기 (import)
+
+    CSV/NDJSON 파일의 상품을 다음 단계의 제너레이터 파이프라인으로 DB에 넣는다.
+        읽기/변환(read_items) -> 검사 -> batch_size개씩 묶기 -> bulk insert(ItemManager.add_items)
+
+    파일 읽기는 메인 스레드에서, DB 쓰기는 스레드 풀에서 동시에 진행한다.
+    처리중인 묶음 수를 제한하므로 파일 크기와 상관없이 메모리 사용량이 일정하다.
+
+    checkpoint 파일을 지정하면 앞에서부터 연속으로 처리가 끝난 마지막 행 번호를 기록하고
+    실패 후 다시 실행하면 그 다음 행부터 이어서 처리한다.
+    (checkpoint 이후 이미 들어간 상품은 이름 중복으로 실패 처리된다)
+
+    실행: python -m pipeline.item_importer items.csv --user-name 유저01 --checkpoint items.checkpoint
+"""
+import argparse
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from manager.item_manager import ItemManager
+from model.model import rdb_create_all
+from pipeline.item_reader import read_items
+from query.err_codes import ItemQueryErrorCode
+
+# (행 번호, 상품 정보 또는 변환 실패)
+Row = Tuple[int, Union[Dict[str, object], ValueError]]
+
+
+class ItemImporter:
+    """ 상품 가져오기 """
+
+    def __init__(
+            self,
+            user_name: Optional[str] = None,
+            batch_size: int = 1000,
+            workers: int = 1,
+            checkpoint_path: Optional[str] = None
+    ):
+        """
+        :param user_name: 게시자 이름, 파일에 userName이 있으면 그 값이 우선
+        :param batch_size: 하나의 bulk insert로 넣을 행 수
+        :param workers: DB 쓰기 스레드 수 (SQLite는 쓰기가 동시에 되지 않으므로 1)
+        :param checkpoint_path: checkpoint 파일 경로, 없으면 사용하지 않는다
+        """
+        if batch_size > ItemManager.BULK_MAX_SIZE:
+            raise ValueError("batch size is too large")
+        self.user_name: Optional[str] = user_name
+        self.batch_size: int = batch_size
+        self.workers: int = workers
+        self.checkpoint_path: Optional[str] = checkpoint_path
+
+        self.__lock = threading.Lock()
+        self.__stats: Dict[str, object] = {}
+        # 처리가 끝난 묶음 {묶음 번호: 마지막 행 번호}
+        self.__done: Dict[int, int] = {}
+        # 다음에 checkpoint에 반영할 묶음 번호
+        self.__next_batch: int = 0
+        self.__checkpoint_row: int = 0
+        self.__source: str = ""
+
+    def run(self, path: str, fmt: Optional[str] = None) -> Dict[str, object]:
+        """ 파일의 상품을 DB에 넣는다
+
+        :param path: 파일 경로
+        :param fmt: csv or ndjson, 없으면 확장자로 구한다
+        :return: 통계 {rows, succeed, failed, skipped, errors: {에러 이름: 개수}}
+        """
+        self.__source = os.path.abspath(path)
+        self.__checkpoint_row = self.__load_checkpoint()
+        self.__stats = {"rows": 0, "succeed": 0, "failed": 0, "skipped": 0, "errors": {}}
+        self.__done, self.__next_batch = {}, 0
+
+        # 처리중인 묶음 수 제한
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        futures: List[Future] = []
+        error: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="item-import") as executor:
+            for seq, batch in enumerate(self.__batches(read_items(path, fmt))):
+                slots.acquire()
+                # 앞에서 DB 쓰기가 실패했으면 더 이상 넣지 않는다
+                error = next((f.exception() for f in futures if f.done() and f.exception()), None)
+                if error:
+                    slots.release()
+                    break
+                future = executor.submit(self.__insert, seq, batch)
+                future.add_done_callback(lambda _: slots.release())
+                futures = [f for f in futures if not f.done()] + [future]
+
+        error = error or next((f.exception() for f in futures if f.exception()), None)
+        if error:
+            raise error
+        return self.__stats
+
+    def __batches(self, rows: Iterator[Row]) -> Iterator[List[Row]]:
+        # checkpoint 이전 행은 건너뛰고 batch_size개씩 묶는다
+        batch: List[Row] = []
+        for row in rows:
+            if row[0] <= self.__checkpoint_row:
+                self.__stats['skipped'] += 1
+                continue
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def __insert(self, seq: int, batch: List[Row]):
+        # 스레드 풀에서 실행, 묶음 하나를 DB에 넣는다
+        items: List[Dict[str, object]] = []
+        errors: List[str] = []
+        for idx, item in batch:
+            if isinstance(item, ValueError):
+                logging.getLogger(__name__).debug("row %d: %s", idx, item)
+                errors.append("INVALID_RECORD")
+                continue
+            items.append({
+                "title": item['name'],
+                "summary": item['summary'],
+                "target_money": item['target_money'],
+                "end_date": item['end_date'],
+                "funding_unit": item['funding_unit'],
+                "current_money": item.get('current_money'),
+                "user_name": item.get('user_name', self.user_name),
+            })
+
+        try:
+            res_codes = ItemManager().add_items(items) if items else []
+        finally:
+            # 스레드 별 세션 정리
+            DatabaseConnectionGenerator.get_session().remove()
+        errors += [ItemQueryErrorCode(code).name for code in res_codes if code != ItemQueryErrorCode.SUCCEED.value]
+
+        with self.__lock:
+            self.__stats['rows'] += len(batch)
+            self.__stats['failed'] += len(errors)
+            self.__stats['succeed'] += len(batch) - len(errors)
+            for name in errors:
+                self.__stats['errors'][name] = self.__stats['errors'].get(name, 0) + 1
+
+            # 앞의 묶음이 전부 끝났을 때만 checkpoint를 옮긴다
+            self.__done[seq] = batch[-1][0]
+            row = None
+            while self.__next_batch in self.__done:
+                row = self.__done.pop(self.__next_batch)
+                self.__next_batch += 1
+            if row is not None:
+                self.__save_checkpoint(row)
+
+    def __load_checkpoint(self) -> int:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path, "rt") as f:
+            data = json.load(f)
+        if data['source'] != self.__source:
+            raise ValueError(f"checkpoint is for another file: {data['source']}")
+        return data['row']
+
+    def __save_checkpoint(self, row: int):
+        if not self.checkpoint_path:
+            return
+        # 중간에 종료되어도 파일이 깨지지 않도록 임시 파일에 쓴 다음 교체한다
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "wt") as f:
+            json.dump({"source": self.__source, "row": row}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV/NDJSON 파일의 상품을 DB에 넣는다")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+    parser.add_argument("--user-name", default=None, help="게시자 이름 (파일에 userName이 없는 경우)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--checkpoint", default=None, help="checkpoint 파일 경로")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    DatabaseConnectionGenerator.get().connect()
+    rdb_create_all()
+
+    stats = ItemImporter(
+        user_name=args.user_name,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint
+    ).run(args.path, args.format)
+    print(json.dumps(stats, ensure_ascii=False))
+
+    DatabaseConnectionGenerator.get().disconnect()
+
+
+if __name__ == "__main__":
+    main()
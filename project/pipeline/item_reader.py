@@ -0,0 +1,110 @@
+""" 상품 파일 읽기
+
+    CSV 또는 NDJSON(한 줄에 JSON 하나) 파일을 한 행씩 읽어서 상품 정보로 변환한다.
+    파일 전체를 메모리에 올리지 않으므로 행 수에 상관없이 메모리 사용량이 일정하다.
+    .gz로 끝나는 파일은 gzip 압축을 풀면서 읽는다.
+
+    항목 이름은 CSV 헤더와 같다.
+        name: 상품 이름
+        summary: 설명
+        endDate: 종료일 (%Y/%m/%d %H:%M:%S)
+        fundingUnit: 1회 펀딩 금액
+        targetMoney: 목표 금액
+        currentMoney: 현재 펀딩 금액 (Optional)
+        userName: 게시자 이름 (Optional)
+"""
+import csv
+import datetime
+import gzip
+import json
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+# 파일에서 사용하는 날짜 포맷
+DATE_FORMAT: str = "%Y/%m/%d %H:%M:%S"
+
+FORMATS = ("csv", "ndjson")
+
+
+def guess_format(path: str) -> str:
+    """ 파일 확장자로 포맷 구하기 """
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith(".ndjson") or name.endswith(".jsonl"):
+        return "ndjson"
+    raise ValueError(f"unknown file format: {path}")
+
+
+def open_text(path: str, mode: str = "rt"):
+    """ 텍스트 파일 열기, .gz로 끝나면 gzip으로 연다 """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def parse_item(record: Dict[str, object]) -> Dict[str, object]:
+    """ 파일의 한 행을 상품 정보로 변환
+
+    :raise ValueError: 항목이 없거나 형식이 맞지 않는 경우
+    """
+    try:
+        item: Dict[str, object] = {
+            "name": record['name'],
+            "summary": record['summary'],
+            "funding_unit": int(record['fundingUnit']),
+            "target_money": int(record['targetMoney']),
+            "end_date": datetime.datetime.strptime(record['endDate'], DATE_FORMAT),
+        }
+        # CSV에서는 빈 칸도 없는 것으로 취급한다
+        if record.get('currentMoney') not in (None, ""):
+            item['current_money'] = int(record['currentMoney'])
+        if record.get('userName'):
+            item['user_name'] = record['userName']
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"invalid record: {e}")
+    return item
+
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, object]]]:
+    """ 파일에서 한 행씩 읽기 (변환 전)
+
+    :param path: 파일 경로
+    :param fmt: csv or ndjson, 없으면 확장자로 구한다
+    :return: (행 번호(1부터 시작, 헤더 제외), 행) 제너레이터
+    """
+    fmt = fmt or guess_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown file format: {fmt}")
+
+    with open_text(path) as f:
+        if fmt == "csv":
+            for idx, record in enumerate(csv.DictReader(f), start=1):
+                yield idx, record
+        else:
+            idx = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                idx += 1
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                yield idx, record
+
+
+def read_items(
+        path: str,
+        fmt: Optional[str] = None
+) -> Iterator[Tuple[int, Union[Dict[str, object], ValueError]]]:
+    """ 파일에서 상품 정보를 한 행씩 읽기
+
+    :return: (행 번호, 상품 정보 또는 변환에 실패한 경우 ValueError) 제너레이터
+    """
+    for idx, record in read_records(path, fmt):
+        try:
+            if not isinstance(record, dict):
+                raise ValueError("invalid record")
+            yield idx, parse_item(record)
+        except ValueError as e:
+            yield idx, e
@@ -0,0 +1,317 @@
+import datetime
+from typing import List, Dict, Tuple, Optional, AsyncIterator
+
+import sqlalchemy.exc
+from sqlalchemy import select
+
+from connection.async_connection import AsyncDatabaseConnection
+from model.model import Item, ItemContents, DatabaseRegexNotMatched, generate_id
+from query.async_user_query import AsyncUserQuery
+from query.err_codes import ItemQueryErrorCode
+from query.item_query import ItemQuery
+from query.query import Query
+
+
+class AsyncItemQuery(Query):
+    """ 상품 CRUD 쿼리 (asyncio)
+
+        ItemQuery와 같은 동작을 하며 DB 응답을 기다리는 동안 이벤트 루프에 양보한다.
+        SQL문은 ItemQuery의 *_statement 메서드를 같이 사용한다.
+
+        쓰기(update, delete, donate)는 ItemManager를 거치지 않으므로 Flask 서버의 메모리 캐시
+        (상품 캐시, ETag 버전, 압축된 응답, 순위표)를 비우지 않는다. (asgi.py 참고)
+    """
+
+    @staticmethod
+    async def create(user: List[str],
+                     name: str,
+                     summary: str,
+                     end_date: datetime.datetime,
+                     funding_unit: int,
+                     target_money: int) -> ItemQueryErrorCode:
+        """ 상품 생성 (ItemQuery.create 참고) """
+
+        # 유저 찾기
+        user: Dict[str, object] = await AsyncUserQuery.read(*user)
+        if not user:
+            # 유저 없음
+            return ItemQueryErrorCode.USER_NOT_EXISTS
+
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            try:
+                item: Item = Item(
+                    item_id=generate_id(),
+                    user_id=user['id'],
+                    name=name,
+                    end_date=end_date,
+                    target_money=target_money,
+                    funding_unit=funding_unit
+                )
+                db_session.add(item)
+                db_session.add(ItemContents(item_id=item.item_id, summary=summary))
+                await db_session.commit()
+            except DatabaseRegexNotMatched as e:
+                # validate failed
+                return e.code
+            except sqlalchemy.exc.IntegrityError:
+                # 주로 아이템 이름이 중복되는 경우 발생
+                await db_session.rollback()
+                return ItemQueryErrorCode.ITEM_ALREADY_EXISTS
+            return ItemQueryErrorCode.SUCCEED
+
+    @staticmethod
+    async def create_many(items: List[Dict[str, object]], chunk_size: int = 500) -> List[ItemQueryErrorCode]:
+        """ 상품 여러개 생성 (ItemQuery.create_many 참고) """
+
+        # 게시자 찾기 (중복 제거)
+        users: Dict[Tuple[str, str], Optional[Dict[str, object]]] = {}
+        for item in items:
+            key = tuple(item['user'])
+            if key not in users:
+                users[key] = await AsyncUserQuery.read(*key)
+
+        res, rows = ItemQuery.prepare_rows(items, users)
+
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            for begin in range(0, len(rows), chunk_size):
+                chunk = rows[begin:begin + chunk_size]
+
+                # 이미 있는 이름
+                exists = set((await db_session.scalars(ItemQuery.existing_names_statement(chunk))).all())
+                for idx, row, _ in chunk:
+                    if row['name'] in exists:
+                        res[idx] = ItemQueryErrorCode.ITEM_ALREADY_EXISTS
+                chunk = [row for row in chunk if row[1]['name'] not in exists]
+
+                try:
+                    await AsyncItemQuery.__insert_items(db_session, chunk)
+                except sqlalchemy.exc.IntegrityError:
+                    # 검사와 insert 사이에 같은 이름의 상품이 생성된 경우 한 상품씩 다시 insert
+                    await db_session.rollback()
+                    for row in chunk:
+                        try:
+                            await AsyncItemQuery.__insert_items(db_session, [row])
+                        except sqlalchemy.exc.IntegrityError:
+                            await db_session.rollback()
+                            res[row[0]] = ItemQueryErrorCode.ITEM_ALREADY_EXISTS
+                        else:
+                            res[row[0]] = ItemQueryErrorCode.SUCCEED
+                else:
+                    for idx, _, _ in chunk:
+                        res[idx] = ItemQueryErrorCode.SUCCEED
+
+        return res
+
+    @staticmethod
+    async def __insert_items(db_session, rows: List[Tuple[int, Dict[str, object], Dict[str, object]]]):
+        # item, itemContents를 executemany로 insert 후 commit
+        if not rows:
+            return
+
+        def insert(session):
+            # 전문 검색 트리거가 item을 참조하므로 item을 먼저 insert 한다
+            session.bulk_insert_mappings(Item, [item for _, item, _ in rows])
+            session.bulk_insert_mappings(ItemContents, [contents for _, _, contents in rows])
+
+        await db_session.run_sync(insert)
+        await db_session.commit()
+
+    @staticmethod
+    async def read(key: str, value: str) -> Optional[Dict[str, object]]:
+        """ 상품 상세 정보 갖고오기 """
+        statement = ItemQuery.read_statement(key, value)
+        if statement is None:
+            return None
+
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            row = (await db_session.execute(statement)).first()
+
+        # 정보 없음
+        return ItemQuery.to_detail(row) if row else None
+
+    @staticmethod
+    async def update(item_code: List[str],
+                     name: str = None,
+                     summary: str = None,
+                     end_date: datetime.datetime = None,
+                     funding_unit: int = None,
+                     participant_size: int = None,
+                     current_money: int = None) -> ItemQueryErrorCode:
+        """ 상품 정보 수정하기 (ItemQuery.update 참고) """
+        ikey, ivalue = item_code
+        if ikey == 'id':
+            condition = Item.item_id == ivalue
+        elif ikey == "name":
+            condition = Item.name == ivalue
+        else:
+            return ItemQueryErrorCode.ITEM_NOT_EXISTS
+
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            item: Item = await db_session.scalar(select(Item).where(condition))
+            if not item:
+                # 상품 없음
+                return ItemQueryErrorCode.ITEM_NOT_EXISTS
+            contents: ItemContents = \
+                await db_session.scalar(select(ItemContents).where(ItemContents.item_id == item.item_id))
+
+            try:
+                # 선택적 정보 수정
+                if name:
+                    item.name = name
+                if end_date:
+                    item.end_date = end_date
+                if funding_unit is not None:
+                    item.funding_unit = funding_unit
+                if participant_size is not None:
+                    item.participant_size = participant_size
+                if current_money is not None:
+                    item.current_money = current_money
+                if summary is not None:
+                    contents.summary = summary
+            except DatabaseRegexNotMatched as e:
+                return e.code
+
+            try:
+                await db_session.commit()
+            except sqlalchemy.exc.IntegrityError:
+                # 보통 상품 이름이 충돌할 때 발생한다
+                await db_session.rollback()
+                return ItemQueryErrorCode.ITEM_ALREADY_EXISTS
+
+        return ItemQueryErrorCode.SUCCEED
+
+    @staticmethod
+    async def delete(key: str, value: str) -> ItemQueryErrorCode:
+        """ 상품 삭제 """
+        if key == "id":
+            condition = Item.item_id == value
+        elif key == "name":
+            condition = Item.name == value
+        else:
+            return ItemQueryErrorCode.ITEM_NOT_EXISTS
+
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            deleted_item: Item = await db_session.scalar(select(Item).where(condition))
+            if not deleted_item:
+                # 없음
+                return ItemQueryErrorCode.ITEM_NOT_EXISTS
+            contents = await db_session.scalar(
+                select(ItemContents).where(ItemContents.item_id == deleted_item.item_id))
+            await db_session.delete(deleted_item)
+            await db_session.delete(contents)
+            await db_session.commit()
+
+        # 삭제 성공
+        return ItemQueryErrorCode.SUCCEED
+
+    @staticmethod
+    async def donate(key: str, value: str, count: int = 1) -> ItemQueryErrorCode:
+        """ 펀딩 수행, DB 상에서 직접 값을 올리는 UPDATE 문 하나로 처리한다 (ItemQuery.donate 참고) """
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            matched: int = (await db_session.execute(ItemQuery.donate_statement(key, value, count))).rowcount
+            await db_session.commit()
+
+        if matched == 0:
+            # 상품 없음
+            return ItemQueryErrorCode.ITEM_NOT_EXISTS
+        return ItemQueryErrorCode.SUCCEED
+
+    @staticmethod
+    async def donate_many(donations: Dict[Tuple[str, str], int]) -> Dict[Tuple[str, str], ItemQueryErrorCode]:
+        """ 여러 상품의 펀딩을 하나의 트랜잭션으로 반영
+
+        :param donations: {(검색 항목, 검색 값): 펀딩 횟수}
+        :return: {(검색 항목, 검색 값): 에러 코드}
+        """
+        res: Dict[Tuple[str, str], ItemQueryErrorCode] = {}
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            # 상품 하나당 UPDATE 한번
+            for (key, value), count in donations.items():
+                matched: int = (await db_session.execute(ItemQuery.donate_statement(key, value, count))).rowcount
+                res[(key, value)] = \
+                    ItemQueryErrorCode.SUCCEED if matched else ItemQueryErrorCode.ITEM_NOT_EXISTS
+            await db_session.commit()
+        return res
+
+    """ expanded query """
+
+    @staticmethod
+    async def __fetch_list(statement) -> List[Dict[str, object]]:
+        # SELECT문을 실행해서 리스트 항목(dict)으로 변환
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            return [dict(row._mapping) for row in await db_session.execute(statement)]
+
+    @staticmethod
+    async def __stream_list(statement, batch_size: int) -> AsyncIterator[Dict[str, object]]:
+        # SELECT문을 서버 사이드 커서로 실행해서 batch_size개씩 리스트 항목(dict)으로 변환
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            result = await db_session.stream(statement)
+            try:
+                async for rows in result.partitions(batch_size):
+                    for row in rows:
+                        yield dict(row._mapping)
+            finally:
+                # 중간에 멈춰도 커서를 닫는다
+                await result.close()
+
+    @staticmethod
+    async def read_item_list_by_name_regex(name_regex: str, limit: Optional[int] = None) -> List[Dict[str, object]]:
+        """ 일부 문자열 패턴을 이용한 상품 리스트 구하기 """
+        return await AsyncItemQuery.__fetch_list(ItemQuery.name_regex_statement(name_regex, limit))
+
+    @staticmethod
+    async def read_item_list_by_search_key(keyword: str, limit: Optional[int] = None) -> List[Dict[str, object]]:
+        """ 검색용 이름 컬럼을 이용한 접두사 검색 (ItemQuery.read_item_list_by_search_key 참고) """
+        return await AsyncItemQuery.__fetch_list(ItemQuery.search_key_statement(keyword, limit))
+
+    @staticmethod
+    def full_text_searchable(keyword: str) -> bool:
+        """ 해당 검색어로 전문 검색(search_item_list)을 사용할 수 있는 지 여부 """
+        return ItemQuery.full_text_searchable(keyword)
+
+    @staticmethod
+    async def search_item_list(keyword: str, limit: int) -> List[Dict[str, object]]:
+        """ 전문 검색 엔진을 이용해 상품 이름과 설명에서 검색어를 찾는다 (ItemQuery.search_item_list 참고) """
+        return await AsyncItemQuery.__fetch_list(ItemQuery.search_statement(keyword, limit))
+
+    @staticmethod
+    async def sort_by_createdate(
+            limit: Optional[int] = None,
+            after: Optional[Tuple[datetime.datetime, str]] = None
+    ) -> List[Dict[str, object]]:
+        """ 생성일을 기준으로 정렬 (ItemQuery.sort_by_createdate 참고) """
+        return await AsyncItemQuery.__fetch_list(ItemQuery.sort_by_createdate_statement(limit, after))
+
+    @staticmethod
+    def iter_sort_by_createdate(batch_size: int = 1000) -> AsyncIterator[Dict[str, object]]:
+        """ 생성일을 기준으로 정렬된 전체 리스트를 한 항목씩 출력 (async for) """
+        return AsyncItemQuery.__stream_list(ItemQuery.sort_by_createdate_statement(None, None), batch_size)
+
+    @staticmethod
+    async def sort_by_fundingmoney(
+            limit: Optional[int] = None,
+            after: Optional[Tuple[int, str]] = None
+    ) -> List[Dict[str, object]]:
+        """ 펀딩코인순으로 정렬 (ItemQuery.sort_by_fundingmoney 참고) """
+        return await AsyncItemQuery.__fetch_list(ItemQuery.sort_by_fundingmoney_statement(limit, after))
+
+    @staticmethod
+    def iter_sort_by_fundingmoney(batch_size: int = 1000) -> AsyncIterator[Dict[str, object]]:
+        """ 펀딩코인순으로 정렬된 전체 리스트를 한 항목씩 출력 (async for) """
+        return AsyncItemQuery.__stream_list(ItemQuery.sort_by_fundingmoney_statement(None, None), batch_size)
+
+    @staticmethod
+    def iter_export(batch_size: int = 1000) -> AsyncIterator[Dict[str, object]]:
+        """ 설명, 게시자 이름을 포함한 전체 상품 정보를 생성일 순으로 한 항목씩 출력 (async for) """
+        return AsyncItemQuery.__stream_list(ItemQuery.export_statement(), batch_size)
+
+    @staticmethod
+    async def read_ranking(order_by: str, limit: int) -> List[Dict[str, object]]:
+        """ 순위표용 상위 상품 리스트 (ItemQuery.read_ranking 참고) """
+        return await AsyncItemQuery.__fetch_list(ItemQuery.ranking_statement(order_by, limit))
+
+    @staticmethod
+    async def read_ranking_item(key: str, value: str) -> Optional[Dict[str, object]]:
+        """ 순위표용 상품 하나, 없으면 None """
+        res = await AsyncItemQuery.__fetch_list(ItemQuery.ranking_item_statement(key, value))
+        return res[0] if res else None
@@ -0,0 +1,124 @@
+import sqlalchemy.exc
+from sqlalchemy import select
+
+from connection.async_connection import AsyncDatabaseConnection
+from model.model import User, DatabaseRegexNotMatched, generate_id, is_chosung
+from query.err_codes import UserQueryErrorCode
+from query.query import Query, prefix_condition
+from query.user_query import UserQuery
+from typing import List, Dict, Optional
+
+
+class AsyncUserQuery(Query):
+    """ 유저 관련 쿼리 (asyncio)
+
+        UserQuery와 같은 동작을 하며 DB 응답을 기다리는 동안 이벤트 루프에 양보한다.
+        유저 정보 캐시는 UserQuery와 같이 사용한다.
+    """
+
+    @staticmethod
+    async def create(name: str) -> UserQueryErrorCode:
+        """ 유저 생성 """
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            try:
+                db_session.add(User(id=generate_id(), name=name))
+                await db_session.commit()
+            except DatabaseRegexNotMatched as e:
+                # 이름이 맞지 않음
+                return e.code
+            except sqlalchemy.exc.IntegrityError:
+                # 동일한 이름의 유저
+                await db_session.rollback()
+                return UserQueryErrorCode.NAME_ALREADY_EXIST
+            return UserQueryErrorCode.SUCCEED
+
+    @staticmethod
+    async def read(key: str, value: str) -> Optional[Dict[str, str]]:
+        """ 유저 정보 찾기
+            캐시에 있으면 DB 조회 없이 출력한다.
+        """
+        if key not in ("name", "id"):
+            raise TypeError("Key is not matched")
+
+        cached = UserQuery.user_cache.get((key, value))
+        if cached:
+            return dict(cached)
+
+        # 조회하는 사이에 수정된 경우 오래된 값을 캐시에 넣지 않기 위해 조회 전 version을 기억한다
+        version = UserQuery.user_cache.version
+        condition = User.name == value if key == "name" else User.id == value
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            target = (await db_session.execute(select(User.id, User.name).where(condition))).first()
+
+        if not target:
+            # 데이터 없음
+            return None
+        res = {
+            "id": target.id,
+            "name": target.name
+        }
+        UserQuery.user_cache.put(("id", target.id), dict(res), aliases=[("name", target.name)], version=version)
+        return res
+
+    @staticmethod
+    async def update(key: str, target_value: str, new_name: str) -> UserQueryErrorCode:
+        """ 유저 이름 수정 """
+        if key == "name":
+            condition = User.name == target_value
+        elif key == "id":
+            condition = User.id == target_value
+        else:
+            raise TypeError("Key is not matched")
+
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            user: User = await db_session.scalar(select(User).where(condition))
+            if not user:
+                # 유저가 존재하지 않는 경우
+                return UserQueryErrorCode.USER_NOT_EXIST
+
+            try:
+                user.name = new_name
+                await db_session.commit()
+            except DatabaseRegexNotMatched as e:
+                # 이름이 맞지 않음
+                return e.code
+            except sqlalchemy.exc.IntegrityError:
+                # 동일한 이름의 유저
+                await db_session.rollback()
+                return UserQueryErrorCode.NAME_ALREADY_EXIST
+            UserQuery.user_cache.pop(("id", user.id))
+            return UserQueryErrorCode.SUCCEED
+
+    @staticmethod
+    async def delete(key: str, value: str) -> UserQueryErrorCode:
+        """ 유저 삭제, 상품은 삭제하지 않는다 (UserQuery.delete 참고) """
+        if key == "name":
+            condition = User.name == value
+        elif key == "id":
+            condition = User.id == value
+        else:
+            raise TypeError("Key is not matched")
+
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            user: User = await db_session.scalar(select(User).where(condition))
+            if not user:
+                # 해당 유저 없음
+                return UserQueryErrorCode.USER_NOT_EXIST
+            await db_session.delete(user)
+            await db_session.commit()
+            UserQuery.user_cache.pop(("id", user.id))
+            return UserQueryErrorCode.SUCCEED
+
+    """ Expanded Queries """
+
+    @staticmethod
+    async def search_users(regex: str) -> List[Dict[str, str]]:
+        """ 패턴으로 여러 사용자 찾기 (UserQuery.search_users 참고) """
+        if is_chosung(regex):
+            condition = prefix_condition(User.name_chosung, regex)
+        else:
+            condition = User.name.contains(regex)
+
+        async with AsyncDatabaseConnection().get_session() as db_session:
+            rows = await db_session.execute(select(User.name, User.id).where(condition))
+            return [{"name": row.name, "id": row.id} for row in rows]
@@ -1,18 +1,27 @@
 import datetime
-from typing import List, Dict
+from contextlib import nullcontext
+from typing import List, Dict, Tuple, Optional, Iterator
 
 import sqlalchemy.exc
-from sqlalchemy import desc
+from sqlalchemy import desc, or_, and_, table, column, text, select, update, type_coerce, Float
+from sqlalchemy.dialects.mysql import match
 
 from connection.connection_generator import DatabaseConnectionGenerator
-from model.model import User, Item, DatabaseRegexNotMatched, generate_id, ItemContents
+from model.model import User, Item, DatabaseRegexNotMatched, generate_id, ItemContents, \
+    get_full_text_search, ITEM_SEARCH_TABLE, is_chosung, normalize_name
 from query.err_codes import ItemQueryErrorCode
-from query.query import Query
+from query.query import Query, prefix_condition
 from query.user_query import UserQuery
 
 
 class ItemQuery(Query):
     """ 상품 CRUD 쿼리
+
+        SQL문을 만드는 *_statement 메서드는 비동기 쿼리(AsyncItemQuery)에서도 같이 사용한다.
+
+        조회는 읽기 복제본에서 해도 되는 경우(DatabaseConnectionGenerator.uses_replica) 복제본에서 한다.
+        복제본은 복제 지연으로 방금 수정된 값이 안 보일 수 있으므로 복제본에서 읽은 결과는 캐시에 넣거나 ETag를 발급하지 않는다.
+        primary가 True이면 항상 primary에서 읽는다.
     """
 
     @staticmethod
@@ -34,7 +43,7 @@ class ItemQuery(Query):
         """
 
         # 유저 찾기
-        user: Dict[str, object] = UserQuery.read(*user)
+        user: Dict[str, object] = UserQuery.read(*user, primary=True)
         if not user:
             # 유저 없음
             return ItemQueryErrorCode.USER_NOT_EXISTS
@@ -77,43 +86,182 @@ class ItemQuery(Query):
             return ItemQueryErrorCode.SUCCEED
 
     @staticmethod
-    def read(key: str, value: str) -> Dict[str, object]:
+    def create_many(items: List[Dict[str, object]], chunk_size: int = 500) -> List[ItemQueryErrorCode]:
+        """ 상품 여러개 생성
+
+            게시자는 중복없이 한번씩만 찾고, 모든 상품을 먼저 검사한 다음
+            검사를 통과한 상품만 chunk_size개씩 하나의 트랜잭션으로 bulk insert 한다.
+            chunk 안에서 이름이 중복되어 insert가 실패하면 해당 chunk만 한 상품씩 다시 insert 한다.
+
+        :param items: 상품 정보 리스트, 각 항목은 create의 파라미터와 같다
+                      {user, name, summary, end_date, funding_unit, target_money}
+                      기존 데이터를 옮기는 경우 current_money도 넣을 수 있다 (Optional)
+        :param chunk_size: 하나의 트랜잭션으로 insert할 상품 수
+        :return: 상품 별 에러 코드 (items와 같은 순서)
+        """
+
+        # 게시자 찾기 (중복 제거)
+        users: Dict[Tuple[str, str], Optional[Dict[str, object]]] = {}
+        for item in items:
+            key = tuple(item['user'])
+            if key not in users:
+                users[key] = UserQuery.read(*key, primary=True)
+
+        res, rows = ItemQuery.prepare_rows(items, users)
 
-        # 상품 갖고오기
         db_session = DatabaseConnectionGenerator.get_session()
+        for begin in range(0, len(rows), chunk_size):
+            chunk = rows[begin:begin + chunk_size]
+
+            # 이미 있는 이름
+            exists = set(name for name, in db_session.execute(ItemQuery.existing_names_statement(chunk)))
+            for idx, row, _ in chunk:
+                if row['name'] in exists:
+                    res[idx] = ItemQueryErrorCode.ITEM_ALREADY_EXISTS
+            chunk = [row for row in chunk if row[1]['name'] not in exists]
+
+            try:
+                ItemQuery.__insert_items(db_session, chunk)
+            except sqlalchemy.exc.IntegrityError:
+                # 검사와 insert 사이에 같은 이름의 상품이 생성된 경우
+                # 해당 chunk만 한 상품씩 다시 insert
+                db_session.rollback()
+                for row in chunk:
+                    try:
+                        ItemQuery.__insert_items(db_session, [row])
+                    except sqlalchemy.exc.IntegrityError:
+                        db_session.rollback()
+                        res[row[0]] = ItemQueryErrorCode.ITEM_ALREADY_EXISTS
+                    else:
+                        res[row[0]] = ItemQueryErrorCode.SUCCEED
+            except Exception as e:
+                db_session.rollback()
+                raise e
+            else:
+                for idx, _, _ in chunk:
+                    res[idx] = ItemQueryErrorCode.SUCCEED
 
-        # 상품 정보 갖고오기
-        item: Item = None
+        return res
 
-        if key == 'id':
-            item = db_session.query(Item).filter(Item.item_id == value).scalar()
-        elif key == "name":
-            item = db_session.query(Item).filter(Item.name == value).scalar()
+    @staticmethod
+    def prepare_rows(
+            items: List[Dict[str, object]],
+            users: Dict[Tuple[str, str], Optional[Dict[str, object]]]
+    ) -> Tuple[List[Optional[ItemQueryErrorCode]], List[Tuple[int, Dict[str, object], Dict[str, object]]]]:
+        """ create_many에서 insert 전에 상품을 검사하고 insert할 row를 만든다 (비동기 쿼리와 공유)
+
+        :param items: create_many의 items
+        :param users: {게시자 정보: 유저 정보 or None}
+        :return: (상품 별 에러 코드, 검사를 통과한 상품은 None), [(items 상의 위치, item row, itemContents row)]
+        """
+        res: List[Optional[ItemQueryErrorCode]] = [None] * len(items)
+        rows: List[Tuple[int, Dict[str, object], Dict[str, object]]] = []
+        names = set()
+        for idx, item in enumerate(items):
+            user = users[tuple(item['user'])]
+            if not user:
+                res[idx] = ItemQueryErrorCode.USER_NOT_EXISTS
+                continue
+            if item['name'] in names:
+                # 같은 요청 안에서 이름 중복
+                res[idx] = ItemQueryErrorCode.ITEM_ALREADY_EXISTS
+                continue
+            try:
+                # 객체를 만들면서 validate, 검색용 이름도 같이 만들어진다
+                new_item: Item = Item(
+                    item_id=generate_id(),
+                    user_id=user['id'],
+                    name=item['name'],
+                    end_date=item['end_date'],
+                    target_money=item['target_money'],
+                    funding_unit=item['funding_unit']
+                )
+                if item.get('current_money') is not None:
+                    new_item.current_money = item['current_money']
+                contents: ItemContents = ItemContents(item_id=new_item.item_id, summary=item['summary'])
+            except DatabaseRegexNotMatched as e:
+                res[idx] = e.code
+                continue
+            names.add(item['name'])
+            rows.append((idx, ItemQuery.__to_mapping(new_item), ItemQuery.__to_mapping(contents)))
+        return res, rows
 
-        if not item:
-            # 정보 없음
+    @staticmethod
+    def existing_names_statement(rows: List[Tuple[int, Dict[str, object], Dict[str, object]]]):
+        # prepare_rows의 row 중 이미 있는 상품 이름을 찾는 SELECT문
+        return select(Item.name).where(Item.name.in_([row['name'] for _, row, _ in rows]))
+
+    @staticmethod
+    def __to_mapping(obj) -> Dict[str, object]:
+        # ORM 객체에서 값이 있는 컬럼만 dict로 변환 (값이 없는 컬럼은 기본값 사용)
+        return {
+            attr.key: getattr(obj, attr.key)
+            for attr in obj.__mapper__.column_attrs
+            if getattr(obj, attr.key) is not None
+        }
+
+    @staticmethod
+    def __insert_items(db_session, rows: List[Tuple[int, Dict[str, object], Dict[str, object]]]):
+        # item, itemContents를 executemany로 insert 후 commit
+        # 전문 검색 트리거가 item을 참조하므로 item을 먼저 insert 한다
+        if not rows:
+            return
+        db_session.bulk_insert_mappings(Item, [item for _, item, _ in rows])
+        db_session.bulk_insert_mappings(ItemContents, [contents for _, _, contents in rows])
+        db_session.commit()
+
+    @staticmethod
+    def read(key: str, value: str, primary: bool = False) -> Dict[str, object]:
+        """ 상품 상세 정보 갖고오기
+
+            item, itemContents, user를 하나의 JOIN 쿼리로 필요한 컬럼만 갖고온다
+            읽기 복제본이 있으면 복제본에서 읽는다. primary가 True이면 primary에서 읽는다.
+        """
+
+        statement = ItemQuery.read_statement(key, value)
+        if statement is None:
             return None
 
-        # 컨텐츠 가져오기
-        contents: ItemContents = \
-            db_session.query(ItemContents).filter(ItemContents.item_id == item.item_id).scalar()
+        with ItemQuery.__session(primary) as db_session:
+            row = db_session.execute(statement).first()
 
-        # 개시자 정보 구하기
-        user: Dict[str, object] = UserQuery.read("id", item.user_id)
+        # 정보 없음
+        return ItemQuery.to_detail(row) if row else None
+
+    @staticmethod
+    def read_statement(key: str, value: str):
+        # read의 SELECT문, key가 맞지 않으면 None
+        statement = select(
+            Item.item_id, Item.name, User.name.label("user_name"), ItemContents.summary,
+            Item.end_date, Item.funding_unit, Item.target_money,
+            Item.current_money, Item.participant_size
+        ).select_from(Item). \
+            join(ItemContents, ItemContents.item_id == Item.item_id). \
+            join(User, User.id == Item.user_id)
+
+        if key == 'id':
+            return statement.where(Item.item_id == value)
+        elif key == "name":
+            return statement.where(Item.name == value)
+        return None
+
+    @staticmethod
+    def to_detail(row) -> Dict[str, object]:
+        # read_statement의 결과 row를 상세 정보로 변환
 
         # 달성률 구하기
-        percentage: float = (item.current_money / item.target_money) * 100
+        percentage: float = (row.current_money / row.target_money) * 100
 
         return {
-            "item_id": item.item_id,
-            "name": item.name,
-            "user_name": user['name'],
-            "summary": contents.summary,
-            "end_date": item.end_date,
-            "funding_unit": item.funding_unit,
-            "target_money": item.target_money,
-            "current_money": item.current_money,
-            "participant_size": item.participant_size,
+            "item_id": row.item_id,
+            "name": row.name,
+            "user_name": row.user_name,
+            "summary": row.summary,
+            "end_date": row.end_date,
+            "funding_unit": row.funding_unit,
+            "target_money": row.target_money,
+            "current_money": row.current_money,
+            "participant_size": row.participant_size,
             "funding_gage": percentage
         }
 
@@ -159,9 +307,9 @@ class ItemQuery(Query):
                 item.end_date = end_date
             if funding_unit is not None:
                 item.funding_unit = funding_unit
-            if participant_size:
+            if participant_size is not None:
                 item.participant_size = participant_size
-            if current_money:
+            if current_money is not None:
                 item.current_money = current_money
             if summary is not None:
                 contents.summary = summary
@@ -216,74 +364,384 @@ class ItemQuery(Query):
         # 삭제 성공
         return ItemQueryErrorCode.SUCCEED
 
+    @staticmethod
+    def __donate_query(db_session, key: str, value: str, count: int) -> int:
+        # donate_statement를 실행하고 매칭된 row 수를 리턴한다
+        return db_session.execute(ItemQuery.donate_statement(key, value, count)).rowcount
+
+    @staticmethod
+    def donate_statement(key: str, value: str, count: int):
+        # count번 펀딩한 만큼 DB 상에서 직접 값을 올리는 UPDATE문
+        if key == "id":
+            condition = Item.item_id == value
+        elif key == "name":
+            condition = Item.name == value
+        else:
+            raise TypeError("Key is not matched")
+
+        # 세션 내 객체 동기화는 commit 시 expire 되므로 생략한다
+        return update(Item).where(condition).values({
+            Item.current_money: Item.current_money + Item.funding_unit * count,
+            Item.participant_size: Item.participant_size + count
+        }).execution_options(synchronize_session=False)
+
+    @staticmethod
+    def donate(key: str, value: str, count: int = 1) -> ItemQueryErrorCode:
+        """ 펀딩 수행
+
+            상품을 읽어온 다음 값을 올려서 다시 저장하는 방식은
+            동시에 여러 펀딩이 들어오면 서로의 값을 덮어쓰게 된다.
+            따라서 DB 상에서 직접 값을 올리는 UPDATE 문 하나로 처리한다.
+
+            UPDATE item
+            SET currentMoney = currentMoney + fundingUnit * count, participantSize = participantSize + count
+            WHERE <key> = <value>
+        """
+
+        db_session = DatabaseConnectionGenerator.get_session()
+
+        try:
+            matched: int = ItemQuery.__donate_query(db_session, key, value, count)
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            raise e
+
+        if matched == 0:
+            # 상품 없음
+            return ItemQueryErrorCode.ITEM_NOT_EXISTS
+        return ItemQueryErrorCode.SUCCEED
+
+    @staticmethod
+    def donate_many(donations: Dict[Tuple[str, str], int]) -> Dict[Tuple[str, str], ItemQueryErrorCode]:
+        """ 여러 상품의 펀딩을 하나의 트랜잭션으로 반영
+
+        :param donations: {(검색 항목, 검색 값): 펀딩 횟수}
+        :return: {(검색 항목, 검색 값): 에러 코드}
+        """
+
+        db_session = DatabaseConnectionGenerator.get_session()
+        res: Dict[Tuple[str, str], ItemQueryErrorCode] = {}
+
+        try:
+            # 상품 하나당 UPDATE 한번
+            for (key, value), count in donations.items():
+                matched: int = ItemQuery.__donate_query(db_session, key, value, count)
+                res[(key, value)] = \
+                    ItemQueryErrorCode.SUCCEED if matched else ItemQueryErrorCode.ITEM_NOT_EXISTS
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            raise e
+
+        return res
+
     """ expanded query """
 
     @staticmethod
-    def __make_element_for_list(user: User, item: Item):
+    def select_list(*columns):
 
-        # 리스트에 들어갈 항목을 만드는 데 사용하는 함수
-        # 파라미터는 다음과 같다
+        # 리스트에 들어갈 항목을 구하는 SELECT문
+        # ORM 객체를 만들지 않고 필요한 컬럼만 갖고온다
+        # 컬럼은 다음과 같다
         """
+            item_id: 상품 아이디
             name: 상품 이름
             user_name: 게시자 이름
             current_money: 총 달성 금액
-            percentage: 달성률
+            percentage: 달성률 (DB에서 계산)
             create_date: 생성일
             end_date: 종료일 (d-day)
+
+            columns: 추가로 갖고올 컬럼
         """
 
-        return {
-            "name": item.name,
-            "user_name": user.name,
-            "current_money": item.current_money,
-            "percentage": (item.current_money / item.target_money) * 100,
-            "end_date": item.end_date,
-            "create_date": item.create_date
-        }
+        return select(
+            Item.item_id.label("item_id"),
+            Item.name.label("name"),
+            User.name.label("user_name"),
+            Item.current_money.label("current_money"),
+            # MySQL은 나눗셈 결과가 Decimal이므로 float으로 받는다
+            type_coerce(Item.current_money * 100.0 / Item.target_money, Float).label("percentage"),
+            Item.end_date.label("end_date"),
+            Item.create_date.label("create_date"),
+            *columns
+        ).select_from(Item).join(User, User.id == Item.user_id)
 
     @staticmethod
-    def read_item_list_by_name_regex(name_regex: str) -> List[Dict[str, object]]:
-        """ 일부 문자열 패턴을 이용한 상품 리스트 구하기 """
+    def __session(primary: bool):
+        # primary 세션 또는 읽기 전용 세션
+        if primary:
+            return nullcontext(DatabaseConnectionGenerator.get_session())
+        return DatabaseConnectionGenerator.read_session()
 
-        db_session = DatabaseConnectionGenerator.get_session()
-        res: List[Dict[str, object]] = []
+    @staticmethod
+    def __fetch_list(statement, primary: bool = False) -> List[Dict[str, object]]:
+        # SELECT문을 실행해서 리스트 항목(dict)으로 변환, 읽기 복제본이 있으면 복제본에서 읽는다
+        with ItemQuery.__session(primary) as db_session:
+            return [dict(row._mapping) for row in db_session.execute(statement)]
+
+    @staticmethod
+    def __stream_list(statement, batch_size: int, primary: bool = False) -> Iterator[Dict[str, object]]:
+        # SELECT문을 서버 사이드 커서로 실행해서 batch_size개씩 리스트 항목(dict)으로 변환
+        # 전체 결과를 메모리에 올리지 않는다 (SQLite는 원래 한 행씩 갖고온다)
+        # 복제본 세션은 다 읽을 때까지 유지한다
+        with ItemQuery.__session(primary) as db_session:
+            result = db_session.execute(statement.execution_options(stream_results=True, yield_per=batch_size))
+            try:
+                for row in result:
+                    yield dict(row._mapping)
+            finally:
+                # 중간에 멈춰도 커서를 닫는다
+                result.close()
+
+    @staticmethod
+    def read_item_list_by_name_regex(
+            name_regex: str,
+            limit: Optional[int] = None,
+            primary: bool = False
+    ) -> List[Dict[str, object]]:
+        """ 일부 문자열 패턴을 이용한 상품 리스트 구하기 """
 
         # 검색
-        for user, item in db_session.query(User, Item). \
-                filter(User.id == Item.user_id). \
-                filter(Item.name.like(f'%{name_regex}%')).all():
-            res.append(ItemQuery.__make_element_for_list(user, item))
+        return ItemQuery.__fetch_list(ItemQuery.name_regex_statement(name_regex, limit), primary)
 
-        return res
+    @staticmethod
+    def name_regex_statement(name_regex: str, limit: Optional[int] = None):
+        statement = ItemQuery.select_list().where(Item.name.like(f'%{name_regex}%'))
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement
 
-    """ Founding Table과 같이 사용하는 검색 쿼리 """
+    @staticmethod
+    def read_item_list_by_search_key(
+            keyword: str,
+            limit: Optional[int] = None,
+            primary: bool = False
+    ) -> List[Dict[str, object]]:
+        """ 검색용 이름 컬럼을 이용한 접두사 검색
+
+            검색어가 초성으로만 이루어져 있으면 초성 컬럼에서, 아니면 정규화된 이름 컬럼에서 찾는다.
+            EX) ㅋㄹㅇㄷ -> 크라우드 펀딩
+        """
+        return ItemQuery.__fetch_list(ItemQuery.search_key_statement(keyword, limit), primary)
 
     @staticmethod
-    def sort_by_createdate() -> List[Dict[str, object]]:
-        """ 생성일을 기준으로 정렬 """
+    def search_key_statement(keyword: str, limit: Optional[int] = None):
+        if is_chosung(keyword):
+            condition = prefix_condition(Item.name_chosung, keyword)
+        else:
+            condition = prefix_condition(Item.name_normalized, normalize_name(keyword))
+        statement = ItemQuery.select_list().where(condition)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement
 
-        db_session = DatabaseConnectionGenerator.get_session()
-        res: List[Dict[str, object]] = []
+    @staticmethod
+    def full_text_searchable(keyword: str) -> bool:
+        """ 해당 검색어로 전문 검색(search_item_list)을 사용할 수 있는 지 여부
+
+            SQLite의 trigram 토크나이저는 3글자, MySQL의 ngram 파서는 2글자 미만의 검색어를 찾지 못한다.
+        """
+        engine = get_full_text_search()
+        if engine == "sqlite":
+            return len(keyword.strip()) >= 3
+        elif engine == "mysql":
+            return len(keyword.strip()) >= 2
+        return False
+
+    @staticmethod
+    def search_item_list(keyword: str, limit: int, primary: bool = False) -> List[Dict[str, object]]:
+        """ 전문 검색 엔진을 이용해 상품 이름과 설명에서 검색어를 찾는다
+
+            관련도가 높은 순으로 최대 limit개 출력
+            사용 전에 full_text_searchable()로 사용 가능 여부를 확인해야 한다.
+        """
+        return ItemQuery.__fetch_list(ItemQuery.search_statement(keyword, limit), primary)
+
+    @staticmethod
+    def search_statement(keyword: str, limit: int):
+        statement = ItemQuery.select_list()
+
+        if get_full_text_search() == "sqlite":
+            # FTS5 가상 테이블, rank가 작을수록 관련도가 높다
+            item_search = table(ITEM_SEARCH_TABLE, column("itemId"), column("rank"))
+            phrase: str = '"' + keyword.replace('"', '""') + '"'
+            statement = statement.join(item_search, item_search.c.itemId == Item.item_id). \
+                where(text(f"{ITEM_SEARCH_TABLE} MATCH :keyword").bindparams(keyword=phrase)). \
+                order_by(item_search.c.rank)
+        else:
+            # MySQL FULLTEXT 인덱스
+            name_score = match(Item.name, against=keyword)
+            summary_score = match(ItemContents.summary, against=keyword)
+            statement = statement.join(ItemContents, ItemContents.item_id == Item.item_id). \
+                where(or_(name_score, summary_score)). \
+                order_by(desc(name_score + summary_score))
+
+        return statement.limit(limit)
+
+    """ Founding Table과 같이 사용하는 검색 쿼리 """
+
+    @staticmethod
+    def sort_by_createdate(
+            limit: Optional[int] = None,
+            after: Optional[Tuple[datetime.datetime, str]] = None,
+            primary: bool = False
+    ) -> List[Dict[str, object]]:
+        """ 생성일을 기준으로 정렬
+
+        :param limit: 최대 개수, 없으면 전부
+        :param after: 이전 페이지의 마지막 항목 (생성일, 상품 아이디)
+                      해당 항목 다음부터 갖고온다 (keyset pagination)
+        """
 
         # 데이터 수집
-        for user, item in db_session.query(User, Item). \
-                filter(User.id == Item.user_id). \
-                order_by(Item.create_date).all():
-            res.append(ItemQuery.__make_element_for_list(user, item))
+        return ItemQuery.__fetch_list(ItemQuery.sort_by_createdate_statement(limit, after), primary)
 
-        return res
+    @staticmethod
+    def iter_sort_by_createdate(batch_size: int = 1000, primary: bool = False) -> Iterator[Dict[str, object]]:
+        """ 생성일을 기준으로 정렬된 전체 리스트를 한 항목씩 출력 (스트리밍)
+
+        :param batch_size: DB에서 한번에 갖고올 행 수
+        """
+        return ItemQuery.__stream_list(ItemQuery.sort_by_createdate_statement(None, None), batch_size, primary)
 
     @staticmethod
-    def sort_by_fundingmoney() -> List[Dict[str, object]]:
-        """ 펀딩코인순으로 정렬 """
+    def sort_by_createdate_statement(
+            limit: Optional[int],
+            after: Optional[Tuple[datetime.datetime, str]]
+    ):
+        statement = ItemQuery.select_list()
+
+        if after:
+            # (createDate, itemId) > (이전 생성일, 이전 아이디)
+            create_date, item_id = after
+            statement = statement.where(or_(
+                Item.create_date > create_date,
+                and_(Item.create_date == create_date, Item.item_id > item_id)
+            ))
+
+        statement = statement.order_by(Item.create_date, Item.item_id)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement
 
-        db_session = DatabaseConnectionGenerator.get_session()
-        res: List[Dict[str, object]] = []
+    @staticmethod
+    def sort_by_fundingmoney(
+            limit: Optional[int] = None,
+            after: Optional[Tuple[int, str]] = None,
+            primary: bool = False
+    ) -> List[Dict[str, object]]:
+        """ 펀딩코인순으로 정렬
+
+        :param limit: 최대 개수, 없으면 전부
+        :param after: 이전 페이지의 마지막 항목 (현재 펀딩 금액, 상품 아이디)
+                      해당 항목 다음부터 갖고온다 (keyset pagination)
+        """
 
         # 데이터 수집
-        for user, item in db_session.query(User, Item). \
-                filter(User.id == Item.user_id). \
-                order_by(desc(Item.current_money)).all():
-            res.append(ItemQuery.__make_element_for_list(user, item))
+        return ItemQuery.__fetch_list(ItemQuery.sort_by_fundingmoney_statement(limit, after), primary)
 
-        return res
+    @staticmethod
+    def iter_sort_by_fundingmoney(batch_size: int = 1000, primary: bool = False) -> Iterator[Dict[str, object]]:
+        """ 펀딩코인순으로 정렬된 전체 리스트를 한 항목씩 출력 (스트리밍)
+
+        :param batch_size: DB에서 한번에 갖고올 행 수
+        """
+        return ItemQuery.__stream_list(ItemQuery.sort_by_fundingmoney_statement(None, None), batch_size, primary)
+
+    @staticmethod
+    def sort_by_fundingmoney_statement(
+            limit: Optional[int],
+            after: Optional[Tuple[int, str]]
+    ):
+        statement = ItemQuery.select_list()
+
+        if after:
+            # 내림차순이므로 (currentMoney, itemId) < (이전 금액, 이전 아이디)
+            current_money, item_id = after
+            statement = statement.where(or_(
+                Item.current_money < current_money,
+                and_(Item.current_money == current_money, Item.item_id < item_id)
+            ))
+
+        statement = statement.order_by(desc(Item.current_money), desc(Item.item_id))
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement
+
+    @staticmethod
+    def iter_export(batch_size: int = 1000) -> Iterator[Dict[str, object]]:
+        """ 설명, 게시자 이름을 포함한 전체 상품 정보를 생성일 순으로 한 항목씩 출력 (스트리밍)
+
+        :param batch_size: DB에서 한번에 갖고올 행 수
+        :return: 상품 정보 (item_id, name, user_name, summary, end_date, create_date,
+                 funding_unit, target_money, current_money, participant_size)
+        """
+        return ItemQuery.__stream_list(ItemQuery.export_statement(), batch_size)
+
+    @staticmethod
+    def export_statement():
+        return select(
+            Item.item_id.label("item_id"),
+            Item.name.label("name"),
+            User.name.label("user_name"),
+            ItemContents.summary.label("summary"),
+            Item.end_date.label("end_date"),
+            Item.create_date.label("create_date"),
+            Item.funding_unit.label("funding_unit"),
+            Item.target_money.label("target_money"),
+            Item.current_money.label("current_money"),
+            Item.participant_size.label("participant_size"),
+        ).select_from(Item). \
+            join(User, User.id == Item.user_id). \
+            join(ItemContents, ItemContents.item_id == Item.item_id). \
+            order_by(Item.create_date, Item.item_id)
+
+    """ 순위표(FundingLeaderboard)에서 사용하는 쿼리, 순위표를 채우고 맞추는 데 사용하므로 primary에서 읽는다 """
+
+    # 리스트 항목 외에 순위표 갱신에 필요한 컬럼
+    RANKING_COLUMNS = (
+        Item.funding_unit.label("funding_unit"),
+        Item.target_money.label("target_money"),
+        Item.participant_size.label("participant_size"),
+    )
+
+    @staticmethod
+    def read_ranking(order_by: str, limit: int) -> List[Dict[str, object]]:
+        """ 순위표용 상위 상품 리스트
+
+        :param order_by: 정렬 기준 current_money or participant_size
+        :param limit: 최대 개수
+        :return: 리스트 항목 + funding_unit, target_money, participant_size
+        """
+        return ItemQuery.__fetch_list(ItemQuery.ranking_statement(order_by, limit), primary=True)
+
+    @staticmethod
+    def ranking_statement(order_by: str, limit: int):
+        if order_by == "current_money":
+            order_column = Item.current_money
+        elif order_by == "participant_size":
+            order_column = Item.participant_size
+        else:
+            raise TypeError("Type not matched")
+
+        return ItemQuery.select_list(*ItemQuery.RANKING_COLUMNS). \
+            order_by(desc(order_column), desc(Item.item_id)).limit(limit)
+
+    @staticmethod
+    def read_ranking_item(key: str, value: str) -> Optional[Dict[str, object]]:
+        """ 순위표용 상품 하나, 없으면 None """
+        res = ItemQuery.__fetch_list(ItemQuery.ranking_item_statement(key, value), primary=True)
+        return res[0] if res else None
+
+    @staticmethod
+    def ranking_item_statement(key: str, value: str):
+        if key == "id":
+            condition = Item.item_id == value
+        elif key == "name":
+            condition = Item.name == value
+        else:
+            raise TypeError("Key is not matched")
+
+        return ItemQuery.select_list(*ItemQuery.RANKING_COLUMNS).where(condition)
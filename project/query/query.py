@@ -1,5 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
+from sqlalchemy import and_
+
 
 class Query(metaclass=ABCMeta):
     
@@ -25,3 +27,13 @@ class Query(metaclass=ABCMeta):
     @abstractmethod
     def delete(*args):
         pass
+
+
+def prefix_condition(column, prefix: str):
+    """ 접두사 검색 조건
+
+        LIKE 'prefix%'는 DB/collation에 따라 인덱스를 타지 못하는 경우가 있으므로
+        prefix <= column < (prefix의 마지막 글자 + 1) 범위 조건으로 바꿔서 인덱스를 사용하게 한다.
+    """
+    upper: str = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper)
@@ -1,15 +1,31 @@
 import sqlalchemy.exc
+from contextlib import nullcontext
 
+from cache.lru_cache import LRUCache
 from connection.connection_generator import DatabaseConnectionGenerator
-from model.model import User, DatabaseRegexNotMatched, generate_id
+from model.model import User, DatabaseRegexNotMatched, generate_id, is_chosung
 from query.err_codes import UserQueryErrorCode
-from query.query import Query
+from query.query import Query, prefix_condition
 from typing import List, Dict
 
 
 class UserQuery(Query):
     """ 유저 관련 쿼리 """
 
+    # 유저 정보 캐시 유효 시간(초)
+    # 캐시는 이 프로세스의 쓰기만 알 수 있으므로 다른 프로세스에서 이름을 바꾸거나 삭제한 유저는
+    # 최대 USER_CACHE_TTL초 동안 오래된 정보가 출력된다 (ItemManager.ITEM_CACHE_TTL 참고)
+    USER_CACHE_TTL: float = 5.0
+
+    # 유저 정보 캐시, ("id", 유저 아이디)로 저장하고 ("name", 유저 이름)을 별칭으로 등록한다
+    # 유저 정보는 거의 바뀌지 않지만 상품 생성 시 마다 조회하므로 캐시한다
+    user_cache: LRUCache = LRUCache(max_size=4096, ttl=USER_CACHE_TTL)
+
+    @staticmethod
+    def clear_cache():
+        """ 유저 정보 캐시 비우기, DB를 직접 수정한 경우 사용 """
+        UserQuery.user_cache.clear()
+
     @staticmethod
     def create(name: str) -> UserQueryErrorCode:
         """ 유저 생성 """
@@ -38,26 +54,47 @@ class UserQuery(Query):
             return UserQueryErrorCode.SUCCEED
 
     @staticmethod
-    def read(key: str, value: str) -> Dict[str, str]:
-        """ 유저 정보 찾기 """
-
-        db_session = DatabaseConnectionGenerator.get_session()
-        
-        # key에 따른 User 정보 찾기
-        if key == "name":
-            target = db_session.query(User).filter(User.name == value).scalar()
-        elif key == "id":
-            target = db_session.query(User).filter(User.id == value).scalar()
-        else:
+    def read(key: str, value: str, primary: bool = False) -> Dict[str, str]:
+        """ 유저 정보 찾기
+            캐시에 있으면 DB 조회 없이 출력한다.
+            캐시에 없으면 읽기 복제본이 있으면 복제본에서 읽는다. primary가 True이면 primary에서 읽는다. (쓰기 직전 확인용)
+            복제본에서 읽은 값은 복제 지연으로 오래된 값일 수 있으므로 캐시에 넣지 않는다.
+        """
+        if key not in ("name", "id"):
             raise TypeError("Key is not matched")
 
+        cached = UserQuery.user_cache.get((key, value))
+        if cached:
+            return dict(cached)
+
+        primary = primary or not DatabaseConnectionGenerator.uses_replica()
+        # 조회하는 사이에 수정된 경우 오래된 값을 캐시에 넣지 않기 위해 조회 전 version을 기억한다
+        version = UserQuery.user_cache.version
+
+        with UserQuery.__session(primary) as db_session:
+            # key에 따른 User 정보 찾기
+            if key == "name":
+                target = db_session.query(User.id, User.name).filter(User.name == value).first()
+            else:
+                target = db_session.query(User.id, User.name).filter(User.id == value).first()
+
         if not target:
             # 데이터 없음
             return None
-        return {
+        res = {
             "id": target.id,
             "name": target.name
         }
+        if primary:
+            UserQuery.user_cache.put(("id", target.id), dict(res), aliases=[("name", target.name)], version=version)
+        return res
+
+    @staticmethod
+    def __session(primary: bool):
+        # primary 세션 또는 읽기 전용 세션
+        if primary:
+            return nullcontext(DatabaseConnectionGenerator.get_session())
+        return DatabaseConnectionGenerator.read_session()
 
     @staticmethod
     def update(key: str, target_value: str, new_name: str) -> int:
@@ -80,6 +117,7 @@ class UserQuery(Query):
         try:
             user.name = new_name
             db_session.commit()
+            UserQuery.user_cache.pop(("id", user.id))
         except DatabaseRegexNotMatched as e:
             # 이름이 맞지 않음
             return e.code
@@ -119,6 +157,7 @@ class UserQuery(Query):
             # 삭제 수행
             db_session.delete(user)
             db_session.commit()
+            UserQuery.user_cache.pop(("id", user.id))
         except Exception as e:
             # 에러 발생 시 롤백과 동시에 에러 호출
             db_session.rollback()
@@ -130,16 +169,22 @@ class UserQuery(Query):
 
     @staticmethod
     def search_users(regex: str) -> List[Dict[str, str]]:
-        """ 패턴으로 여러 사용자 찾기 """
-        db_session = DatabaseConnectionGenerator.get_session()
-        target: List[User] = db_session.query(User).filter(User.name.contains(regex)).all()
-
-        res: List[Dict[str, str]] = []
-
-        for u in target:
-            res.append({
-                "name": u.name,
-                "id": u.id
-            })
+        """ 패턴으로 여러 사용자 찾기
+            초성으로만 이루어진 검색어는 초성 컬럼에서 인덱스를 사용하는 접두사 검색으로 찾는다. (상품 초성 검색과 같다)
+            EX) ㅇㄴ -> 안녕하세요
+        """
+        with DatabaseConnectionGenerator.read_session() as db_session:
+            if is_chosung(regex):
+                target: List[User] = db_session.query(User).filter(prefix_condition(User.name_chosung, regex)).all()
+            else:
+                target: List[User] = db_session.query(User).filter(User.name.contains(regex)).all()
+
+            res: List[Dict[str, str]] = []
+
+            for u in target:
+                res.append({
+                    "name": u.name,
+                    "id": u.id
+                })
 
         return res
@@ -0,0 +1,42 @@
+import unittest
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from manager.item_manager import ItemManager
+from model.model import rdb_create_all, remove_test_db
+from query.user_query import UserQuery
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """ DB를 사용하는 테스트 공통 클래스
+
+        클래스를 시작할 때 테스트용 DB를 만들고 끝나면 제거한다.
+        테스트 함수마다 바깥 트랜잭션 안에서 실행하고 끝나면 롤백하므로
+        (TestingDatabaseConnection.begin_isolation) 테이블을 직접 지우지 않아도 다음 테스트에 데이터가 남지 않는다.
+
+        setUp, tearDown을 재정의하면 super()를 호출해야 한다.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # 처음 클래스를 시작 할 때 작동
+        # DB 생성
+        DatabaseConnectionGenerator.get().connect()
+        rdb_create_all()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        # 테스트 클래스 자체 종료
+        # DB 자체 제거
+        DatabaseConnectionGenerator.get().disconnect()
+        remove_test_db()
+
+    def setUp(self) -> None:
+        DatabaseConnectionGenerator.get().begin_isolation()
+
+    def tearDown(self) -> None:
+        # 테스트 중에 쓴 데이터 전부 롤백
+        DatabaseConnectionGenerator.get().end_isolation()
+
+        # DB가 롤백되었으므로 메모리에 있는 유저/상품 정보도 비운다
+        UserQuery.clear_cache()
+        ItemManager().reset()
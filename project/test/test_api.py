@@ -1,31 +1,26 @@
 import csv
+import gzip
 import json
 import re
-import unittest
 
-from apis.api_values import API_RES_FAILED, API_RES_OK
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from apis import compression, read_your_writes
+from apis.api_values import API_RES_ERROR, API_RES_FAILED, API_RES_OK
+from apis.request_metrics import LatencyHistogram, request_metrics
 from app import app
+from connection import database_connection
 from connection.connection_generator import DatabaseConnectionGenerator
-from model.model import ItemContents, Item, remove_test_db
+from connection.query_metrics import query_metrics
+from manager.item_manager import ItemManager
+from model.model import Item
+from test.database_test_case import DatabaseTestCase
 
 
-class TestApi(unittest.TestCase):
+class TestApi(DatabaseTestCase):
     api = app.test_client()
 
-    def tearDown(self) -> None:
-        # 테스트 함수가 끝날 때마다 호출
-        # 모든 데이터 전부 삭제
-        db_session = DatabaseConnectionGenerator.get_session()
-        db_session.query(ItemContents).delete()
-        db_session.query(Item).delete()
-
-    @classmethod
-    def tearDownClass(cls) -> None:
-        # 테스트 클래스 자체 종료
-        # DB 자체 제거
-        DatabaseConnectionGenerator.get().disconnect()
-        remove_test_db()
-
     def test_user(self):
         """ User API Test """
 
@@ -125,6 +120,257 @@ class TestApi(unittest.TestCase):
         res = self.api.get(f"/item/{example_item['item_name']}")
         self.assertEqual(json.loads(res.data.decode('utf-8'))['result'], API_RES_FAILED)
 
+    def test_item_bulk(self):
+        """ 상품 여러개 생성, 상품 별 결과가 출력되어야 한다 """
+        user_name = "유저"
+        self.api.post(f"/user/{user_name}")
+
+        items = [{
+            "item_name": name,
+            "user_name": user_name,
+            "summary": "상품 설명",
+            "end_date": "2022/08/11 18:00:00",
+            "funding_unit": 1000,
+            "target_money": target_money
+        } for name, target_money in [("상품1", 10000), ("상품2", 0), ("상품1", 10000), ("상품3", 10000)]]
+
+        res = json.loads(self.api.post("/items/bulk", json={"items": items}).data.decode('utf-8'))
+        self.assertEqual(res['result'], API_RES_OK)
+        self.assertListEqual([d['result'] for d in res['data']],
+                             [API_RES_OK, API_RES_FAILED, API_RES_FAILED, API_RES_OK])
+
+        res = json.loads(self.api.get("/item/상품3").data.decode('utf-8'))
+        self.assertEqual(res['result'], API_RES_OK)
+        self.assertEqual(res['data']['summary'], "상품 설명")
+
+        # 이름이 bulk 인 상품도 /item/<name> 으로 생성할 수 있어야 한다
+        res = json.loads(self.api.post("/item/bulk", json=items[0]).data.decode('utf-8'))
+        self.assertEqual(res['result'], API_RES_OK)
+
+    def test_item_export(self):
+        """ 전체 상품 내보내기 """
+        user_name = "유저"
+        self.api.post(f"/user/{user_name}")
+        for idx in range(3):
+            self.api.post(f"/item/상품{idx}", json={
+                "user_name": user_name, "summary": "상품 설명", "end_date": "2022/08/11 18:00:00",
+                "funding_unit": 1000, "target_money": 10000
+            })
+
+        res = self.api.get("/items/export?format=csv&gzip=true")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("items.csv.gz", res.headers['Content-Disposition'])
+        lines = gzip.decompress(res.data).decode('utf-8').splitlines()
+        self.assertTrue(lines[0].startswith("itemId,name,userName,summary"))
+        self.assertEqual(len(lines), 4)
+
+        res = self.api.get("/items/export")
+        records = [json.loads(line) for line in res.data.decode('utf-8').splitlines()]
+        self.assertListEqual([d['name'] for d in records], ["상품0", "상품1", "상품2"])
+
+        # 이름이 export 인 상품은 /item/<name> 으로 조회되어야 한다
+        self.api.post("/item/export", json={
+            "user_name": user_name, "summary": "상품 설명", "end_date": "2022/08/11 18:00:00",
+            "funding_unit": 1000, "target_money": 10000
+        })
+        res = json.loads(self.api.get("/item/export").data.decode('utf-8'))
+        self.assertEqual(res['result'], API_RES_OK)
+        self.assertEqual(res['data']['item_name'], "export")
+
+    def test_session_lifecycle(self):
+        """ 요청이 끝나면 DB 세션이 정리되어야 한다 """
+        self.api.post("/user/유저")
+        self.api.post("/item/상품", json={
+            "user_name": "유저", "summary": "상품 설명", "end_date": "2022/08/11 18:00:00",
+            "funding_unit": 1000, "target_money": 10000
+        })
+        # 스트리밍 응답은 출력이 끝날 때 정리된다
+        for uri in ["/user/유저", "/item/상품", "/item/list?order_by=생성일", "/item/list?stream=true", "/items/export"]:
+            res = self.api.get(uri)
+            self.assertEqual(res.status_code, 200)
+            res.close()
+            self.assertFalse(DatabaseConnectionGenerator.get_session().registry.has(), uri)
+
+    def test_read_your_writes(self):
+        """ 쓰기가 있었던 요청은 쓰기 시간을 쿠키로 내려주고, 쓰기 기록이 다음 요청으로 넘어가지 않아야 한다 """
+        primary = DatabaseConnectionGenerator.get_session()
+        replica = create_engine("sqlite://")
+        DatabaseConnectionGenerator.get().set_replicas([replica], read_your_writes=5)
+        try:
+            client = app.test_client()
+            res = client.post("/user/유저")
+            cookie = res.headers.get('Set-Cookie', "")
+            self.assertTrue(cookie.startswith(f"{read_your_writes.COOKIE_NAME}="), cookie)
+            # 요청이 끝나면 워커 스레드의 쓰기 기록은 지워진다
+            self.assertIsNone(database_connection.last_write())
+            with DatabaseConnectionGenerator.read_session() as session:
+                self.assertIs(session.get_bind(), replica)
+
+            # 쿠키를 보낸 요청은 primary에서 읽는다
+            last_write = cookie.split(";")[0].split("=")[1]
+            with app.test_request_context(headers={"Cookie": f"{read_your_writes.COOKIE_NAME}={last_write}"}):
+                app.preprocess_request()
+                with DatabaseConnectionGenerator.read_session() as session:
+                    self.assertIs(session, primary)
+            with app.test_request_context():
+                app.preprocess_request()
+                with DatabaseConnectionGenerator.read_session() as session:
+                    self.assertIs(session.get_bind(), replica)
+
+            # 읽기만 한 요청은 쿠키를 내려주지 않는다
+            self.assertNotIn('Set-Cookie', client.get("/user/유저").headers)
+        finally:
+            DatabaseConnectionGenerator.get().set_replicas([])
+            replica.dispose()
+
+    def test_replica_list_etag(self):
+        """ 복제본에서 읽은 응답에는 ETag를 붙이지 않고, 쓰기를 한 클라이언트는 primary에서 읽고 ETag를 받아야 한다 """
+        self.api.post("/user/유저")
+
+        # 아직 복제되지 않은(테이블만 있는) 복제본
+        replica = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Item.metadata.create_all(replica)
+        DatabaseConnectionGenerator.get().set_replicas([replica], read_your_writes=5)
+        try:
+            writer = app.test_client()
+            res = writer.post("/item/상품", json={
+                "user_name": "유저",
+                "summary": "상품 설명",
+                "end_date": "2022/08/11 18:00:00",
+                "funding_unit": 1000,
+                "target_money": 10000,
+                "current_money": 0
+            })
+            self.assertEqual(json.loads(res.data.decode('utf-8'))['result'], API_RES_OK)
+
+            cached = compression.compressed_cache.stats()['size']
+            for uri in ["/item/list?order_by=생성일", "/item/list?search=상품", "/item/상품"]:
+                # 쿠키가 없는 클라이언트는 복제본에서 읽는다
+                res = app.test_client().get(uri)
+                self.assertNotIn('ETag', res.headers, uri)
+                self.assertFalse(json.loads(res.data.decode('utf-8'))['data'], uri)
+
+                # 쓰기를 한 클라이언트는 primary에서 읽는다
+                res = writer.get(uri)
+                self.assertIn('ETag', res.headers, uri)
+                self.assertTrue(json.loads(res.data.decode('utf-8'))['data'], uri)
+            # 압축된 응답 캐시에는 primary의 응답만 들어간다
+            self.assertLessEqual(compression.compressed_cache.stats()['size'] - cached, 1)
+        finally:
+            DatabaseConnectionGenerator.get().set_replicas([])
+            replica.dispose()
+
+    def test_sql_metrics(self):
+        """ 요청별 SQL 문장 수와 DB 시간이 route 별로 모이고 debug 모드에서는 헤더에 나와야 한다 """
+        self.api.post("/user/유저")
+        query_metrics.reset()
+
+        # debug가 아니면 헤더에 넣지 않는다
+        res = self.api.get("/user/없는유저")
+        self.assertNotIn('X-SQL-Queries', res.headers)
+
+        self.addCleanup(setattr, app, "debug", app.debug)
+        app.debug = True
+        res = self.api.get("/user/없는유저")
+        count = int(res.headers['X-SQL-Queries'])
+        self.assertGreater(count, 0)
+        self.assertRegex(res.headers['Server-Timing'], r"^db;dur=[0-9.]+, db-slowest;dur=[0-9.]+$")
+
+        data = json.loads(self.api.get("/metrics/sql").data.decode('utf-8'))['data']
+        stats = data["GET /user/<string:username>"]
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['statements'], count * 2)
+        self.assertEqual(stats['statements_max'], count)
+        self.assertIn("SELECT", stats['slowest'])
+        self.assertGreaterEqual(stats['time'], stats['slowest_time'])
+
+    def test_metrics(self):
+        """ 리소스, 메소드, 응답 결과 별 요청 수와 응답 시간, 풀/캐시 통계가 Prometheus 형식으로 나와야 한다 """
+        request_metrics.reset()
+        self.api.post("/user/유저")
+        self.api.get("/user/유저")
+        self.api.get("/user/없는유저")
+        self.api.put("/item/없는상품/donate")
+
+        res = self.api.get("/metrics")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.headers['Content-Type'].startswith("text/plain; version=0.0.4"))
+        lines = res.data.decode('utf-8').splitlines()
+        for line in [
+            'api_requests_total{resource="APIUser",method="post",result="OK"} 1',
+            'api_requests_total{resource="APIUser",method="get",result="OK"} 1',
+            'api_requests_total{resource="APIUser",method="get",result="FAILED"} 1',
+            'api_requests_total{resource="APIItemDonate",method="put",result="FAILED"} 1',
+            'api_request_duration_seconds_bucket{resource="APIUser",method="get",le="+Inf"} 2',
+            'api_request_duration_seconds_count{resource="APIUser",method="get"} 2',
+        ]:
+            self.assertIn(line, lines)
+        for prefix in [
+            'api_request_duration_quantile_seconds{resource="APIUser",method="get",quantile="0.99"} ',
+            'db_pool_checkouts_total{pool="primary"} ',
+            'cache_hit_ratio{cache="user"} ',
+            'cache_hit_ratio{cache="item"} ',
+            'cache_hit_ratio{cache="compressed_response"} ',
+        ]:
+            self.assertTrue(any(line.startswith(prefix) for line in lines), prefix)
+
+    def test_latency_quantile(self):
+        """ 히스토그램 구간 안에서 선형 보간한 분위수 """
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+        for seconds in [0.0015] * 50 + [0.02] * 49 + [60]:
+            histogram.observe(seconds)
+        # 50번째까지 (0.001, 0.0025] 구간
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.0025)
+        self.assertAlmostEqual(histogram.quantile(0.95), 0.01 + 0.015 * 45 / 49)
+        # +Inf 구간은 가장 큰 구간 경계값
+        self.assertEqual(histogram.quantile(1.0), 10.0)
+
+    def test_etag(self):
+        """ 바뀐 것이 없으면 If-None-Match 요청에 304로 응답하고 바뀌면 새 ETag로 응답해야 한다 """
+
+        # 테스트 도중 ETag 시간 구간이 바뀌지 않도록 한다
+        self.addCleanup(setattr, ItemManager, "ETAG_TTL", ItemManager.ETAG_TTL)
+        ItemManager.ETAG_TTL = 10 ** 9
+
+        user_name = "유저"
+        self.api.post(f"/user/{user_name}")
+        self.api.post("/item/상품1", json={
+            "user_name": user_name,
+            "summary": "상품 설명",
+            "end_date": "2022/08/11 18:00:00",
+            "funding_unit": 1000,
+            "target_money": 10000,
+            "current_money": 0
+        })
+
+        for uri, write in [
+            ("/item/상품1", lambda: self.api.put("/item/상품1/donate")),
+            ("/item/list?order_by=총펀딩금액", lambda: self.api.put("/item/상품1", json={"summary": "새 설명"})),
+        ]:
+            res = self.api.get(uri)
+            etag = res.headers['ETag']
+            self.assertTrue(etag)
+
+            # 바뀐 것이 없음
+            res = self.api.get(uri, headers={"If-None-Match": etag})
+            self.assertEqual(res.status_code, 304)
+            self.assertIn("Accept-Encoding", res.vary)
+
+            # 수정 후에는 새로 응답
+            write()
+            res = self.api.get(uri, headers={"If-None-Match": etag})
+            self.assertEqual(res.status_code, 200)
+            self.assertNotEqual(res.headers['ETag'], etag)
+            self.assertEqual(json.loads(res.data.decode('utf-8'))['result'], API_RES_OK)
+
+        # 이름이 바뀌면 이전 이름의 ETag는 더 이상 맞지 않는다
+        etag = self.api.get("/item/상품1").headers['ETag']
+        self.api.put("/item/상품1", json={"name": "상품2"})
+        self.assertEqual(self.api.get("/item/상품1", headers={"If-None-Match": etag}).status_code, 200)
+        etag = self.api.get("/item/상품2").headers['ETag']
+        self.assertEqual(self.api.get("/item/상품2", headers={"If-None-Match": etag}).status_code, 304)
+
     def test_item_list(self):
         # 상품 리스트 및 정렬 api 구현
 
@@ -185,3 +431,58 @@ class TestApi(unittest.TestCase):
         __answer = [e['item_name'] for e in sorted(inputs, key=lambda d: -d["current_money"])]
         __output = [d['item_name'] for d in res['data']]
         self.assertListEqual(__answer, __output)
+
+        # 페이지 단위로 나눠서 구해도 전체 리스트와 같아야 한다
+        for order_by in ["총펀딩금액", "생성일"]:
+            res = self.api.get(f"/item/list?order_by={order_by}")
+            __answer = [d['item_name'] for d in json.loads(res.data.decode('utf-8'))['data']]
+
+            __output = []
+            res = json.loads(self.api.get(f"/item/list?order_by={order_by}&limit=2").data.decode('utf-8'))
+            while True:
+                self.assertEqual(res['result'], API_RES_OK)
+                self.assertLessEqual(len(res['data']), 2)
+                __output += [d['item_name'] for d in res['data']]
+                if not res['next_cursor']:
+                    break
+                res = self.api.get(f"/item/list?order_by={order_by}&limit=2&cursor={res['next_cursor']}")
+                res = json.loads(res.data.decode('utf-8'))
+            self.assertListEqual(__answer, __output)
+
+        # 잘못된 커서나 limit은 500이 아닌 에러 결과로 응답해야 한다
+        for query in ["cursor=!!!", "cursor=WzFd", "cursor=bm90LWpzb24=", "limit=abc"]:
+            res = self.api.get(f"/item/list?order_by=생성일&{query}")
+            self.assertEqual(res.status_code, 200, query)
+            self.assertEqual(json.loads(res.data.decode('utf-8'))['result'], API_RES_ERROR, query)
+        res = self.api.get("/item/list?search=상품&limit=abc")
+        self.assertEqual(json.loads(res.data.decode('utf-8'))['result'], API_RES_ERROR)
+
+        # 스트리밍으로 구해도 전체 리스트와 같아야 한다
+        for order_by in ["총펀딩금액", "생성일"]:
+            answer = json.loads(self.api.get(f"/item/list?order_by={order_by}").data.decode('utf-8'))
+            res = self.api.get(f"/item/list?order_by={order_by}&stream=true")
+            self.assertTrue(res.is_streamed)
+            self.assertDictEqual(answer, json.loads(res.data.decode('utf-8')))
+
+        # 압축 요청 시 압축된 응답을 받아야 하고, 압축을 풀면 원래 응답과 같아야 한다
+        # 테스트 데이터가 작으므로 압축할 최소 크기를 낮춘다
+        self.addCleanup(setattr, compression, "MIN_SIZE", compression.MIN_SIZE)
+        compression.MIN_SIZE = 128
+        for order_by in ["총펀딩금액", "생성일"]:
+            answer = self.api.get(f"/item/list?order_by={order_by}")
+            self.assertNotIn('Content-Encoding', answer.headers)
+
+            hits = compression.compressed_cache.stats()['hits']
+            for _ in range(2):
+                res = self.api.get(f"/item/list?order_by={order_by}", headers={"Accept-Encoding": "gzip"})
+                self.assertEqual(res.headers['Content-Encoding'], "gzip")
+                self.assertEqual(res.headers['ETag'], answer.headers['ETag'])
+                self.assertEqual(gzip.decompress(res.data), answer.data)
+                # 캐시된 응답도 Accept-Encoding에 따라 달라진다
+                self.assertListEqual(res.headers.getlist('Vary'), ["Accept-Encoding"])
+            # 두번째 요청은 캐시된 응답
+            self.assertEqual(compression.compressed_cache.stats()['hits'] - hits, 1)
+
+        # 작은 응답은 압축하지 않는다
+        res = self.api.get(f"/user/{user_name}", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn('Content-Encoding', res.headers)
@@ -0,0 +1,141 @@
+import asyncio
+import datetime
+import importlib.util
+import json
+import unittest
+from typing import Dict, List
+
+from connection.async_connection import AsyncDatabaseConnection
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import rdb_create_all, remove_test_db, User, Item, ItemContents
+from query.async_item_query import AsyncItemQuery
+from query.async_user_query import AsyncUserQuery
+from query.err_codes import ItemQueryErrorCode, UserQueryErrorCode
+from query.user_query import UserQuery
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite is not installed")
+class TestAsyncQuery(unittest.IsolatedAsyncioTestCase):
+    """ 비동기 쿼리 테스트 """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        DatabaseConnectionGenerator.get().connect()
+        rdb_create_all()
+        # 다른 테스트에서 캐시된 유저 정보 제거
+        UserQuery.clear_cache()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        DatabaseConnectionGenerator.get().disconnect()
+        remove_test_db()
+
+    async def asyncSetUp(self) -> None:
+        AsyncDatabaseConnection().connect()
+
+    async def asyncTearDown(self) -> None:
+        # 엔진은 이벤트 루프에 묶여 있으므로 테스트마다 닫는다
+        await AsyncDatabaseConnection().disconnect()
+
+        db_session = DatabaseConnectionGenerator.get_session()
+        db_session.query(ItemContents).delete()
+        db_session.query(Item).delete()
+        db_session.query(User).delete()
+        db_session.commit()
+        UserQuery.clear_cache()
+
+    async def test_user(self):
+        """ 유저 CRUD """
+        self.assertEqual(await AsyncUserQuery.create("유저"), UserQueryErrorCode.SUCCEED)
+        self.assertEqual(await AsyncUserQuery.create("유저"), UserQueryErrorCode.NAME_ALREADY_EXIST)
+
+        user: Dict[str, str] = await AsyncUserQuery.read("name", "유저")
+        self.assertEqual(user['name'], "유저")
+        self.assertEqual(await AsyncUserQuery.read("id", user['id']), user)
+
+        self.assertEqual(await AsyncUserQuery.update("name", "유저", "새유저"), UserQueryErrorCode.SUCCEED)
+        self.assertIsNone(await AsyncUserQuery.read("name", "유저"))
+        self.assertEqual([u['name'] for u in await AsyncUserQuery.search_users("새")], ["새유저"])
+
+        self.assertEqual(await AsyncUserQuery.delete("id", user['id']), UserQueryErrorCode.SUCCEED)
+        self.assertIsNone(await AsyncUserQuery.read("id", user['id']))
+
+    async def test_item(self):
+        """ 상품 CRUD, 펀딩, 리스트 """
+        await AsyncUserQuery.create("유저")
+        end_date = datetime.datetime.now() + datetime.timedelta(days=30)
+        for idx in range(3):
+            res = await AsyncItemQuery.create(["name", "유저"], f"상품{idx}", "설명", end_date, 1000, 10000)
+            self.assertEqual(res, ItemQueryErrorCode.SUCCEED)
+        res = await AsyncItemQuery.create(["name", "유저"], "상품0", "설명", end_date, 1000, 10000)
+        self.assertEqual(res, ItemQueryErrorCode.ITEM_ALREADY_EXISTS)
+        res = await AsyncItemQuery.create(["name", "없는유저"], "상품9", "설명", end_date, 1000, 10000)
+        self.assertEqual(res, ItemQueryErrorCode.USER_NOT_EXISTS)
+
+        res = await AsyncItemQuery.create_many([
+            {"user": ["name", "유저"], "name": name, "summary": "설명", "end_date": end_date,
+             "funding_unit": 1000, "target_money": 10000}
+            for name in ["상품3", "상품0", "상품3"]
+        ])
+        self.assertListEqual(res, [ItemQueryErrorCode.SUCCEED, ItemQueryErrorCode.ITEM_ALREADY_EXISTS,
+                                   ItemQueryErrorCode.ITEM_ALREADY_EXISTS])
+
+        # 동시에 펀딩해도 값이 덮어써지지 않아야 한다
+        await asyncio.gather(*[AsyncItemQuery.donate("name", "상품1") for _ in range(5)])
+        item = await AsyncItemQuery.read("name", "상품1")
+        self.assertEqual(item['current_money'], 5000)
+        self.assertEqual(item['funding_gage'], 50.0)
+        res = await AsyncItemQuery.donate_many({("name", "상품2"): 2, ("name", "없는상품"): 1})
+        self.assertEqual(res[("name", "없는상품")], ItemQueryErrorCode.ITEM_NOT_EXISTS)
+
+        self.assertEqual(await AsyncItemQuery.update(["name", "상품0"], name="새상품", summary="새설명"),
+                         ItemQueryErrorCode.SUCCEED)
+        self.assertEqual(await AsyncItemQuery.update(["name", "새상품"], name="상품1"),
+                         ItemQueryErrorCode.ITEM_ALREADY_EXISTS)
+        self.assertEqual((await AsyncItemQuery.read("name", "새상품"))['summary'], "새설명")
+
+        names: List[str] = [d['name'] for d in await AsyncItemQuery.sort_by_fundingmoney(limit=2)]
+        self.assertListEqual(names, ["상품1", "상품2"])
+        names = [d['name'] async for d in AsyncItemQuery.iter_sort_by_createdate(batch_size=2)]
+        self.assertEqual(len(names), 4)
+        self.assertEqual(len(await AsyncItemQuery.read_item_list_by_name_regex("새")), 1)
+        self.assertEqual((await AsyncItemQuery.read_ranking_item("name", "상품2"))['current_money'], 2000)
+
+        # 0으로 수정할 수 있어야 한다
+        self.assertEqual(await AsyncItemQuery.update(["name", "상품2"], participant_size=0, current_money=0),
+                         ItemQueryErrorCode.SUCCEED)
+        item = await AsyncItemQuery.read("name", "상품2")
+        self.assertEqual((item['participant_size'], item['current_money']), (0, 0))
+
+        self.assertEqual(await AsyncItemQuery.delete("name", "새상품"), ItemQueryErrorCode.SUCCEED)
+        self.assertEqual(await AsyncItemQuery.delete("name", "새상품"), ItemQueryErrorCode.ITEM_NOT_EXISTS)
+
+    async def test_asgi(self):
+        """ ASGI 서버 응답 """
+        from asgi import app
+
+        async def request(method: str, path: str, query_string: bytes = b""):
+            sent = []
+
+            async def receive():
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message):
+                sent.append(message)
+
+            await app({"type": "http", "method": method, "path": path, "query_string": query_string},
+                      receive, send)
+            return sent[0]['status'], json.loads(sent[1]['body'])
+
+        self.assertEqual((await request("POST", "/user/유저"))[1]['result'], "OK")
+        end_date = datetime.datetime.now() + datetime.timedelta(days=30)
+        await AsyncItemQuery.create(["name", "유저"], "상품", "설명", end_date, 1000, 10000)
+
+        self.assertEqual((await request("PUT", "/item/%EC%83%81%ED%92%88/donate"))[1]['result'], "OK")
+        status, res = await request("GET", "/item/상품")
+        self.assertEqual(res['data']['item_name'], "상품")
+        self.assertEqual(res['data']['funding_gage'], 10)
+
+        status, res = await request("GET", "/item/list", "order_by=생성일&limit=10".encode())
+        self.assertEqual(res['data'][0]['item_name'], "상품")
+        self.assertEqual((await request("GET", "/none"))[0], 404)
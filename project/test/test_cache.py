@@ -0,0 +1,84 @@
+import time
+import unittest
+
+from cache import invalidation
+from cache.lru_cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """ LRUCache 테스트 """
+
+    def test_lru_eviction(self):
+        """ 가장 오래 사용하지 않은 항목부터 제거 """
+        cache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+
+        # b가 가장 오래 사용하지 않은 항목
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertDictEqual(cache.stats(), {"size": 2, "max_size": 2, "hits": 3, "misses": 1, "evictions": 1})
+
+    def test_ttl(self):
+        """ 유효 시간이 지나면 없는 것으로 취급 """
+        cache = LRUCache(max_size=2, ttl=0.05)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_alias(self):
+        """ 별칭으로 조회/삭제 """
+        cache = LRUCache(max_size=1)
+        cache.put(("id", "1"), "상품", aliases=[("name", "상품1")])
+        self.assertEqual(cache.get(("name", "상품1")), "상품")
+        self.assertEqual(cache.pop(("name", "상품1")), "상품")
+        self.assertIsNone(cache.get(("id", "1")))
+
+        # 제거된 항목의 별칭은 남지 않는다
+        cache.put(("id", "1"), "상품", aliases=[("name", "상품1")])
+        cache.put(("id", "2"), "상품", aliases=[("name", "상품2")])
+        self.assertIsNone(cache.get(("name", "상품1")))
+
+    def test_version(self):
+        """ 조회 중 삭제(무효화)가 있었으면 저장하지 않는다 """
+        cache = LRUCache()
+        version = cache.version
+        cache.pop("a")
+        self.assertFalse(cache.put("a", 1, version=version))
+        self.assertIsNone(cache.get("a"))
+        self.assertTrue(cache.put("a", 1, version=cache.version))
+
+
+class TestInvalidation(unittest.TestCase):
+    """ 캐시 무효화 이벤트 테스트 """
+
+    def test_publish(self):
+        """ 구독한 listener만 등록한 순서대로 한번씩 호출되어야 한다 """
+        calls = []
+
+        def first(*args):
+            calls.append(("first", args))
+
+        def second(*args):
+            calls.append(("second", args))
+
+        invalidation.subscribe("test_event", first)
+        invalidation.subscribe("test_event", first)
+        invalidation.subscribe("test_event", second)
+        try:
+            invalidation.publish("test_event", "유저01", "유저02")
+            invalidation.publish("other_event", "무시")
+            self.assertListEqual(calls, [("first", ("유저01", "유저02")), ("second", ("유저01", "유저02"))])
+
+            invalidation.unsubscribe("test_event", first)
+            invalidation.publish("test_event", "a", "b")
+            self.assertEqual(calls[-1], ("second", ("a", "b")))
+            self.assertEqual(len(calls), 3)
+        finally:
+            invalidation.unsubscribe("test_event", first)
+            invalidation.unsubscribe("test_event", second)
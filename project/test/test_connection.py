@@ -0,0 +1,167 @@
+import datetime
+import time
+import unittest
+
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import StaticPool
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from connection import database_connection
+from connection.pool_metrics import PoolMetrics, InstrumentedQueuePool
+from manager.item_manager import ItemManager
+from manager.user_manager import UserManager
+from model.model import Item, rdb_create_all, remove_test_db
+from query.user_query import UserQuery
+
+
+class TestPoolMetrics(unittest.TestCase):
+    """ 커넥션 풀 통계 테스트 """
+
+    def test_instrumented_pool(self):
+        """ 대여/반납/대기 시간/타임아웃이 기록되어야 한다 """
+        engine = create_engine(
+            "sqlite://", poolclass=InstrumentedQueuePool,
+            pool_size=1, max_overflow=0, pool_timeout=0.1,
+            connect_args={"check_same_thread": False}
+        )
+        metrics = PoolMetrics()
+        metrics.attach(engine)
+        engine.pool.metrics = metrics
+
+        conn = engine.connect()
+        status = metrics.status(engine.pool)
+        self.assertEqual(status['checked_out'], 1)
+        self.assertEqual(status['checkouts'], 1)
+
+        # 풀이 가득 차서 타임아웃
+        self.assertRaises(exc.TimeoutError, engine.connect)
+        conn.close()
+
+        status = metrics.status(engine.pool)
+        self.assertEqual(status['checked_out'], 0)
+        self.assertEqual(status['checkins'], 1)
+        self.assertEqual(status['timeouts'], 1)
+        self.assertEqual(status['wait_count'], 2)
+        self.assertGreaterEqual(status['wait_max'], 0.1)
+
+        # 풀을 다시 만들어도 같은 통계를 사용한다
+        engine.dispose()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        self.assertEqual(metrics.status(engine.pool)['wait_count'], 3)
+
+    def test_connection_pool_status(self):
+        """ 커넥션 레이어에서 풀 상태를 얻을 수 있어야 한다 """
+        DatabaseConnectionGenerator.get().connect()
+        rdb_create_all()
+        try:
+            DatabaseConnectionGenerator.get_session().execute(text("SELECT 1"))
+            status = DatabaseConnectionGenerator.get_pool_status()
+            self.assertGreaterEqual(status['connects'], 1)
+            self.assertGreaterEqual(status['checkouts'], 1)
+        finally:
+            DatabaseConnectionGenerator.get().disconnect()
+            remove_test_db()
+
+
+class TestReadReplica(unittest.TestCase):
+    """ 읽기 복제본 라우팅 테스트 """
+
+    def setUp(self):
+        DatabaseConnectionGenerator.get().connect()
+        rdb_create_all()
+        # 테스트 DB를 그대로 바라보는 복제본 2개
+        self.replicas = [create_engine(database_connection.testing_database_url()) for _ in range(2)]
+        DatabaseConnectionGenerator.get().set_replicas(self.replicas, read_your_writes=0.2)
+        time.sleep(0.25)
+
+    def tearDown(self):
+        DatabaseConnectionGenerator.get().disconnect()
+        for engine in self.replicas:
+            engine.dispose()
+        remove_test_db()
+
+    def test_round_robin(self):
+        """ 읽기는 복제본에 번갈아 가며 보내야 한다 """
+        binds = []
+        for _ in range(4):
+            with DatabaseConnectionGenerator.read_session() as session:
+                binds.append(session.get_bind())
+        self.assertEqual(binds[0], binds[2])
+        self.assertEqual(binds[1], binds[3])
+        self.assertNotEqual(binds[0], binds[1])
+        self.assertTrue(all(bind in self.replicas for bind in binds))
+        self.assertEqual(len(DatabaseConnectionGenerator.get_pool_status()['replicas']), 2)
+
+    def test_least_busy(self):
+        """ 사용중인 커넥션이 적은 복제본을 골라야 한다 """
+        replicas = [create_engine(database_connection.testing_database_url(), poolclass=InstrumentedQueuePool) for _ in range(2)]
+        DatabaseConnectionGenerator.get().set_replicas(replicas, selection="least_busy", read_your_writes=0)
+        try:
+            with replicas[0].connect():
+                with DatabaseConnectionGenerator.read_session() as session:
+                    self.assertIs(session.get_bind(), replicas[1])
+        finally:
+            for engine in replicas:
+                engine.dispose()
+        self.assertRaises(ValueError, DatabaseConnectionGenerator.get().set_replicas, replicas, "random")
+
+    def test_read_your_writes(self):
+        """ 쓰기 직후에는 primary에서 읽고 일정 시간이 지나면 다시 복제본에서 읽어야 한다 """
+        primary = DatabaseConnectionGenerator.get_session()
+        primary.execute(text("SELECT 1"))
+        primary.commit()
+
+        with DatabaseConnectionGenerator.read_session() as session:
+            self.assertIs(session, primary)
+
+        time.sleep(0.25)
+        with DatabaseConnectionGenerator.read_session() as session:
+            self.assertIn(session.get_bind(), self.replicas)
+
+    def test_replica_reads_skip_caches(self):
+        """ 복제본에서 읽은 결과는 캐시에 넣거나 ETag를 발급하지 않고, 쓰기 직후와 순위표 조회는 primary에서 읽어야 한다 """
+        UserManager().add_user("유저")
+        ItemManager().add_item(user_name="유저", title="상품", summary="상품 설명",
+                               end_date=datetime.datetime(2022, 8, 11), funding_unit=1000, target_money=10000)
+        ItemManager().reset()
+        UserQuery.user_cache.clear()
+
+        # 아직 복제되지 않은(테이블만 있는) 복제본
+        lagging_replica = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Item.metadata.create_all(lagging_replica)
+        DatabaseConnectionGenerator.get().set_replicas([lagging_replica], read_your_writes=0.2)
+        database_connection.clear_write()
+        try:
+            # 복제본에서 읽는다, 복제본의 결과는 캐시에 넣지 않고 ETag도 없다
+            self.assertTrue(ItemManager.uses_replica())
+            self.assertEqual(ItemManager().get_item_with_etag(item_name="상품"), (None, None))
+            self.assertIsNone(UserManager().get_user(name="유저"))
+            self.assertEqual(ItemManager().get_list("상품"), [])
+            self.assertEqual(ItemManager().sort("funding"), [])
+            self.assertEqual(ItemManager().get_item_cache_stats()['size'], 0)
+            self.assertEqual(UserQuery.user_cache.stats()['size'], 0)
+
+            # ETag를 붙일 리스트와 순위표는 primary에서 읽는다
+            self.assertEqual([d['name'] for d in ItemManager().sort("funding", primary=True)], ["상품"])
+            ItemManager().leaderboards["current_money"].reconcile()
+            self.assertEqual(ItemManager().leaderboards["current_money"].top(1)[0]['name'], "상품")
+
+            # 쓰기 직후(read-your-writes 쿠키)에는 primary에서 읽고 캐시와 ETag를 사용한다
+            database_connection.mark_write()
+            self.assertFalse(ItemManager.uses_replica())
+            res, etag = ItemManager().get_item_with_etag(item_name="상품")
+            self.assertEqual(res['name'], "상품")
+            self.assertIsNotNone(etag)
+            self.assertEqual(UserManager().get_user(name="유저")['name'], "유저")
+            self.assertEqual(ItemManager().get_item_cache_stats()['size'], 1)
+            self.assertEqual(UserQuery.user_cache.stats()['size'], 1)
+
+            # 캐시에 들어간 primary의 결과는 복제본을 쓰는 요청에도 출력한다
+            database_connection.clear_write()
+            self.assertEqual(ItemManager().get_item_with_etag(item_name="상품"), (res, etag))
+        finally:
+            database_connection.clear_write()
+            ItemManager().reset()
+            UserQuery.user_cache.clear()
+            lagging_replica.dispose()
@@ -0,0 +1,37 @@
+import datetime
+import json
+import unittest
+
+from apis import encoder
+
+
+class TestEncoder(unittest.TestCase):
+    """ API 응답 JSON 인코더 테스트 """
+
+    def tearDown(self) -> None:
+        encoder.use_encoder("orjson" if "orjson" in encoder.ENCODERS else "json")
+
+    def test_dumps(self):
+        """ 모든 인코더는 같은 결과를 출력해야 한다 """
+        data = {
+            "result": "OK",
+            "data": [{"item_name": "상품1", "end_date": encoder.format_date(datetime.datetime(2022, 4, 30, 12, 30, 0)),
+                      "d-day": -3}]
+        }
+        for name in encoder.ENCODERS:
+            encoder.use_encoder(name)
+            res = json.loads(encoder.dumps(data))
+            self.assertEqual(res['data'][0]['end_date'], "2022/04/30 12:30:00")
+            self.assertEqual(res['data'][0]['item_name'], "상품1")
+
+        self.assertRaises(ValueError, encoder.use_encoder, "???")
+        self.assertRaises(TypeError, encoder.dumps, {"data": object()})
+
+    def test_dumps_datetime(self):
+        """ 변환하지 않은 datetime은 모든 인코더에서 ISO 8601(orjson 형식)로 출력되어야 한다 """
+        data = {"date": datetime.datetime(2022, 4, 30, 12, 30, 0),
+                "precise": datetime.datetime(2022, 4, 30, 12, 30, 0, 123456)}
+        for name in encoder.ENCODERS:
+            encoder.use_encoder(name)
+            self.assertDictEqual(json.loads(encoder.dumps(data)),
+                                 {"date": "2022-04-30T12:30:00", "precise": "2022-04-30T12:30:00.123456"}, name)
@@ -1,14 +1,15 @@
-import unittest
 from typing import Dict
 import datetime
 
-from connection.connection_generator import DatabaseConnectionGenerator
+from connection.query_metrics import query_metrics
+from manager.funding_leaderboard import FundingLeaderboard
 from manager.item_manager import ItemManager
 from manager.user_manager import UserManager
-from model.model import rdb_create_all, remove_test_db, User, Item, ItemContents
+from query.item_query import ItemQuery
+from test.database_test_case import DatabaseTestCase
 
 
-class TestUserManager(unittest.TestCase):
+class TestUserManager(DatabaseTestCase):
     """ ItemManager 테스트
 
         validate 테스트 보다는
@@ -18,32 +19,11 @@ class TestUserManager(unittest.TestCase):
     user_manager: UserManager = None
     item_manager: ItemManager = None
 
-    @classmethod
-    def setUpClass(cls) -> None:
-        # 처음 클래스를 시작 할 때 작동
-        # DB 생성
-        DatabaseConnectionGenerator.get().connect()
-        rdb_create_all()
-
-    @classmethod
-    def tearDownClass(cls) -> None:
-        # 테스트 클래스 자체 종료
-        # DB 자체 제거
-        DatabaseConnectionGenerator.get().disconnect()
-        remove_test_db()
-
     def setUp(self) -> None:
+        super().setUp()
         self.user_manager = UserManager()
         self.item_manager = ItemManager()
 
-    def tearDown(self) -> None:
-        # 테스트 함수가 끝날 때마다 호출
-        # 모든 데이터 전부 삭제
-        db_session = DatabaseConnectionGenerator.get_session()
-        db_session.query(ItemContents).delete()
-        db_session.query(Item).delete()
-        db_session.query(User).delete()
-
     def test_create_and_read(self):
         """ 상품 등록 및 읽기 테스트
 
@@ -169,4 +149,241 @@ class TestUserManager(unittest.TestCase):
         self.item_manager.remove_item(item_name=cur_item['name'])
 
         # 삭제여부 확인
-        self.assertIsNone(self.item_manager.get_item(item_name=cur_item['name']))
\ No newline at end of file
+        self.assertIsNone(self.item_manager.get_item(item_name=cur_item['name']))
+
+    def test_donation_aggregator(self):
+        """ 펀딩 write-behind 집계기 """
+
+        user_name: str = "유저01"
+        item_name: str = "상품1"
+
+        self.user_manager.add_user(user_name)
+        self.item_manager.add_item(
+            user_name=user_name,
+            title=item_name,
+            summary="상품 설명",
+            end_date=datetime.datetime.now() + datetime.timedelta(days=3),
+            funding_unit=1000,
+            target_money=10000
+        )
+
+        # 자동 반영이 일어나지 않도록 주기를 길게 잡는다
+        self.item_manager.enable_donation_aggregator(flush_interval=3600, flush_threshold=1000)
+        try:
+            for _ in range(3):
+                self.assertTrue(self.item_manager.donate_funding(item_name=item_name))
+
+            # 없는 상품은 실패
+            self.assertFalse(self.item_manager.donate_funding(item_name="없는상품"))
+
+            # 아직 반영 전
+            self.assertEqual(self.item_manager.donation_aggregator.pending_items, 1)
+            self.assertEqual(self.item_manager.donation_aggregator.pending_donations, 3)
+            self.assertEqual(self.item_manager.get_item(item_name=item_name)['current_money'], 0)
+
+            # 반영 전에 이름이 바뀌어도 펀딩이 빠지면 안된다
+            self.item_manager.update_item(title="새상품1", item_name=item_name)
+        finally:
+            # 해제 시 남은 펀딩이 전부 반영되어야 한다
+            self.item_manager.disable_donation_aggregator()
+
+        res: Dict[str, object] = self.item_manager.get_item(item_name="새상품1")
+        self.assertEqual(res['current_money'], 3000)
+        self.assertEqual(res['participant_size'], 3)
+
+    def test_donation_aggregator_closed(self):
+        """ 종료된 집계기에 들어온 펀딩은 버려지지 않고 바로 반영되어야 한다 """
+
+        self.user_manager.add_user("유저01")
+        self.item_manager.add_item(
+            user_name="유저01",
+            title="상품1",
+            summary="상품 설명",
+            end_date=datetime.datetime.now() + datetime.timedelta(days=3),
+            funding_unit=1000,
+            target_money=10000
+        )
+        item_id: str = self.item_manager.get_item(item_name="상품1")['item_id']
+
+        self.item_manager.enable_donation_aggregator(flush_interval=3600, flush_threshold=1000)
+        aggregator = self.item_manager.donation_aggregator
+        self.item_manager.disable_donation_aggregator()
+
+        # 종료 후 (EX: atexit) 들어온 펀딩
+        aggregator.add("id", item_id, 2)
+        self.assertEqual(aggregator.pending_donations, 0)
+        self.assertEqual(self.item_manager.get_item(item_name="상품1")['current_money'], 2000)
+
+    def test_sort_page(self):
+        """ 페이지 단위 정렬, 펀딩 금액이 같은 상품이 있어도 빠지거나 중복되면 안된다 """
+
+        user_name: str = "유저01"
+        self.user_manager.add_user(user_name)
+
+        for idx in range(7):
+            self.item_manager.add_item(
+                user_name=user_name,
+                title=f"상품{idx}",
+                summary="상품 설명",
+                end_date=datetime.datetime.now() + datetime.timedelta(days=3),
+                funding_unit=1000,
+                target_money=10000
+            )
+            if idx % 2:
+                self.item_manager.donate_funding(item_name=f"상품{idx}")
+
+        for sort_type in ["funding", "create_date"]:
+            answer = [d['name'] for d in self.item_manager.sort(sort_type)]
+
+            output = []
+            res, cursor = self.item_manager.sort_page(sort_type, limit=3)
+            output += [d['name'] for d in res]
+            while cursor:
+                res, cursor = self.item_manager.sort_page(sort_type, limit=3, cursor=cursor)
+                output += [d['name'] for d in res]
+            self.assertListEqual(answer, output)
+
+        # 최대 페이지 크기를 넘을 수 없다
+        res, _ = self.item_manager.sort_page("funding", limit=ItemManager.LIST_MAX_PAGE_SIZE + 1)
+        self.assertLessEqual(len(res), ItemManager.LIST_MAX_PAGE_SIZE)
+
+        # 정렬 기준이 다른 커서는 사용할 수 없다
+        _, cursor = self.item_manager.sort_page("funding", limit=3)
+        self.assertRaises(ValueError, self.item_manager.sort_page, "create_date", 3, cursor)
+
+    def test_get_list(self):
+        """ 검색 리스트, limit이 없으면 LIKE/초성 검색 결과는 자르지 않는다 """
+
+        user_name: str = "유저01"
+        self.user_manager.add_user(user_name)
+        self.item_manager.add_items([{
+            "user_name": user_name,
+            "title": f"상품{idx}",
+            "summary": "상품 설명",
+            "end_date": datetime.datetime.now() + datetime.timedelta(days=3),
+            "funding_unit": 1000,
+            "target_money": 10000,
+        } for idx in range(ItemManager.LIST_MAX_PAGE_SIZE + 5)])
+
+        # 두 글자 검색어는 LIKE 검색
+        self.assertEqual(len(self.item_manager.get_list("상품")), ItemManager.LIST_MAX_PAGE_SIZE + 5)
+        self.assertEqual(len(self.item_manager.get_list("ㅅㅍ")), ItemManager.LIST_MAX_PAGE_SIZE + 5)
+        self.assertEqual(len(self.item_manager.get_list("상품", limit=5)), 5)
+        self.assertEqual(len(self.item_manager.get_list("상품", limit=1000)), ItemManager.LIST_MAX_PAGE_SIZE)
+
+    def test_leaderboard(self):
+        """ 순위표는 생성/수정/삭제/펀딩/게시자 이름 변경 후에도 DB 정렬 결과와 같아야 한다 """
+
+        user_name: str = "유저01"
+        self.user_manager.add_user(user_name)
+
+        def check():
+            answer = self.item_manager.sort("funding")[:5]
+            output = self.item_manager.get_leaderboard(limit=5)
+            self.assertListEqual(answer, output)
+
+        for idx in range(5):
+            self.item_manager.add_item(
+                user_name=user_name,
+                title=f"상품{idx}",
+                summary="상품 설명",
+                end_date=datetime.datetime.now() + datetime.timedelta(days=3),
+                funding_unit=1000 * (idx + 1),
+                target_money=100000
+            )
+        check()
+
+        # 펀딩
+        for idx in range(5):
+            for _ in range(5 - idx):
+                self.item_manager.donate_funding(item_name=f"상품{idx}")
+        check()
+
+        # 수정 (이름, 금액)
+        self.item_manager.update_item(item_name="상품0", title="바뀐 상품", current_money=100)
+        self.item_manager.update_item(item_name="상품4", current_money=90000)
+        check()
+
+        # 삭제
+        self.item_manager.remove_item(item_name="상품4")
+        check()
+
+        # 게시자 이름 변경
+        self.user_manager.update_user(user_name=user_name, new_name="유저02")
+        check()
+        self.assertTrue(all(d['user_name'] == "유저02" for d in self.item_manager.get_leaderboard(limit=5)))
+
+        # DB와 다시 맞춰도 같아야 한다
+        self.item_manager.leaderboards["current_money"].reconcile()
+        check()
+
+    def test_leaderboard_off_board_donation(self):
+        """ 순위표 밖 상품의 펀딩은 펀딩할 때 DB를 읽지 않고 다음 조회 때 반영되어야 한다 """
+
+        user_name: str = "유저01"
+        self.user_manager.add_user(user_name)
+        for idx in range(6):
+            self.item_manager.add_item(
+                user_name=user_name,
+                title=f"상품{idx}",
+                summary="상품 설명",
+                end_date=datetime.datetime.now() + datetime.timedelta(days=3),
+                funding_unit=1000 * (idx + 1),
+                target_money=100000
+            )
+
+        # 상위 4개(size * 2)만 들고 있는 순위표
+        leaderboard = FundingLeaderboard("current_money", size=2)
+        leaderboard.reconcile()
+        ItemQuery.donate("name", "상품0", 10)
+        query_metrics.begin()
+        leaderboard.on_donate("name", "상품0", 10)
+        self.assertEqual(query_metrics.end()['count'], 0)
+
+        self.assertEqual(leaderboard.top(2)[0]['name'], "상품0")
+        self.assertListEqual(leaderboard.top(2), self.item_manager.sort("funding")[:2])
+
+    def test_item_cache(self):
+        """ 상품 상세 정보 캐시는 수정/삭제/펀딩/게시자 이름 변경 시 무효화되어야 한다 """
+
+        # 다른 프로세스의 수정을 알 수 없으므로 기본적으로 유효 시간이 있어야 한다
+        self.assertEqual(self.item_manager.item_cache.ttl, ItemManager.ITEM_CACHE_TTL)
+
+        user_name: str = "유저01"
+        self.user_manager.add_user(user_name)
+        self.item_manager.add_item(
+            user_name=user_name,
+            title="상품1",
+            summary="상품 설명",
+            end_date=datetime.datetime.now() + datetime.timedelta(days=3),
+            funding_unit=1000,
+            target_money=100000
+        )
+
+        stats = self.item_manager.get_item_cache_stats()
+        item = self.item_manager.get_item(item_name="상품1")
+
+        # 이름과 아이디 둘 다 캐시에서 찾을 수 있다
+        item['name'] = "바뀐 값"
+        self.assertEqual(self.item_manager.get_item(item_name="상품1")['name'], "상품1")
+        self.assertEqual(self.item_manager.get_item(item_id=item['item_id'])['name'], "상품1")
+        after = self.item_manager.get_item_cache_stats()
+        self.assertEqual(after['misses'] - stats['misses'], 1)
+        self.assertEqual(after['hits'] - stats['hits'], 2)
+
+        # 펀딩
+        self.item_manager.donate_funding(item_id=item['item_id'])
+        self.assertEqual(self.item_manager.get_item(item_name="상품1")['current_money'], 1000)
+
+        # 수정 (이름)
+        self.item_manager.update_item(item_id=item['item_id'], title="상품2")
+        self.assertIsNone(self.item_manager.get_item(item_name="상품1"))
+        self.assertEqual(self.item_manager.get_item(item_id=item['item_id'])['name'], "상품2")
+
+        # 게시자 이름 변경
+        self.user_manager.update_user(user_name=user_name, new_name="유저02")
+        self.assertEqual(self.item_manager.get_item(item_name="상품2")['user_name'], "유저02")
+
+        # 삭제
+        self.item_manager.remove_item(item_name="상품2")
+        self.assertIsNone(self.item_manager.get_item(item_id=item['item_id']))
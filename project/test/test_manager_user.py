@@ -1,12 +1,9 @@
-import unittest
-
-from connection.connection_generator import DatabaseConnectionGenerator
 from manager.user_manager import UserManager
-from model.model import rdb_create_all, remove_test_db, User, Item
 from query.err_codes import UserQueryErrorCode
+from test.database_test_case import DatabaseTestCase
 
 
-class TestUserManager(unittest.TestCase):
+class TestUserManager(DatabaseTestCase):
     """ UserManager 테스트
         
         validate 테스트 보다는
@@ -15,30 +12,10 @@ class TestUserManager(unittest.TestCase):
 
     user_manager: UserManager = None
 
-    @classmethod
-    def setUpClass(cls) -> None:
-        # 처음 클래스를 시작 할 때 작동
-        # DB 생성
-        DatabaseConnectionGenerator.get().connect()
-        rdb_create_all()
-
-    @classmethod
-    def tearDownClass(cls) -> None:
-        # 테스트 클래스 자체 종료
-        # DB 자체 제거
-        DatabaseConnectionGenerator.get().disconnect()
-        remove_test_db()
-
     def setUp(self) -> None:
+        super().setUp()
         self.user_manager = UserManager()
 
-    def tearDown(self) -> None:
-        # 테스트 함수가 끝날 때마다 호출
-        # 모든 데이터 전부 삭제
-        db_session = DatabaseConnectionGenerator.get_session()
-        db_session.query(Item).delete()
-        db_session.query(User).delete()
-
     def test_create_and_read(self):
         user_name: str = "유저01"
         self.user_manager.add_user(name=user_name)
@@ -0,0 +1,35 @@
+import unittest
+
+from sqlalchemy import text
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from model.model import rdb_create_all, rdb_migrate, remove_test_db
+
+
+class TestMigrate(unittest.TestCase):
+    """ 기존 DB 마이그레이션 테스트 """
+
+    def setUp(self) -> None:
+        DatabaseConnectionGenerator.get().connect()
+        # 검색용 이름 컬럼이 없던 때의 유저 테이블
+        with DatabaseConnectionGenerator.get_engine().begin() as conn:
+            conn.execute(text('CREATE TABLE user (id VARCHAR(60) PRIMARY KEY, name VARCHAR(64) UNIQUE)'))
+            conn.execute(text("INSERT INTO user (id, name) VALUES ('a', '크라우드')"))
+
+    def tearDown(self) -> None:
+        DatabaseConnectionGenerator.get().disconnect()
+        remove_test_db()
+
+    def test_migrate(self):
+        # 서버 시작 시에는 스키마를 바꾸지 않는다
+        with self.assertRaises(RuntimeError):
+            rdb_create_all()
+
+        rdb_migrate()
+        # 여러번 실행해도 된다
+        rdb_migrate()
+        rdb_create_all()
+
+        with DatabaseConnectionGenerator.get_engine().connect() as conn:
+            row = conn.execute(text("SELECT nameNormalized, nameChosung FROM user WHERE id = 'a'")).first()
+        self.assertEqual(tuple(row), ("크라우드", "ㅋㄹㅇㄷ"))
@@ -0,0 +1,113 @@
+import json
+import os
+import tempfile
+import unittest
+
+from connection.connection_generator import DatabaseConnectionGenerator
+from manager.item_manager import ItemManager
+from model.model import rdb_create_all, remove_test_db, User, Item, ItemContents
+from pipeline.item_exporter import export_items
+from pipeline.item_importer import ItemImporter
+from pipeline.item_reader import read_items
+from query.item_query import ItemQuery
+from query.user_query import UserQuery
+
+
+class TestItemImporter(unittest.TestCase):
+    """ 상품 가져오기 파이프라인 테스트 """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        DatabaseConnectionGenerator.get().connect()
+        rdb_create_all()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        DatabaseConnectionGenerator.get().disconnect()
+        remove_test_db()
+
+    def setUp(self) -> None:
+        UserQuery.create("유저01")
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        db_session = DatabaseConnectionGenerator.get_session()
+        db_session.query(ItemContents).delete()
+        db_session.query(Item).delete()
+        db_session.query(User).delete()
+        db_session.commit()
+        UserQuery.clear_cache()
+        ItemManager().reset()
+        self.tmp_dir.cleanup()
+
+    def write(self, name: str, lines):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wt", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def test_import_csv(self):
+        """ CSV 가져오기, 잘못된 행은 실패로 처리하고 나머지는 들어가야 한다 """
+        path = self.write("items.csv", [
+            "name,summary,endDate,fundingUnit,targetMoney,currentMoney",
+            *[f"상품{idx},상품{idx} 설명,2022/05/01 18:00:00,100,1000,{idx * 100}" for idx in range(10)],
+            "날짜 오류,설명,2022-05-01,100,1000,0",
+            "금액 오류,설명,2022/05/01 18:00:00,100,0,0",
+            "상품0,중복,2022/05/01 18:00:00,100,1000,0",
+        ])
+
+        stats = ItemImporter(user_name="유저01", batch_size=3).run(path)
+        self.assertEqual(stats['rows'], 13)
+        self.assertEqual(stats['succeed'], 10)
+        self.assertEqual(stats['failed'], 3)
+        self.assertDictEqual(stats['errors'], {
+            "INVALID_RECORD": 1, "TARGET_MONEY_NOT_MATCHED": 1, "ITEM_ALREADY_EXISTS": 1})
+
+        item = ItemQuery.read("name", "상품9")
+        self.assertEqual(item['current_money'], 900)
+        self.assertEqual(item['user_name'], "유저01")
+
+    def test_import_ndjson_with_checkpoint(self):
+        """ NDJSON 가져오기, checkpoint 이후 행부터 이어서 처리해야 한다 """
+        path = self.write("items.ndjson", [
+            json.dumps({"name": f"상품{idx}", "summary": "설명", "endDate": "2022/05/01 18:00:00",
+                        "fundingUnit": 100, "targetMoney": 1000, "userName": "유저01"}, ensure_ascii=False)
+            for idx in range(10)
+        ] + ["{깨진 행"])
+        checkpoint_path = os.path.join(self.tmp_dir.name, "items.checkpoint")
+
+        # 앞의 4행까지 처리된 상태에서 다시 시작
+        with open(checkpoint_path, "wt") as f:
+            json.dump({"source": os.path.abspath(path), "row": 4}, f)
+
+        importer = ItemImporter(batch_size=2, workers=2, checkpoint_path=checkpoint_path)
+        stats = importer.run(path)
+        self.assertEqual(stats['skipped'], 4)
+        self.assertEqual(stats['succeed'], 6)
+        self.assertEqual(stats['failed'], 1)
+        self.assertIsNone(ItemQuery.read("name", "상품3"))
+        self.assertIsNotNone(ItemQuery.read("name", "상품4"))
+
+        # 끝까지 처리했으므로 다시 실행하면 전부 건너뛴다
+        with open(checkpoint_path, "rt") as f:
+            self.assertEqual(json.load(f)['row'], 11)
+        self.assertEqual(importer.run(path)['skipped'], 11)
+
+    def test_export(self):
+        """ 내보낸 파일을 다시 읽으면 DB의 상품 정보와 같아야 한다 """
+        path = self.write("items.csv", [
+            "name,summary,endDate,fundingUnit,targetMoney,currentMoney",
+            *[f"상품{idx},\"설명, {idx}\",2022/05/01 18:00:00,100,1000,{idx * 100}" for idx in range(5)],
+        ])
+        ItemImporter(user_name="유저01").run(path)
+
+        for name in ["export.ndjson", "export.ndjson.gz", "export.csv", "export.csv.gz"]:
+            out = os.path.join(self.tmp_dir.name, name)
+            export_items(out)
+
+            items = [item for _, item in read_items(out)]
+            self.assertEqual([item['name'] for item in items], [f"상품{idx}" for idx in range(5)])
+            for idx, item in enumerate(items):
+                self.assertEqual(item['summary'], f"설명, {idx}")
+                self.assertEqual(item['current_money'], idx * 100)
+                self.assertEqual(item['user_name'], "유저01")
@@ -1,42 +1,22 @@
 import re
-import unittest
 import datetime
 from typing import Dict, List
 
+from sqlalchemy import event
+
 from connection.connection_generator import DatabaseConnectionGenerator
-from model.model import rdb_create_all, remove_test_db, User, Item, ItemContents
+from model.model import ItemContents
 from query.err_codes import ItemQueryErrorCode
 from query.item_query import ItemQuery
 from query.user_query import UserQuery
 from test.csv_reader_for_test import csv_reader_for_test
+from test.database_test_case import DatabaseTestCase
 
 
-class TestQueryUser(unittest.TestCase):
+class TestQueryUser(DatabaseTestCase):
     """ 사용자 CRUD 테스트
     """
 
-    @classmethod
-    def setUpClass(cls) -> None:
-        # 처음 클래스를 시작 할 때 작동
-        # DB 생성
-        DatabaseConnectionGenerator.get().connect()
-        rdb_create_all()
-
-    @classmethod
-    def tearDownClass(cls) -> None:
-        # 테스트 클래스 자체 종료
-        # DB 자체 제거
-        DatabaseConnectionGenerator.get().disconnect()
-        remove_test_db()
-
-    def tearDown(self) -> None:
-        # 테스트 함수가 끝날 때마다 호출
-        # 모든 데이터 전부 삭제
-        db_session = DatabaseConnectionGenerator.get_session()
-        db_session.query(ItemContents).delete()
-        db_session.query(Item).delete()
-        db_session.query(User).delete()
-
     def test_create(self):
         """ 상품(만) 생성 (펀딩관련 생성 X)
 
@@ -150,6 +130,14 @@ class TestQueryUser(unittest.TestCase):
             funding_unit=2000
         ), ItemQueryErrorCode.SUCCEED)
 
+        # 참여자 수와 펀딩 금액은 0으로도 수정할 수 있어야 한다
+        self.assertEqual(ItemQuery.update(["name", "변경된 상품"], participant_size=3, current_money=3000),
+                         ItemQueryErrorCode.SUCCEED)
+        self.assertEqual(ItemQuery.update(["name", "변경된 상품"], participant_size=0, current_money=0),
+                         ItemQueryErrorCode.SUCCEED)
+        res: Dict[str, object] = ItemQuery.read("name", "변경된 상품")
+        self.assertEqual((res['participant_size'], res['current_money']), (0, 0))
+
         # + 같은 이름의 상품명으로 업데이트 해서는 안된다.
         ItemQuery.create(
             ["id", user_id], item_name,
@@ -159,6 +147,53 @@ class TestQueryUser(unittest.TestCase):
         self.assertEqual(ItemQuery.update(
             ["name", item_name], name="변경된 상품"), ItemQueryErrorCode.ITEM_ALREADY_EXISTS)
 
+    def test_create_many(self):
+        """ 상품 여러개 생성
+
+            상품 별로 create와 같은 검사를 하고, 실패한 상품만 빼고 생성되어야 한다.
+        """
+        UserQuery.create("유저01")
+
+        def item(name: str, **kwargs) -> Dict[str, object]:
+            d = {
+                "user": ["name", "유저01"], "name": name, "summary": "상품 설명",
+                "end_date": datetime.datetime.now(), "funding_unit": 1000, "target_money": 100000
+            }
+            d.update(kwargs)
+            return d
+
+        ItemQuery.create(["name", "유저01"], "이미 있는 상품", "", datetime.datetime.now(), 1000, 100000)
+
+        items = [
+            item("상품01"),
+            item("z" * 129),
+            item("상품02", user=["name", "없는 유저"]),
+            item("상품03", summary="*" * 2049),
+            item("상품04", target_money=0),
+            item("이미 있는 상품"),
+            item("상품01"),
+        ] + [item(f"대량 상품{idx}") for idx in range(25)]
+        answer = [
+            ItemQueryErrorCode.SUCCEED,
+            ItemQueryErrorCode.NAME_NOT_MATCHED,
+            ItemQueryErrorCode.USER_NOT_EXISTS,
+            ItemQueryErrorCode.SUMMARY_MATCHED_FAILED,
+            ItemQueryErrorCode.TARGET_MONEY_NOT_MATCHED,
+            ItemQueryErrorCode.ITEM_ALREADY_EXISTS,
+            ItemQueryErrorCode.ITEM_ALREADY_EXISTS,
+        ] + [ItemQueryErrorCode.SUCCEED] * 25
+
+        # 여러 트랜잭션으로 나뉘어도 결과는 같아야 한다
+        self.assertListEqual(ItemQuery.create_many(items, chunk_size=10), answer)
+
+        # 생성된 상품은 create로 만든 상품과 같이 읽을 수 있어야 한다
+        res = ItemQuery.read("name", "대량 상품24")
+        self.assertEqual(res['user_name'], "유저01")
+        self.assertEqual(res['summary'], "상품 설명")
+        self.assertEqual(res['current_money'], 0)
+        self.assertEqual(res['participant_size'], 0)
+        self.assertEqual(len(ItemQuery.sort_by_createdate()), 27)
+
     def test_read(self):
         """ 아이디 및 상품 이름을 통한 상세 정보 갖고오는 쿼리 """
 
@@ -200,6 +235,20 @@ class TestQueryUser(unittest.TestCase):
         # 존재하지 않는 항목 검색 시 None 리턴
         self.assertIsNone(ItemQuery.read("name", "없음"))
 
+        # 상세 정보는 쿼리 한번으로 갖고와야 한다
+        statements: List[str] = []
+
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = DatabaseConnectionGenerator.get_engine()
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            ItemQuery.read("name", answer['name'])
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        self.assertEqual(len(statements), 1)
+
     def test_read_item_list(self):
         """ 아이템 리스트 테스팅 """
 
@@ -283,3 +332,100 @@ class TestQueryUser(unittest.TestCase):
         # 컨텐츠(설명)도 같이 삭제되어야 한다.
         db = DatabaseConnectionGenerator.get_session()
         self.assertIsNone(db.query(ItemContents).filter(ItemContents.item_id == delete_item_id).scalar())
+
+    def test_donate(self):
+        """ 펀딩 1회 수행 쿼리 """
+
+        user_name: str = "유저01"
+        UserQuery.create(user_name)
+        user_id: str = UserQuery.read("name", user_name)['id']
+
+        item_name: str = "상품1"
+        ItemQuery.create(
+            ["id", user_id], item_name,
+            "아이템입니다.", datetime.datetime.now() + datetime.timedelta(days=3),
+            1000, 10000
+        )
+        item_id: str = ItemQuery.read("name", item_name)['item_id']
+
+        # 이름, 아이디 둘 다 가능해야 한다
+        self.assertEqual(ItemQuery.donate("name", item_name), ItemQueryErrorCode.SUCCEED)
+        self.assertEqual(ItemQuery.donate("id", item_id), ItemQueryErrorCode.SUCCEED)
+
+        res: Dict[str, object] = ItemQuery.read("name", item_name)
+        self.assertEqual(res['current_money'], 2000)
+        self.assertEqual(res['participant_size'], 2)
+
+        # 없는 상품
+        self.assertEqual(ItemQuery.donate("name", "없음"), ItemQueryErrorCode.ITEM_NOT_EXISTS)
+
+        # 잘못된 key
+        self.assertRaises(TypeError, ItemQuery.donate, "???", item_name)
+
+    def test_search_item_list(self):
+        """ 전문 검색 """
+
+        user_name: str = "유저01"
+        UserQuery.create(user_name)
+        user_id: str = UserQuery.read("name", user_name)['id']
+
+        csv_reader = csv_reader_for_test("test/inputs/test_query_item_read_list.csv")
+        for data in csv_reader:
+            ItemQuery.create(
+                ["id", user_id],
+                data['name'], data['summary'], data['end_date'],
+                data['funding_unit'], data['target_money']
+            )
+
+        if not ItemQuery.full_text_searchable("하고 싶다"):
+            self.skipTest("full text search is not supported")
+
+        # 이름 검색
+        res = [d['name'] for d in ItemQuery.search_item_list("하고 싶다", 10)]
+        ans = [d['name'] for d in csv_reader if "하고 싶다" in d['name']]
+        self.assertListEqual(sorted(res), sorted(ans))
+
+        # 설명 검색
+        res = [d['name'] for d in ItemQuery.search_item_list("후원 좀", 10)]
+        ans = [d['name'] for d in csv_reader if "후원 좀" in d['summary']]
+        self.assertListEqual(sorted(res), sorted(ans))
+
+        # 개수 제한
+        self.assertEqual(len(ItemQuery.search_item_list("후원 좀", 1)), 1)
+
+        # 수정/삭제 시 검색 결과에도 반영되어야 한다.
+        ItemQuery.update(["name", csv_reader[0]['name']], name="새로운 이름", summary="새로운 설명")
+        self.assertListEqual([d['name'] for d in ItemQuery.search_item_list("새로운", 10)], ["새로운 이름"])
+        ItemQuery.delete("name", "새로운 이름")
+        self.assertListEqual(ItemQuery.search_item_list("새로운", 10), [])
+
+        # 짧은 검색어는 사용 불가 (LIKE 검색 사용)
+        self.assertFalse(ItemQuery.full_text_searchable("후"))
+
+    def test_read_item_list_by_search_key(self):
+        """ 초성/정규화 이름 검색 """
+
+        user_name: str = "유저01"
+        UserQuery.create(user_name)
+        user_id: str = UserQuery.read("name", user_name)['id']
+
+        for name in ["크라우드 펀딩", "크림빵", "Crowd Funding"]:
+            ItemQuery.create(
+                ["id", user_id], name, "설명",
+                datetime.datetime.now() + datetime.timedelta(days=3), 1000, 10000
+            )
+
+        # 초성 검색, 공백은 무시한다
+        res = [d['name'] for d in ItemQuery.read_item_list_by_search_key("ㅋㄹㅇㄷㅍ", 10)]
+        self.assertListEqual(res, ["크라우드 펀딩"])
+        res = [d['name'] for d in ItemQuery.read_item_list_by_search_key("ㅋ", 10)]
+        self.assertListEqual(sorted(res), sorted(["크라우드 펀딩", "크림빵"]))
+
+        # 정규화 이름 검색 (대소문자 무시)
+        res = [d['name'] for d in ItemQuery.read_item_list_by_search_key("crowd", 10)]
+        self.assertListEqual(res, ["Crowd Funding"])
+
+        # 이름이 바뀌면 검색용 이름도 바뀌어야 한다
+        ItemQuery.update(["name", "크림빵"], name="단팥빵")
+        res = [d['name'] for d in ItemQuery.read_item_list_by_search_key("ㄷㅍ", 10)]
+        self.assertListEqual(res, ["단팥빵"])
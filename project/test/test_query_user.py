@@ -1,35 +1,20 @@
-import unittest
+import time
 from typing import List, Dict
 
+from sqlalchemy import update
+
+from cache.lru_cache import LRUCache
 from connection.connection_generator import DatabaseConnectionGenerator
-from model.model import rdb_create_all, remove_test_db, User
+from model.model import User
 from query.err_codes import UserQueryErrorCode
 from query.user_query import UserQuery
+from test.database_test_case import DatabaseTestCase
 
 
-class TestQueryUser(unittest.TestCase):
+class TestQueryUser(DatabaseTestCase):
     """ 사용자 CRUD 테스트
     """
 
-    @classmethod
-    def setUpClass(cls) -> None:
-        # 처음 클래스를 시작 할 때 작동
-        # DB 생성
-        DatabaseConnectionGenerator.get().connect()
-        rdb_create_all()
-
-    @classmethod
-    def tearDownClass(cls) -> None:
-        # 테스트 클래스 자체 종료
-        # DB 자체 제거
-        DatabaseConnectionGenerator.get().disconnect()
-        remove_test_db()
-
-    def tearDown(self) -> None:
-        # 테스트 함수가 끝날 때마다 호출
-        # 모든 데이터 전부 삭제
-        DatabaseConnectionGenerator.get_session().query(User).delete()
-
     def test_create(self):
         """ 유저 생성에 대한 테스트
             유저이름은 영어/숫자/한글로 1자 이상 64자 이하여야 한다.
@@ -99,6 +84,13 @@ class TestQueryUser(unittest.TestCase):
             output.append(user['name'])
         self.assertListEqual(sorted(output), sorted(["안녕하세요", "란녕하세요"]))
 
+        # 초성 검색, 상품 초성 검색과 같이 앞부분이 맞아야 한다 (인덱스 사용)
+        output = [user['name'] for user in UserQuery.search_users("ㅇㄴ")]
+        self.assertListEqual(output, ["안녕하세요"])
+        output = [user['name'] for user in UserQuery.search_users("ㄹㄴㅎ")]
+        self.assertListEqual(output, ["란녕하세요"])
+        self.assertListEqual(UserQuery.search_users("ㄴㅎ"), [])
+
     def test_update(self):
         """ 유저 이름 변경
             테스팅 내역은 create와 동일
@@ -150,3 +142,46 @@ class TestQueryUser(unittest.TestCase):
         self.assertEqual(UserQuery.delete("name", "유저01"), UserQueryErrorCode.SUCCEED)
         self.assertEqual(UserQuery.delete("id", "x"*60), UserQueryErrorCode.USER_NOT_EXIST)
         self.assertEqual(UserQuery.delete("name", "유저01"), UserQueryErrorCode.USER_NOT_EXIST)
+
+    def test_read_cache(self):
+        """ 유저 정보 캐시
+            이름/아이디 둘 다 캐시에서 찾을 수 있고 수정/삭제 시 무효화 되어야 한다
+        """
+        UserQuery.create("유저01")
+        user = UserQuery.read("name", "유저01")
+
+        stats = UserQuery.user_cache.stats()
+        self.assertDictEqual(UserQuery.read("id", user['id']), user)
+        self.assertDictEqual(UserQuery.read("name", "유저01"), user)
+        self.assertEqual(UserQuery.user_cache.stats()['hits'] - stats['hits'], 2)
+
+        # 수정
+        UserQuery.update("id", user['id'], "유저02")
+        self.assertIsNone(UserQuery.read("name", "유저01"))
+        self.assertEqual(UserQuery.read("id", user['id'])['name'], "유저02")
+
+        # 삭제
+        UserQuery.delete("name", "유저02")
+        self.assertIsNone(UserQuery.read("id", user['id']))
+
+    def test_read_cache_ttl(self):
+        """ 다른 프로세스의 수정은 알 수 없으므로 유저 정보 캐시는 유효 시간이 지나면 다시 읽어야 한다 """
+        self.assertEqual(UserQuery.user_cache.ttl, UserQuery.USER_CACHE_TTL)
+
+        user_cache = UserQuery.user_cache
+        UserQuery.user_cache = LRUCache(max_size=16, ttl=0.05)
+        try:
+            UserQuery.create("유저01")
+            user = UserQuery.read("name", "유저01")
+
+            # 다른 프로세스에서 이름 변경 (캐시를 거치지 않는 수정)
+            db_session = DatabaseConnectionGenerator.get_session()
+            db_session.execute(update(User).where(User.id == user['id']).values(name="유저02"))
+            db_session.commit()
+            self.assertEqual(UserQuery.read("name", "유저01"), user)
+
+            time.sleep(0.1)
+            self.assertIsNone(UserQuery.read("name", "유저01"))
+            self.assertEqual(UserQuery.read("id", user['id'])['name'], "유저02")
+        finally:
+            UserQuery.user_cache = user_cache